@@ -1,4 +1,5 @@
 from logging.config import fileConfig
+from typing import Any
 
 from sqlalchemy import engine_from_config, pool
 
@@ -28,6 +29,25 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+# Maintained by handwritten migrations only (the generated full-text search
+# column of assistant_message), not part of the models
+EXCLUDED_OBJECTS = {
+    ("column", "search_vector"),
+    ("index", "ix_assistant_message_search_vector"),
+}
+
+
+def include_object(
+    object_: Any,  # noqa: ARG001
+    name: str | None,
+    type_: str,
+    reflected: bool,  # noqa: ARG001
+    compare_to: Any,  # noqa: ARG001
+) -> bool:
+    """Keep autogenerate from dropping objects missing in the models."""
+    return (type_, name) not in EXCLUDED_OBJECTS
+
+
 def get_database_url() -> str:
     """Get database URL, trying multiple sources."""
 
@@ -51,6 +71,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -78,7 +99,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,50 @@
+"""add_assistant_message_search
+
+Revision ID: b81f0c3d9e27
+Revises: 7c2e9a1f4b3d
+Create Date: 2026-10-17 00:00:01.000000
+
+Adds a full-text search index over the assistant messages:
+- search_vector is a generated tsvector column, so it is maintained by the
+  database whenever a message is inserted or updated
+- a GIN index on search_vector serves the search queries
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b81f0c3d9e27"  # pragma: allowlist secret
+down_revision: str | None = "7c2e9a1f4b3d"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the search vector column and its GIN index."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        """
+        ALTER TABLE assistant_message
+        ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('german', coalesce(text, ''))) STORED
+        """
+    )
+    op.create_index(
+        "ix_assistant_message_search_vector",
+        "assistant_message",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Drop the search vector column and its index."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_assistant_message_search_vector", table_name="assistant_message")
+    op.drop_column("assistant_message", "search_vector")
@@ -0,0 +1,84 @@
+"""add_assistant_threads
+
+Revision ID: 7c2e9a1f4b3d
+Revises: 5f4e3d2c1b0a
+Create Date: 2026-10-17 00:00:00.000000
+
+Moves the assistant chat threads from the browser local storage into the
+database:
+- assistant_thread holds one row per thread, listed per user by last update
+- assistant_message holds the messages of a thread, ordered by position
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e9a1f4b3d"  # pragma: allowlist secret
+down_revision: str | None = "5f4e3d2c1b0a"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create assistant thread and message tables."""
+    op.create_table(
+        "assistant_thread",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("thread_id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=100), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False, server_default=""),
+        sa.Column("state", sa.String(length=20), nullable=False),
+        sa.Column("ai_model", sa.String(length=100), nullable=False),
+        sa.Column("response_chain", sa.JSON(), nullable=True),
+        sa.Column(
+            "created",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.UniqueConstraint("thread_id"),
+    )
+    op.create_index(
+        "ix_assistant_thread_user_id_updated",
+        "assistant_thread",
+        ["user_id", "updated"],
+        unique=False,
+    )
+
+    op.create_table(
+        "assistant_message",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("thread_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False, server_default=""),
+        sa.Column("editable", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("done", sa.Boolean(), nullable=False, server_default="true"),
+        sa.ForeignKeyConstraint(
+            ["thread_id"],
+            ["assistant_thread.id"],
+            name="fk_assistant_message_thread_id",
+            ondelete="CASCADE",
+        ),
+        # Also serves lookups of the messages of a thread in order
+        sa.UniqueConstraint(
+            "thread_id", "position", name="uq_assistant_message_thread_position"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop assistant thread and message tables."""
+    op.drop_table("assistant_message")
+    op.drop_index("ix_assistant_thread_user_id_updated", table_name="assistant_thread")
+    op.drop_table("assistant_thread")
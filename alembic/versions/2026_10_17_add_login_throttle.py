@@ -0,0 +1,47 @@
+"""add_login_throttle
+
+Revision ID: 3d9a7c5e2f18
+Revises: b81f0c3d9e27
+Create Date: 2026-10-17 00:00:02.000000
+
+Adds auth_login_throttle, the login attempt buckets per email address and
+client IP shared by all workers.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3d9a7c5e2f18"  # pragma: allowlist secret
+down_revision: str | None = "b81f0c3d9e27"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the login throttle table."""
+    op.create_table(
+        "auth_login_throttle",
+        sa.Column("key", sa.String(length=320), primary_key=True),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("refilled_at", sa.Float(), nullable=False),
+        sa.Column("failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("locked_until", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_auth_login_throttle_refilled_at",
+        "auth_login_throttle",
+        ["refilled_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the login throttle table."""
+    op.drop_index(
+        "ix_auth_login_throttle_refilled_at", table_name="auth_login_throttle"
+    )
+    op.drop_table("auth_login_throttle")
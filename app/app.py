@@ -1,9 +1,13 @@
 """Welcome to Reflex! This file outlines the steps to create a basic app."""
 
+import contextlib
 import logging
+from collections.abc import AsyncIterator
 
 import reflex as rx
 
+from appkit_assistant.backend.autosave import autosave_scheduler
+from appkit_commons.http_pool import http_client_pool
 from appkit_user.authentication.pages import (  # noqa: F401
     azure_oauth_callback_page,
     github_oauth_callback_page,
@@ -131,4 +135,24 @@ app = rx.App(
     stylesheets=base_stylesheets,
     style=base_style,
 )
+
+
+@contextlib.asynccontextmanager
+async def flush_thread_autosave() -> AsyncIterator[None]:
+    """Write pending assistant thread changes on shutdown."""
+    yield
+    await autosave_scheduler().flush_all()
+
+
+app.register_lifespan_task(flush_thread_autosave)
+
+
+@contextlib.asynccontextmanager
+async def close_http_clients() -> AsyncIterator[None]:
+    """Close the pooled HTTP clients on shutdown."""
+    yield
+    await http_client_pool().aclose()
+
+
+app.register_lifespan_task(close_http_clients)
 # app.add_page(index)
@@ -28,13 +28,18 @@ from appkit_assistant.components import (
 )
 from appkit_assistant.components.thread import Assistant
 from appkit_assistant.configuration import AssistantConfig
-from appkit_assistant.state.thread_state import ThreadListState, ThreadState
+from appkit_assistant.state.thread_state import (
+    ThreadListState,
+    ThreadOwner,
+    ThreadState,
+)
 from appkit_commons.registry import service_registry
 from appkit_ui.components.header import header
 from appkit_user.authentication.components.components import (
     default_fallback,
     requires_role,
 )
+from appkit_user.authentication.states import UserSession
 from appkit_user.authentication.templates import authenticated
 
 from app.components.navbar import app_navbar
@@ -93,7 +98,14 @@ def initialize_model_manager() -> list[AIModel]:
     return model_manager.get_all_models()
 
 
+async def current_user_id(state: rx.State) -> str | None:
+    """ID of the logged-in user, owning the assistant threads."""
+    session = await state.get_state(UserSession)
+    return str(session.user_id) if session.user_id else None
+
+
 initialize_model_manager()
+ThreadOwner.register_resolver(current_user_id)
 default_model = ModelManager().get_default_model()
 
 
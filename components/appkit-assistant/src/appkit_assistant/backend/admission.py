@@ -0,0 +1,246 @@
+"""
+Admission control for AI model requests.
+
+Each model can limit the number of in-flight requests and the estimated input
+tokens per minute. Requests exceeding the limits wait in a queue that is fair
+between users: users take turns (round robin), and the requests of a single
+user are served in FIFO order.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any
+
+from appkit_assistant.backend.models import (
+    AIModel,
+    Chunk,
+    ChunkType,
+    MCPServer,
+    Message,
+)
+from appkit_assistant.backend.processor import Processor
+from appkit_assistant.backend.token_budget import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(messages: list[Message]) -> int:
+    """Input token estimate for a list of messages."""
+    return sum(count_message_tokens(message) for message in messages)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `tokens_per_minute`."""
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_consume(self, tokens: int) -> bool:
+        """Consume `tokens` if available. Oversized requests consume the capacity."""
+        self._refill()
+        needed = min(float(tokens), self.capacity)
+        if self._tokens >= needed:
+            self._tokens -= needed
+            return True
+        return False
+
+    def seconds_until(self, tokens: int) -> float:
+        """Seconds until `tokens` can be consumed."""
+        self._refill()
+        missing = min(float(tokens), self.capacity) - self._tokens
+        return max(missing / self.rate, 0.0)
+
+
+@dataclass(eq=False)
+class Ticket:
+    """A queued or admitted request."""
+
+    user_id: str
+    tokens: int
+    admitted: bool = False
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class ModelLimiter:
+    """Concurrency and rate limiter with a per-user fair queue for one model."""
+
+    def __init__(
+        self,
+        model_id: str,
+        max_concurrent_requests: int | None = None,
+        tokens_per_minute: int | None = None,
+    ) -> None:
+        self.model_id = model_id
+        self.max_concurrent_requests = max_concurrent_requests
+        self.bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = 0
+        self._queues: OrderedDict[str, deque[Ticket]] = OrderedDict()
+
+    @property
+    def queued(self) -> int:
+        """Number of waiting requests."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def enqueue(self, user_id: str, tokens: int) -> Ticket:
+        """Queue a request and admit it right away if capacity is available."""
+        ticket = Ticket(user_id=user_id, tokens=tokens)
+        self._queues.setdefault(user_id, deque()).append(ticket)
+        self._dispatch()
+        return ticket
+
+    async def wait(self, ticket: Ticket) -> AsyncGenerator[int, None]:
+        """Wait until the ticket is admitted.
+
+        Yields the 1-based queue position whenever it changes.
+        """
+        last_position = 0
+        while True:
+            self._dispatch()
+            if ticket.admitted:
+                return
+
+            position = self._position(ticket)
+            if position != last_position:
+                last_position = position
+                yield position
+
+            ticket.changed.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(ticket.changed.wait(), self._retry_after())
+
+    def release(self, ticket: Ticket) -> None:
+        """Release an admitted ticket or drop a waiting one."""
+        if ticket.admitted:
+            ticket.admitted = False
+            self.in_flight -= 1
+        else:
+            queue = self._queues.get(ticket.user_id)
+            if queue and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket.user_id]
+        self._dispatch()
+        self._notify()
+
+    def _has_capacity(self, ticket: Ticket) -> bool:
+        if (
+            self.max_concurrent_requests is not None
+            and self.in_flight >= self.max_concurrent_requests
+        ):
+            return False
+        return self.bucket is None or self.bucket.try_consume(ticket.tokens)
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests in round-robin order while capacity is left."""
+        changed = False
+        while self._queues:
+            user_id, queue = next(iter(self._queues.items()))
+            ticket = queue[0]
+            if not self._has_capacity(ticket):
+                break
+
+            queue.popleft()
+            ticket.admitted = True
+            self.in_flight += 1
+            changed = True
+            # The user goes to the back of the line for their next request
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+
+        if changed:
+            self._notify()
+
+    def _notify(self) -> None:
+        """Wake up all waiting requests to re-check their position."""
+        for queue in self._queues.values():
+            for waiting in queue:
+                waiting.changed.set()
+
+    def _position(self, ticket: Ticket) -> int:
+        """1-based position of a waiting ticket in the admission order."""
+        queues = list(self._queues.values())
+        position = 0
+        for depth in range(max(len(queue) for queue in queues)):
+            for queue in queues:
+                if depth < len(queue):
+                    position += 1
+                    if queue[depth] is ticket:
+                        return position
+        return position
+
+    def _retry_after(self) -> float | None:
+        """Seconds until the token bucket may admit the head of the queue."""
+        if self.bucket is None or not self._queues:
+            return None
+        head = next(iter(self._queues.values()))[0]
+        return self.bucket.seconds_until(head.tokens) or None
+
+
+class AdmissionControlledProcessor(Processor):
+    """Processor wrapper that passes requests through a ModelLimiter.
+
+    While waiting, LIFECYCLE chunks with the stage "queued" and the current
+    queue position are emitted.
+    """
+
+    def __init__(self, processor: Processor, limiter: ModelLimiter, user_id: str):
+        self.processor = processor
+        self.limiter = limiter
+        self.user_id = user_id
+
+    async def process(
+        self,
+        messages: list[Message],
+        model_id: str,
+        files: list[str] | None = None,
+        mcp_servers: list[MCPServer] | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Chunk, None]:
+        ticket = self.limiter.enqueue(self.user_id, estimate_tokens(messages))
+        was_queued = False
+        try:
+            async for position in self.limiter.wait(ticket):
+                was_queued = True
+                logger.debug("Request for %s queued at position %d", model_id, position)
+                yield Chunk(
+                    type=ChunkType.LIFECYCLE,
+                    text=f"queued at position {position}",
+                    chunk_metadata={
+                        "stage": "queued",
+                        "queue_position": str(position),
+                    },
+                )
+
+            if was_queued:
+                yield Chunk(
+                    type=ChunkType.LIFECYCLE,
+                    text="admitted",
+                    chunk_metadata={"stage": "admitted"},
+                )
+
+            async for chunk in self.processor.process(
+                messages, model_id, files=files, mcp_servers=mcp_servers, **kwargs
+            ):
+                yield chunk
+        finally:
+            self.limiter.release(ticket)
+
+    def get_supported_models(self) -> dict[str, AIModel]:
+        return self.processor.get_supported_models()
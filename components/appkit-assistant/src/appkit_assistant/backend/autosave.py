@@ -0,0 +1,237 @@
+"""
+Debounced, incremental autosave of chat threads.
+
+A single turn changes a thread several times (the thread is created on submit,
+the reply is added when it completes). The AutosaveScheduler collects the
+changes of a thread for a short window and writes them with a single save.
+Only the messages changed since the last save are serialized and written.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from appkit_assistant.backend.models import Message, ThreadModel
+from appkit_assistant.backend.repositories import ThreadRepository
+from appkit_assistant.configuration import AssistantConfig
+from appkit_commons.registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTOSAVE_DELAY: float = 2.0  # seconds
+DEFAULT_WARN_BYTES: int = 1024 * 1024
+MAX_SAVE_ATTEMPTS = 3
+# Fixed columns (ids, position, type, flags) and tuple header of a message row
+MESSAGE_ROW_OVERHEAD_BYTES: int = 64
+
+
+@dataclass
+class PendingSave:
+    """Changes of a thread waiting to be written."""
+
+    user_id: str
+    thread: ThreadModel  # without messages
+    messages: list[Message]  # replace the stored messages from `position` on
+    position: int
+    attempts: int = 0
+
+    def merge(self, newer: "PendingSave") -> "PendingSave":
+        """Combine with a later save of the same thread."""
+        if newer.position <= self.position:
+            messages = newer.messages
+        else:
+            # Messages between both positions are unchanged since this save
+            messages = self.messages[: newer.position - self.position] + (
+                newer.messages
+            )
+        return PendingSave(
+            user_id=newer.user_id,
+            thread=newer.thread,
+            messages=messages,
+            position=min(self.position, newer.position),
+            attempts=self.attempts,
+        )
+
+
+class SaveStats:
+    """Process-wide counters for thread saves."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.saves_total = 0
+        self.failures_total = 0
+        self.messages_total = 0
+        self.bytes_total = 0
+        self.seconds_total = 0.0
+        self.max_bytes = 0
+
+    def record(self, messages: int, size: int, seconds: float) -> None:
+        """Record a save writing `messages` messages of `size` bytes."""
+        with self._lock:
+            self.saves_total += 1
+            self.messages_total += messages
+            self.bytes_total += size
+            self.seconds_total += seconds
+            self.max_bytes = max(self.max_bytes, size)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures_total += 1
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the current counters as a dictionary."""
+        with self._lock:
+            return {
+                "saves_total": self.saves_total,
+                "failures_total": self.failures_total,
+                "messages_total": self.messages_total,
+                "bytes_total": self.bytes_total,
+                "max_bytes": self.max_bytes,
+                "avg_seconds": (
+                    self.seconds_total / self.saves_total if self.saves_total else 0.0
+                ),
+            }
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self.saves_total = 0
+            self.failures_total = 0
+            self.messages_total = 0
+            self.bytes_total = 0
+            self.seconds_total = 0.0
+            self.max_bytes = 0
+
+
+save_stats = SaveStats()
+
+
+class AutosaveScheduler:
+    """Coalesces the saves of each thread within a time window."""
+
+    def __init__(
+        self,
+        delay: float = DEFAULT_AUTOSAVE_DELAY,
+        warn_bytes: int = DEFAULT_WARN_BYTES,
+        stats: SaveStats | None = None,
+    ) -> None:
+        self.delay = delay
+        self.warn_bytes = warn_bytes
+        self.stats = stats or save_stats
+        self._pending: dict[str, PendingSave] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of threads with unsaved changes."""
+        return len(self._pending)
+
+    def schedule(self, save: PendingSave) -> None:
+        """Queue the changes of a thread, merging them with pending ones."""
+        thread_id = save.thread.thread_id
+        pending = self._pending.get(thread_id)
+        self._pending[thread_id] = pending.merge(save) if pending else save
+
+        if thread_id not in self._timers:
+            self._timers[thread_id] = asyncio.create_task(self._save_later(thread_id))
+
+    async def flush(self, thread_id: str) -> None:
+        """Write the pending changes of a thread right away."""
+        timer = self._timers.pop(thread_id, None)
+        if timer is not None:
+            timer.cancel()
+        await self._save(thread_id)
+
+    async def flush_all(self) -> None:
+        """Write all pending changes, e.g. on shutdown."""
+        for thread_id in list(self._pending):
+            await self.flush(thread_id)
+
+    async def discard(self, thread_id: str) -> None:
+        """Drop the pending changes of a thread, e.g. when it is deleted.
+
+        Waits for a save of the thread that is already in progress.
+        """
+        timer = self._timers.pop(thread_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._pending.pop(thread_id, None)
+        lock = self._locks.get(thread_id)
+        if lock is not None:
+            async with lock:
+                pass
+
+    async def _save_later(self, thread_id: str) -> None:
+        await asyncio.sleep(self.delay)
+        self._timers.pop(thread_id, None)
+        await self._save(thread_id)
+
+    async def _save(self, thread_id: str) -> None:
+        # Saves of one thread must not overlap, they replace the same rows
+        lock = self._locks.setdefault(thread_id, asyncio.Lock())
+        async with lock:
+            save = self._pending.pop(thread_id, None)
+            if save is None:
+                return
+
+            size = sum(
+                len(message.text.encode()) + MESSAGE_ROW_OVERHEAD_BYTES
+                for message in save.messages
+            )
+            started = time.perf_counter()
+            try:
+                await ThreadRepository.save(
+                    save.user_id, save.thread, save.messages, save.position
+                )
+            except Exception as e:
+                self.stats.record_failure()
+                self._retry(save, e)
+                return
+            elapsed = time.perf_counter() - started
+
+        self.stats.record(len(save.messages), size, elapsed)
+        logger.debug(
+            "Saved thread %s: %d messages, %d bytes in %.3fs",
+            thread_id,
+            len(save.messages),
+            size,
+            elapsed,
+        )
+        if size > self.warn_bytes:
+            logger.warning(
+                "Thread %s of %s wrote %d bytes in a single save",
+                thread_id,
+                save.user_id,
+                size,
+            )
+
+    def _retry(self, save: PendingSave, error: Exception) -> None:
+        thread_id = save.thread.thread_id
+        save.attempts += 1
+        if save.attempts >= MAX_SAVE_ATTEMPTS:
+            logger.error(
+                "Giving up saving thread %s after %d attempts: %s",
+                thread_id,
+                save.attempts,
+                error,
+            )
+            return
+
+        logger.warning("Saving thread %s failed, retrying: %s", thread_id, error)
+        pending = self._pending.get(thread_id)
+        self._pending[thread_id] = save.merge(pending) if pending else save
+        if thread_id not in self._timers:
+            self._timers[thread_id] = asyncio.create_task(self._save_later(thread_id))
+
+
+@lru_cache(maxsize=1)
+def autosave_scheduler() -> AutosaveScheduler:
+    delay = DEFAULT_AUTOSAVE_DELAY
+    if service_registry().has(AssistantConfig):
+        delay = service_registry().get(AssistantConfig).autosave_delay
+    logger.debug("Creating the autosave scheduler, delay %.2fs", delay)
+    return AutosaveScheduler(delay=delay)
@@ -0,0 +1,201 @@
+"""
+Buffered delta flushing for streamed chunks.
+
+Processors yield one chunk per token delta. Applying each of them to the Reflex
+state individually means one state lock, one state store round trip and one
+websocket delta per token. The ChunkBuffer collects chunks and tells the caller
+when the accumulated batch should be committed to the state. ChunkBuffer.batches
+also flushes pending text when the upstream stream stalls (tool calls, slow
+reasoning), so it does not stay hidden until the next chunk arrives.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+from appkit_assistant.backend.models import Chunk, ChunkType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL: float = 0.05  # seconds
+DEFAULT_FLUSH_CHARS: int = 256
+
+# Chunk types that are buffered and merged; every other type flushes immediately
+BUFFERED_CHUNK_TYPES = frozenset({ChunkType.TEXT})
+
+
+class FlushStats:
+    """Process-wide counters for chunk buffer flushes."""
+
+    def __init__(self, window: float = 10.0) -> None:
+        self._lock = threading.Lock()
+        self._window = window
+        self._recent: deque[float] = deque()
+        self.flushes_total = 0
+        self.chunks_total = 0
+        self.chars_total = 0
+
+    def record_flush(self, chunks: int, chars: int) -> None:
+        """Record a single flush of `chunks` chunks with `chars` characters."""
+        now = time.monotonic()
+        with self._lock:
+            self.flushes_total += 1
+            self.chunks_total += chunks
+            self.chars_total += chars
+            self._recent.append(now)
+            self._evict(now)
+
+    def flushes_per_second(self) -> float:
+        """Average flush rate over the sliding window."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            return len(self._recent) / self._window
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the current counters as a dictionary."""
+        return {
+            "flushes_total": self.flushes_total,
+            "chunks_total": self.chunks_total,
+            "chars_total": self.chars_total,
+            "flushes_per_second": self.flushes_per_second(),
+        }
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self._recent.clear()
+            self.flushes_total = 0
+            self.chunks_total = 0
+            self.chars_total = 0
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self._window
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+
+
+flush_stats = FlushStats()
+
+
+class ChunkBuffer:
+    """Accumulates streamed chunks and decides when to commit them.
+
+    Text chunks are held back until either `flush_interval` seconds have passed
+    since the last flush or `flush_chars` characters are pending. Any other chunk
+    type (thinking, tool calls, errors, completion, ...) requests an immediate
+    flush so that the UI reflects it without delay.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_chars: int = DEFAULT_FLUSH_CHARS,
+        stats: FlushStats | None = None,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.flush_chars = flush_chars
+        self._stats = stats or flush_stats
+        self._pending: list[Chunk] = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, chunk: Chunk) -> bool:
+        """Add a chunk to the buffer.
+
+        Returns:
+            True if the buffer should be flushed now.
+        """
+        self._pending.append(chunk)
+        if chunk.type not in BUFFERED_CHUNK_TYPES:
+            return True
+
+        self._pending_chars += len(chunk.text)
+        return (
+            self._pending_chars >= self.flush_chars
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def seconds_until_flush(self) -> float | None:
+        """Seconds until the pending text is due, None if nothing is pending."""
+        if not self._pending:
+            return None
+        return max(self._last_flush + self.flush_interval - time.monotonic(), 0.0)
+
+    async def batches(self, stream: AsyncIterator[Chunk]) -> AsyncIterator[list[Chunk]]:
+        """Yield the merged batches of `stream` that are due for a commit.
+
+        Pending text is flushed once the flush interval has passed, even if
+        the stream yields no further chunk in the meantime.
+        """
+        iterator = aiter(stream)
+        next_chunk: asyncio.Future[Chunk] | None = None
+        try:
+            while True:
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(anext(iterator))
+                done, _ = await asyncio.wait(
+                    {next_chunk}, timeout=self.seconds_until_flush()
+                )
+                if not done:
+                    # The stream stalls, commit the text received so far
+                    yield self.drain()
+                    continue
+
+                task, next_chunk = next_chunk, None
+                try:
+                    chunk = task.result()
+                except StopAsyncIteration:
+                    break
+                if self.add(chunk):
+                    yield self.drain()
+
+            if self._pending:
+                yield self.drain()
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+
+    def drain(self) -> list[Chunk]:
+        """Return the pending chunks and reset the buffer.
+
+        Consecutive text chunks are merged into a single chunk, keeping the
+        metadata of the first one.
+        """
+        pending = self._pending
+        self._pending = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+
+        if not pending:
+            return []
+
+        merged: list[Chunk] = []
+        text_parts: list[str] = []
+        for chunk in pending:
+            if chunk.type in BUFFERED_CHUNK_TYPES:
+                if text_parts and merged[-1].type == chunk.type:
+                    text_parts.append(chunk.text)
+                    continue
+                self._merge_text(merged, text_parts)
+                text_parts = [chunk.text]
+            else:
+                self._merge_text(merged, text_parts)
+                text_parts = []
+            merged.append(chunk)
+        self._merge_text(merged, text_parts)
+
+        self._stats.record_flush(len(pending), sum(len(chunk.text) for chunk in merged))
+        return merged
+
+    @staticmethod
+    def _merge_text(merged: list[Chunk], text_parts: list[str]) -> None:
+        """Replace the last merged chunk with one carrying the joined text."""
+        if len(text_parts) > 1:
+            merged[-1] = merged[-1].model_copy(update={"text": "".join(text_parts)})
@@ -0,0 +1,132 @@
+"""
+In-process cache of the MCP server configurations.
+
+The headers of an MCP server are stored encrypted, so loading the servers runs
+a Fernet decryption per row, and building the tool configuration parses the
+headers JSON again for every request. The cache keeps the loaded servers
+together with their ready-to-use Responses API tool configurations.
+
+The MCPServerRepository fills the cache and invalidates it on every change.
+Callers receive copies of the cached servers, so changing them does not leak
+into other requests.
+Other processes do not see these invalidations, so entries also expire after
+a time to live.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from appkit_assistant.backend.models import MCPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVER_CACHE_TTL: float = 60.0  # seconds
+
+
+def build_tool_config(server: MCPServer) -> dict[str, Any]:
+    """Responses API tool configuration of an MCP server."""
+    tool_config: dict[str, Any] = {
+        "type": "mcp",
+        "server_label": server.name,
+        "server_url": server.url,
+        "require_approval": "never",
+    }
+    if server.headers and server.headers != "{}":
+        tool_config["headers"] = json.loads(server.headers)
+    return tool_config
+
+
+def _copy(server: MCPServer) -> MCPServer:
+    return MCPServer.model_validate(server.model_dump())
+
+
+@dataclass(frozen=True)
+class CachedMCPServer:
+    """A loaded MCP server and its parsed tool configuration."""
+
+    server: MCPServer
+    tool_config: dict[str, Any]  # shared, copy before modifying
+
+    def matches(self, server: MCPServer) -> bool:
+        """Whether the entry still describes `server`."""
+        return (
+            self.server.name == server.name
+            and self.server.url == server.url
+            and self.server.headers == server.headers
+        )
+
+
+class MCPServerCache:
+    """All MCP servers of the database, loaded at most once per TTL."""
+
+    def __init__(self, ttl: float = DEFAULT_SERVER_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[int, CachedMCPServer] | None = None
+        self._loaded_at = 0.0
+        # Incremented on invalidation, so loads started before are discarded
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def servers(self) -> list[MCPServer] | None:
+        """Copies of all cached servers ordered by name, or None if not loaded."""
+        with self._lock:
+            if not self._is_fresh():
+                return None
+            servers = [entry.server for entry in self._entries.values()]
+        return [_copy(server) for server in servers]
+
+    def get(self, server_id: int) -> MCPServer | None:
+        """Copy of a cached server, or None if unknown or not loaded."""
+        with self._lock:
+            if not self._is_fresh():
+                return None
+            entry = self._entries.get(server_id)
+        return _copy(entry.server) if entry else None
+
+    def store(self, servers: list[MCPServer], generation: int) -> None:
+        """Store the servers loaded while the cache was at `generation`."""
+        entries = {
+            server.id: CachedMCPServer(server, build_tool_config(server))
+            for server in servers
+        }
+        with self._lock:
+            if generation != self._generation:
+                logger.debug("Discarding MCP servers loaded before invalidation")
+                return
+            self._entries = entries
+            self._loaded_at = time.monotonic()
+        logger.debug("Cached %d MCP servers", len(entries))
+
+    def tool_config(self, server: MCPServer) -> dict[str, Any]:
+        """Tool configuration of a server, parsed once per configuration."""
+        with self._lock:
+            entry = self._entries.get(server.id) if self._entries else None
+        if entry is not None and entry.matches(server):
+            return dict(entry.tool_config)
+        return build_tool_config(server)
+
+    def invalidate(self) -> None:
+        """Drop all cached servers, e.g. after a server was changed."""
+        with self._lock:
+            self._entries = None
+            self._generation += 1
+        logger.debug("Invalidated the MCP server cache")
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._entries is not None and time.monotonic() - self._loaded_at <= self.ttl
+        )
+
+
+@lru_cache(maxsize=1)
+def mcp_server_cache() -> MCPServerCache:
+    return MCPServerCache()
@@ -0,0 +1,117 @@
+"""
+Cache of the tool lists (manifests) of MCP servers.
+
+Without a tool list in the context, the Responses API lists the tools of every
+MCP server again before each answer (response.mcp_list_tools.*), which adds
+seconds of latency. The mcp_list_tools items returned by the API are cached per
+server and sent back as input of later requests, so the listing is skipped.
+
+Entries are keyed by the server ID and a hash of its URL and headers, so a
+changed configuration never uses a stale tool list. Expired entries are not
+sent; the next request lists the tools again and refreshes the entry.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from appkit_assistant.backend.models import MCPServer
+from appkit_assistant.configuration import AssistantConfig
+from appkit_commons.registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOOLS_TTL: float = 15 * 60.0  # seconds
+
+
+@dataclass(frozen=True)
+class ToolManifest:
+    """The cached mcp_list_tools item of a server."""
+
+    item: dict[str, Any]  # input item for the Responses API
+    fetched_at: float
+
+    @property
+    def tool_names(self) -> list[str]:
+        return [tool["name"] for tool in self.item.get("tools", [])]
+
+
+def server_key(server: MCPServer) -> tuple[int | None, str]:
+    """Cache key of a server: its ID and a hash of its configuration."""
+    config_hash = hashlib.sha256(
+        f"{server.url}\x1f{server.headers or ''}".encode()
+    ).hexdigest()
+    return server.id, config_hash
+
+
+class ToolManifestCache:
+    """Process-wide tool lists of MCP servers with a time to live."""
+
+    def __init__(self, ttl: float = DEFAULT_TOOLS_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[int | None, str], ToolManifest] = {}
+        self.hits_total = 0
+        self.misses_total = 0
+
+    def get(self, server: MCPServer) -> ToolManifest | None:
+        """Return the tool list of a server, if cached and not expired."""
+        key = server_key(server)
+        with self._lock:
+            manifest = self._entries.get(key)
+            if manifest is None or time.monotonic() - manifest.fetched_at > self.ttl:
+                self.misses_total += 1
+                return None
+            self.hits_total += 1
+            return manifest
+
+    def put(self, server: MCPServer, item: dict[str, Any]) -> None:
+        """Store the mcp_list_tools item returned for a server."""
+        key = server_key(server)
+        with self._lock:
+            # Drop entries of the previous configuration of the server
+            for stale_key in [k for k in self._entries if k[0] == server.id]:
+                del self._entries[stale_key]
+            self._entries[key] = ToolManifest(item=item, fetched_at=time.monotonic())
+        logger.debug(
+            "Cached %d tools of MCP server %s", len(item.get("tools", [])), server.name
+        )
+
+    def invalidate(self, server_id: int | None = None) -> int:
+        """Drop the tool list of a server, or of all servers.
+
+        Returns:
+            Number of dropped entries
+        """
+        with self._lock:
+            if server_id is None:
+                count = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [k for k in self._entries if k[0] == server_id]
+                for key in keys:
+                    del self._entries[key]
+                count = len(keys)
+        logger.debug("Invalidated %d cached MCP tool lists", count)
+        return count
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the current counters as a dictionary."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits_total": self.hits_total,
+                "misses_total": self.misses_total,
+            }
+
+
+@lru_cache(maxsize=1)
+def tool_manifest_cache() -> ToolManifestCache:
+    ttl = DEFAULT_TOOLS_TTL
+    if service_registry().has(AssistantConfig):
+        ttl = service_registry().get(AssistantConfig).mcp_tools_ttl
+    return ToolManifestCache(ttl=ttl)
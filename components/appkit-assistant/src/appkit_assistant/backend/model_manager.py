@@ -2,8 +2,13 @@ import logging
 import threading
 from typing import Optional
 
+from appkit_assistant.backend.admission import (
+    AdmissionControlledProcessor,
+    ModelLimiter,
+)
 from appkit_assistant.backend.models import AIModel
 from appkit_assistant.backend.processor import Processor
+from appkit_assistant.backend.resilience import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,8 @@ class ModelManager:
             self._processors: dict[str, Processor] = {}
             self._models: dict[str, AIModel] = {}
             self._model_to_processor: dict[str, str] = {}
+            self._limiters: dict[str, ModelLimiter] = {}
+            self._circuit_breakers: dict[str, CircuitBreaker] = {}
             self._initialized = True
             logger.debug("ModelManager initialized")
 
@@ -57,20 +64,79 @@ class ModelManager:
 
         logger.debug("Registered processor: %s", processor_name)
 
-    def get_processor_for_model(self, model_id: str) -> Processor | None:
+    def get_processor_for_model(
+        self, model_id: str, user_id: str = ""
+    ) -> Processor | None:
         """
         Get the processor that supports the specified model.
 
+        If the model defines request or token limits, the processor is wrapped
+        with admission control, queueing requests fairly per user.
+
         Args:
             model_id: ID of the model.
+            user_id: ID of the requesting user (or session), used for fair queueing.
 
         Returns:
             The processor that supports the model or None if no processor is found.
         """
         processor_name = self._model_to_processor.get(model_id)
-        if processor_name:
-            return self._processors.get(processor_name)
-        return None
+        if not processor_name:
+            return None
+
+        processor = self._processors.get(processor_name)
+        limiter = self.get_limiter(model_id)
+        if processor and limiter:
+            return AdmissionControlledProcessor(processor, limiter, user_id)
+        return processor
+
+    def get_limiter(self, model_id: str) -> ModelLimiter | None:
+        """
+        Get the admission limiter of a model.
+
+        Args:
+            model_id: ID of the model.
+
+        Returns:
+            The limiter or None if the model has no limits configured.
+        """
+        limiter = self._limiters.get(model_id)
+        if limiter:
+            return limiter
+
+        model = self._models.get(model_id)
+        if not model or not (model.max_concurrent_requests or model.tokens_per_minute):
+            return None
+
+        limiter = ModelLimiter(
+            model_id,
+            max_concurrent_requests=model.max_concurrent_requests,
+            tokens_per_minute=model.tokens_per_minute,
+        )
+        self._limiters[model_id] = limiter
+        logger.debug("Created admission limiter for model %s", model_id)
+        return limiter
+
+    def get_circuit_breaker(self, model_id: str) -> CircuitBreaker | None:
+        """
+        Get the circuit breaker of a model.
+
+        Breakers are kept per model (deployment), so a fallback model served by
+        the same processor is not blocked by the failures of the primary model.
+
+        Args:
+            model_id: ID of the model.
+
+        Returns:
+            The circuit breaker or None if no processor serves the model.
+        """
+        if model_id not in self._model_to_processor:
+            return None
+        breaker = self._circuit_breakers.get(model_id)
+        if breaker is None:
+            breaker = CircuitBreaker(model_id)
+            self._circuit_breakers[model_id] = breaker
+        return breaker
 
     def get_all_models(self) -> list[AIModel]:
         """
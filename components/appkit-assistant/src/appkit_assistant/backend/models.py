@@ -1,6 +1,10 @@
+import hashlib
+from datetime import UTC, datetime
 from enum import StrEnum
+from typing import ClassVar
 
 import reflex as rx
+import sqlalchemy as sa
 from pydantic import BaseModel
 from sqlmodel import Field
 
@@ -31,6 +35,25 @@ class Chunk(BaseModel):
     text: str
     chunk_metadata: dict[str, str] = {}
 
+    @classmethod
+    def fast(
+        cls,
+        chunk_type: ChunkType,
+        text: str,
+        chunk_metadata: dict[str, str] | None = None,
+    ) -> "Chunk":
+        """Create a chunk without validation, for the streaming hot path.
+
+        The caller must pass string text and metadata values. The metadata dict
+        is stored as is and may be shared between chunks, so it must not be
+        mutated afterwards.
+        """
+        return cls.model_construct(
+            type=chunk_type,
+            text=text,
+            chunk_metadata=chunk_metadata if chunk_metadata is not None else {},
+        )
+
 
 class ThreadStatus(StrEnum):
     """Enum for thread status."""
@@ -73,6 +96,14 @@ class AIModel(BaseModel):
     temperature: float = 0.05
     supports_tools: bool = False
     supports_attachments: bool = False
+    max_concurrent_requests: int | None = None  # None = unlimited
+    tokens_per_minute: int | None = None  # estimated input tokens, None = unlimited
+    fallback_model: str | None = None  # model ID used when this model fails
+    context_window: int | None = None  # total tokens (input + output)
+    max_input_tokens: int | None = None  # overrides context_window for trimming
+    max_output_tokens: int | None = None  # reserved in the context_window
+    # Opt-in: chain turns server-side via previous_response_id (Responses API)
+    chain_responses: bool = False
 
 
 class Suggestion(BaseModel):
@@ -80,6 +111,85 @@ class Suggestion(BaseModel):
     icon: str = ""
 
 
+class ResponseChain(BaseModel):
+    """Server-side conversation state of a thread (Responses API).
+
+    Identifies the last stored response and the history it covers, so the
+    next turn can send only new messages with `previous_response_id`.
+
+    Stored messages never change, so besides the number of covered messages
+    only the last HISTORY_TAIL of them are compared. The older messages of a
+    thread therefore need not be loaded to continue the chain.
+    """
+
+    HISTORY_TAIL: ClassVar[int] = 2
+
+    response_id: str
+    model_id: str
+    prompt_hash: str
+    message_count: int
+    history_hash: str
+
+    @staticmethod
+    def hash_text(*parts: str) -> str:
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    @classmethod
+    def hash_messages(cls, messages: list[Message]) -> str:
+        return cls.hash_text(*(f"{msg.type}:{msg.text}" for msg in messages))
+
+    @classmethod
+    def hash_history(cls, messages: list[Message], count: int) -> str:
+        """Hash of the last HISTORY_TAIL of the first `count` messages."""
+        return cls.hash_messages(messages[max(count - cls.HISTORY_TAIL, 0) : count])
+
+    def matches(self, messages: list[Message], model_id: str, prompt_hash: str) -> bool:
+        """Check if the chain still covers the beginning of `messages`."""
+        return (
+            self.model_id == model_id
+            and self.prompt_hash == prompt_hash
+            and len(messages) > self.message_count
+            and self.history_hash == self.hash_history(messages, self.message_count)
+        )
+
+    def rebase(self, offset: int) -> "ResponseChain | None":
+        """The chain for a history without its first `offset` messages.
+
+        Returns None if the compared messages are among the left out ones.
+        """
+        if self.message_count - offset < min(self.HISTORY_TAIL, self.message_count):
+            return None
+        return self.model_copy(update={"message_count": self.message_count - offset})
+
+
+class ThreadSummary(BaseModel):
+    """Entry of the thread list, without messages."""
+
+    thread_id: str
+    title: str = ""
+    ai_model: str = ""
+    updated: datetime | None = None
+    active: bool = False
+
+
+class SnippetPart(BaseModel):
+    """Plain text part of a search snippet."""
+
+    text: str
+    highlight: bool = False  # matches the query
+
+
+class ThreadSearchResult(BaseModel):
+    """Message matching a search over the threads of a user."""
+
+    thread_id: str
+    title: str = ""
+    position: int
+    type: MessageType
+    snippet: list[SnippetPart] = []
+    rank: float = 0.0
+
+
 class ThreadModel(BaseModel):
     thread_id: str
     title: str = ""
@@ -88,6 +198,7 @@ class ThreadModel(BaseModel):
     prompt: str | None = ""
     messages: list[Message] = []
     ai_model: str = ""
+    response_chain: ResponseChain | None = None
 
 
 class MCPServer(rx.Model, table=True):
@@ -101,3 +212,61 @@ class MCPServer(rx.Model, table=True):
     url: str = Field(nullable=False)
     headers: str = Field(nullable=False, sa_type=EncryptedString)
     prompt: str = Field(default="", max_length=2000, nullable=True)
+
+
+class MCPServerSummary(BaseModel):
+    """MCP server without its (encrypted) headers, for listings."""
+
+    id: int
+    name: str
+    description: str = ""
+    url: str = ""
+    prompt: str = ""
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class AssistantThread(rx.Model, table=True):
+    """Persisted chat thread, owned by a user."""
+
+    __tablename__ = "assistant_thread"
+    __table_args__ = (
+        sa.Index("ix_assistant_thread_user_id_updated", "user_id", "updated"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    thread_id: str = Field(unique=True, max_length=36, nullable=False)
+    user_id: str = Field(max_length=100, nullable=False)
+    title: str = Field(default="", sa_type=sa.Text, nullable=False)
+    state: str = Field(default=ThreadStatus.NEW, max_length=20, nullable=False)
+    ai_model: str = Field(default="", max_length=100, nullable=False)
+    response_chain: dict | None = Field(default=None, sa_type=sa.JSON)
+    created: datetime = Field(
+        default_factory=_utc_now, sa_type=sa.DateTime(timezone=True), nullable=False
+    )
+    updated: datetime = Field(
+        default_factory=_utc_now, sa_type=sa.DateTime(timezone=True), nullable=False
+    )
+
+
+class AssistantMessage(rx.Model, table=True):
+    """Persisted message of a chat thread, ordered by position."""
+
+    __tablename__ = "assistant_message"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "thread_id", "position", name="uq_assistant_message_thread_position"
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    thread_id: int = Field(
+        foreign_key="assistant_thread.id", ondelete="CASCADE", nullable=False
+    )
+    position: int = Field(nullable=False)
+    type: str = Field(max_length=20, nullable=False)
+    text: str = Field(default="", sa_type=sa.Text, nullable=False)
+    editable: bool = Field(default=False, nullable=False)
+    done: bool = Field(default=True, nullable=False)
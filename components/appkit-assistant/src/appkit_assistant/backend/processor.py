@@ -21,6 +21,7 @@ class Processor(abc.ABC):
         model_id: str,
         files: list[str] | None = None,
         mcp_servers: list[MCPServer] | None = None,
+        thread_id: str | None = None,
     ) -> AsyncGenerator[Chunk, None]:
         """
         Process the thread using an AI model.
@@ -30,6 +31,8 @@ class Processor(abc.ABC):
             model_id: The ID of the model to use.
             files: Optional list of file paths that were uploaded.
             mcp_servers: Optional list of MCP servers to use as tools.
+            thread_id: Optional ID of the thread, keeps the requests of a thread
+                on the same provider-side prompt cache.
 
         Returns:
             An async generator that yields Chunk objects containing different content
@@ -31,6 +31,8 @@ GPT_4o: Final = AIModel(
     stream=True,
     supports_attachments=True,
     supports_tools=True,
+    context_window=128_000,
+    max_output_tokens=16_384,
 )
 
 GPT_4_1: Final = AIModel(
@@ -41,6 +43,8 @@ GPT_4_1: Final = AIModel(
     stream=True,
     supports_attachments=True,
     supports_tools=True,
+    context_window=1_047_576,
+    max_output_tokens=32_768,
 )
 
 O3: Final = AIModel(
@@ -52,6 +56,8 @@ O3: Final = AIModel(
     stream=True,
     supports_attachments=True,
     supports_tools=True,
+    context_window=200_000,
+    max_output_tokens=100_000,
 )
 
 O4_MINI: Final = AIModel(
@@ -63,6 +69,8 @@ O4_MINI: Final = AIModel(
     supports_attachments=True,
     supports_tools=True,
     temperature=1,
+    context_window=200_000,
+    max_output_tokens=100_000,
 )
 
 GPT_5: Final = AIModel(
@@ -74,6 +82,9 @@ GPT_5: Final = AIModel(
     supports_attachments=True,
     supports_tools=True,
     temperature=1,
+    fallback_model="gpt-5-mini",
+    context_window=400_000,
+    max_input_tokens=272_000,
 )
 
 GPT_5_CHAT: Final = AIModel(
@@ -84,6 +95,8 @@ GPT_5_CHAT: Final = AIModel(
     stream=True,
     supports_attachments=True,
     supports_tools=False,
+    context_window=128_000,
+    max_output_tokens=16_384,
 )
 
 GPT_5_MINI: Final = AIModel(
@@ -95,6 +108,8 @@ GPT_5_MINI: Final = AIModel(
     supports_attachments=True,
     supports_tools=True,
     temperature=1,
+    context_window=400_000,
+    max_input_tokens=272_000,
 )
 
 GPT_5_NANO: Final = AIModel(
@@ -106,4 +121,6 @@ GPT_5_NANO: Final = AIModel(
     supports_attachments=True,
     supports_tools=True,
     temperature=1,
+    context_window=400_000,
+    max_input_tokens=272_000,
 )
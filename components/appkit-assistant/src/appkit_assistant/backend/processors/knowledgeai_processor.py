@@ -15,6 +15,8 @@ from appkit_assistant.backend.models import (
     MessageType,
 )
 from appkit_assistant.backend.processor import Processor
+from appkit_assistant.backend.token_budget import fit_messages
+from appkit_commons.http_pool import http_client_pool
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +81,7 @@ class KnowledgeAIProcessor(Processor):
         model_id: str,
         files: list[str] | None = None,  # noqa: ARG002
         mcp_servers: list[MCPServer] | None = None,  # noqa: ARG002
+        thread_id: str | None = None,  # noqa: ARG002
     ) -> AsyncGenerator[Chunk, None]:
         try:
             from knai_avvia.backend.chat_client import chat_completion  # noqa: PLC0415
@@ -92,7 +95,9 @@ class KnowledgeAIProcessor(Processor):
             logger.error("Model %s not supported by OpenAI processor", model_id)
             raise ValueError(f"Model {model_id} not supported by OpenAI processor")
 
-        chat_messages = self._convert_messages(messages)
+        chat_messages = self._convert_messages(
+            fit_messages(messages, self.models[model_id])
+        )
 
         try:
             result = await chat_completion(
@@ -145,8 +150,14 @@ class KnowledgeAIOpenAIProcessor(Processor):
         self.server = server
         self.models = models
         self.with_projects = with_projects
+        # The ResilientProcessor retries, the SDK's own retries would stack on top
         self.client = (
-            AsyncOpenAI(api_key=self.api_key, base_url=self.server + "/api/openai/v1")
+            AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.server + "/api/openai/v1",
+                http_client=http_client_pool().get_client(self.server),
+                max_retries=0,
+            )
             if self.api_key
             else None
         )
@@ -196,6 +207,7 @@ class KnowledgeAIOpenAIProcessor(Processor):
         model_id: str,
         files: list[str] | None = None,  # noqa: ARG002
         mcp_servers: list[MCPServer] | None = None,  # noqa: ARG002
+        thread_id: str | None = None,  # noqa: ARG002
     ) -> AsyncGenerator[Chunk, None]:
         if not self.client:
             raise ValueError("KnowledgeAI OpenAI Client not initialized.")
@@ -206,7 +218,9 @@ class KnowledgeAIOpenAIProcessor(Processor):
                 "Model %s not supported by KnowledgeAI processor", model_id
             )
 
-        chat_messages = self._convert_messages_to_openai_format(messages)
+        chat_messages = self._convert_messages_to_openai_format(
+            fit_messages(messages, model)
+        )
 
         try:
             session_params: dict[str, Any] = {
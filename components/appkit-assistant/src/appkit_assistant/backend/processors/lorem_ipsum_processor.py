@@ -56,6 +56,7 @@ class LoremIpsumProcessor(Processor):
         model_id: str,
         files: list[str] | None = None,  # noqa: ARG002
         mcp_servers: list[MCPServer] | None = None,  # noqa: ARG002
+        thread_id: str | None = None,  # noqa: ARG002
     ) -> AsyncGenerator[Chunk, None]:
         """
         Generate a Lorem Ipsum response of varying lengths based on the model_id.
@@ -16,9 +16,12 @@ from appkit_assistant.backend.models import (
     Message,
 )
 from appkit_assistant.backend.processor import Processor
+from appkit_commons.http_pool import http_client_pool
 
 logger = logging.getLogger(__name__)
 
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
 
 class BaseOpenAIProcessor(Processor, ABC):
     """Base class for OpenAI processors with common initialization and utilities."""
@@ -43,17 +46,28 @@ class BaseOpenAIProcessor(Processor, ABC):
         self.models = models
         self.is_azure = is_azure
         self.client = None
+        http_client = http_client_pool().get_client(self.base_url or OPENAI_BASE_URL)
+        # The ResilientProcessor retries, the SDK's own retries would stack on top
 
         if self.api_key and self.base_url and is_azure:
             self.client = AsyncAzureOpenAI(
                 api_key=self.api_key,
                 azure_endpoint=self.base_url,
                 api_version="2025-04-01-preview",
+                http_client=http_client,
+                max_retries=0,
             )
         elif self.api_key and self.base_url:
-            self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+            self.client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=0,
+            )
         elif self.api_key:
-            self.client = AsyncOpenAI(api_key=self.api_key)
+            self.client = AsyncOpenAI(
+                api_key=self.api_key, http_client=http_client, max_retries=0
+            )
         else:
             logger.warning("No API key found. Processor will not work.")
 
@@ -65,6 +79,7 @@ class BaseOpenAIProcessor(Processor, ABC):
         files: list[str] | None = None,
         mcp_servers: list[MCPServer] | None = None,
         payload: dict[str, Any] | None = None,
+        thread_id: str | None = None,
     ) -> AsyncGenerator[Chunk, None]:
         """Process messages and generate AI response chunks."""
 
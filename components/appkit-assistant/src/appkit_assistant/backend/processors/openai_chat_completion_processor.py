@@ -13,6 +13,8 @@ from appkit_assistant.backend.models import (
     MessageType,
 )
 from appkit_assistant.backend.processors.openai_base import BaseOpenAIProcessor
+from appkit_assistant.backend.prompt_assembly import prompt_cache_stats
+from appkit_assistant.backend.token_budget import fit_messages
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,7 @@ class OpenAIChatCompletionsProcessor(BaseOpenAIProcessor):
         files: list[str] | None = None,  # noqa: ARG002
         mcp_servers: list[MCPServer] | None = None,
         payload: dict[str, Any] | None = None,
+        thread_id: str | None = None,  # noqa: ARG002
     ) -> AsyncGenerator[Chunk, None]:
         """Process messages using the Chat Completions API.
 
@@ -36,6 +39,7 @@ class OpenAIChatCompletionsProcessor(BaseOpenAIProcessor):
             files: File attachments (not used in chat completions)
             mcp_servers: MCP servers (will log warning if provided)
             payload: Additional payload parameters
+            thread_id: ID of the thread (not used in chat completions)
         """
         if not self.client:
             raise ValueError("OpenAI Client not initialized.")
@@ -51,12 +55,21 @@ class OpenAIChatCompletionsProcessor(BaseOpenAIProcessor):
 
         model = self.models[model_id]
 
+        # Usage reporting in streams is an OpenAI extension that compatible
+        # servers behind a custom base URL may reject
+        stream_options = (
+            {"include_usage": True} if model.stream and not self.base_url else None
+        )
+
         try:
-            chat_messages = self._convert_messages_to_openai_format(messages)
+            chat_messages = self._convert_messages_to_openai_format(
+                fit_messages(messages, model)
+            )
             session = await self.client.chat.completions.create(
                 model=model.model,
                 messages=chat_messages[:-1],
                 stream=model.stream,
+                stream_options=stream_options,
                 temperature=model.temperature,
                 extra_body=payload,
             )
@@ -67,7 +80,10 @@ class OpenAIChatCompletionsProcessor(BaseOpenAIProcessor):
                         content = event.choices[0].delta.content
                         if content:
                             yield self._create_chunk(content, model.model, stream=True)
+                    elif event.usage:  # final chunk, without choices
+                        prompt_cache_stats.record_usage(event.usage)
             else:
+                prompt_cache_stats.record_usage(session.usage)
                 content = session.choices[0].message.content
                 if content:
                     yield self._create_chunk(content, model.model)
@@ -75,12 +91,12 @@ class OpenAIChatCompletionsProcessor(BaseOpenAIProcessor):
             raise e
 
     def _create_chunk(self, content: str, model: str, stream: bool = False) -> Chunk:
-        return Chunk(
-            type=ChunkType.TEXT,
-            text=content,
-            chunk_metadata={
+        return Chunk.fast(
+            ChunkType.TEXT,
+            content,
+            {
                 "source": "chat_completions",
-                "streaming": str(stream),
+                "streaming": "True" if stream else "False",
                 "model": model,
             },
         )
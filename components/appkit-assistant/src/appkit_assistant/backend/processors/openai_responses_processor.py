@@ -1,8 +1,15 @@
-import json
 import logging
+import re
 from collections.abc import AsyncGenerator
-from typing import Any
+from typing import Any, ClassVar
 
+import openai
+
+from appkit_assistant.backend.mcp_server_cache import mcp_server_cache
+from appkit_assistant.backend.mcp_tool_cache import (
+    ToolManifest,
+    tool_manifest_cache,
+)
 from appkit_assistant.backend.models import (
     AIModel,
     Chunk,
@@ -10,16 +17,55 @@ from appkit_assistant.backend.models import (
     MCPServer,
     Message,
     MessageType,
+    ResponseChain,
 )
 from appkit_assistant.backend.processors.openai_base import BaseOpenAIProcessor
-from appkit_assistant.backend.system_prompt import SYSTEM_PROMPT
+from appkit_assistant.backend.prompt_assembly import (
+    AssembledPrompt,
+    assemble_system_prompt,
+    prompt_cache_stats,
+)
+from appkit_assistant.backend.token_budget import count_text_tokens, fit_messages
 
 logger = logging.getLogger(__name__)
 
+# Status code of a previous_response_id that is unknown or expired; the API
+# also answers 400 with param "previous_response_id" for it
+CHAIN_NOT_FOUND_STATUS_CODE = 404
+BAD_REQUEST_STATUS_CODE = 400
+# param of a bad request naming the rejected input item, e.g. "input[1].tools"
+INPUT_ITEM_PARAM = re.compile(r"input\[(\d+)\]")
+# Fields of an mcp_list_tools output item sent back as input
+TOOL_LIST_ITEM_FIELDS = frozenset({"type", "id", "server_label", "tools"})
+
+
+def _rejects_chain(error: openai.APIStatusError) -> bool:
+    """Whether the request failed because of its previous_response_id."""
+    return error.status_code == CHAIN_NOT_FOUND_STATUS_CODE or (
+        error.status_code == BAD_REQUEST_STATUS_CODE
+        and error.param == "previous_response_id"
+    )
+
+
+def _rejected_tool_list(
+    error: openai.APIStatusError, tool_lists: list[dict[str, Any]]
+) -> dict[str, Any] | None:
+    """The cached tool list the request failed on, if any."""
+    if error.status_code != BAD_REQUEST_STATUS_CODE:
+        return None
+    match = INPUT_ITEM_PARAM.match(error.param or "")
+    # Cached tool lists follow the system message
+    index = int(match.group(1)) - 1 if match else -1
+    return tool_lists[index] if 0 <= index < len(tool_lists) else None
+
 
 class OpenAIResponsesProcessor(BaseOpenAIProcessor):
     """Simplified processor using content accumulator pattern."""
 
+    _PROCESSOR_NAME: ClassVar[str] = "openai_responses_simplified"
+    # Shared by all text delta chunks, never mutated
+    _TEXT_METADATA: ClassVar[dict[str, str]] = {"processor": _PROCESSOR_NAME}
+
     def __init__(
         self,
         models: dict[str, AIModel],
@@ -37,8 +83,19 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
         files: list[str] | None = None,  # noqa: ARG002
         mcp_servers: list[MCPServer] | None = None,
         payload: dict[str, Any] | None = None,
+        response_chain: ResponseChain | None = None,
+        thread_id: str | None = None,
     ) -> AsyncGenerator[Chunk, None]:
-        """Process messages using simplified content accumulator pattern."""
+        """Process messages using simplified content accumulator pattern.
+
+        If `response_chain` still matches the thread, only the messages added
+        since the chained response are sent, together with its
+        `previous_response_id`. When the server rejects the id (expired or
+        deleted response), the full history is replayed instead.
+
+        Cached tool lists of the MCP servers are sent along, so the API does
+        not list the tools again; see mcp_tool_cache.
+        """
         if not self.client:
             raise ValueError("OpenAI Client not initialized.")
 
@@ -48,15 +105,53 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
 
         model = self.models[model_id]
 
+        # Configure MCP tools if provided
+        servers_by_label = {server.name: server for server in mcp_servers or []}
+        manifests = {
+            label: manifest
+            for label, server in servers_by_label.items()
+            if (manifest := tool_manifest_cache().get(server))
+        }
+        tools, mcp_prompts = (
+            self._configure_mcp_tools(mcp_servers, manifests)
+            if mcp_servers
+            else ([], [])
+        )
+        prompt = assemble_system_prompt(mcp_prompts).for_thread(thread_id)
+        # Header values may contain secrets and are left out of the hash
+        prompt_hash = ResponseChain.hash_text(
+            prompt.prompt_hash, *(tool["server_url"] for tool in tools)
+        )
+        if response_chain and not response_chain.matches(
+            messages, model_id, prompt_hash
+        ):
+            logger.debug("Response chain outdated, sending the full history")
+            response_chain = None
+        # A chained response already holds the tool lists of its context
+        tool_lists = (
+            [] if response_chain else [manifest.item for manifest in manifests.values()]
+        )
+
         try:
-            session = await self._create_responses_request(
-                messages, model, mcp_servers, payload
+            session = await self._create_request_with_fallback(
+                messages,
+                model,
+                tools,
+                prompt,
+                payload,
+                response_chain,
+                tool_lists,
+                servers_by_label,
             )
 
             if hasattr(session, "__aiter__"):  # Streaming
                 async for event in session:
+                    self._cache_tool_list(event, servers_by_label)
                     chunk = self._handle_event(event)
                     if chunk:
+                        if chunk.chunk_metadata.get("response_id"):
+                            chunk.chunk_metadata["model_id"] = model_id
+                            chunk.chunk_metadata["prompt_hash"] = prompt_hash
                         yield chunk
             else:  # Non-streaming
                 content = self._extract_responses_content(session)
@@ -72,42 +167,58 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
         except Exception as e:
             raise e
 
+    # Event type -> name of the handler method. Resolved by name so that
+    # subclasses can override individual handlers.
+    _EVENT_HANDLERS: ClassVar[dict[str, str]] = {
+        "response.created": "_handle_lifecycle_events",
+        "response.in_progress": "_handle_lifecycle_events",
+        "response.done": "_handle_lifecycle_events",
+        "response.output_text.delta": "_handle_text_events",
+        "response.output_text.annotation.added": "_handle_text_events",
+        "response.output_item.added": "_handle_item_events",
+        "response.output_item.done": "_handle_item_events",
+        "response.mcp_call_arguments.delta": "_handle_mcp_events",
+        "response.mcp_call_arguments.done": "_handle_mcp_events",
+        "response.mcp_call.failed": "_handle_mcp_events",
+        "response.mcp_call.in_progress": "_handle_mcp_events",
+        "response.mcp_list_tools.in_progress": "_handle_mcp_events",
+        "response.mcp_list_tools.completed": "_handle_mcp_events",
+        "response.mcp_list_tools.failed": "_handle_mcp_events",
+        "response.content_part.added": "_handle_content_events",
+        "response.content_part.done": "_handle_content_events",
+        "response.output_text.done": "_handle_content_events",
+        "response.completed": "_handle_completion_events",
+    }
+
     def _handle_event(self, event: Any) -> Chunk | None:
-        """Simplified event handler returning actual event content in chunks."""
-        if not hasattr(event, "type"):
+        """Dispatch an event to its handler and return the resulting chunk."""
+        event_type = getattr(event, "type", None)
+        if event_type is None:
             return None
 
-        event_type = event.type
-        logger.debug("Event: %s", event)
-
-        # Try different handlers in order
-        handlers = [
-            self._handle_lifecycle_events,
-            lambda et: self._handle_text_events(et, event),
-            lambda et: self._handle_item_events(et, event),
-            lambda et: self._handle_mcp_events(et, event),
-            lambda et: self._handle_content_events(et, event),
-            lambda et: self._handle_completion_events(et, event),
-            lambda et: self._handle_image_events(et, event),
-        ]
-
-        for handler in handlers:
-            result = handler(event_type)
-            if result:
-                content_preview = result.text[:50] if result.text else ""
-                logger.info(
-                    "Event %s → Chunk: type=%s, content=%s",
-                    event_type,
-                    result.type,
-                    content_preview,
-                )
-                return result
+        # Fast path for the overwhelmingly common case
+        if event_type == "response.output_text.delta":
+            return Chunk.fast(ChunkType.TEXT, event.delta, self._TEXT_METADATA)
+
+        handler_name = self._EVENT_HANDLERS.get(event_type)
+        if handler_name is not None:
+            result = getattr(self, handler_name)(event_type, event)
+        elif "image" in event_type:
+            result = self._handle_image_events(event_type, event)
+        else:
+            logger.debug("Unhandled event type: %s", event_type)
+            return None
 
-        # Log unhandled events for debugging
-        logger.debug("Unhandled event type: %s", event_type)
-        return None
+        if result and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Event %s → Chunk: type=%s, content=%s",
+                event_type,
+                result.type,
+                result.text[:50] if result.text else "",
+            )
+        return result
 
-    def _handle_lifecycle_events(self, event_type: str) -> Chunk | None:
+    def _handle_lifecycle_events(self, event_type: str, event: Any) -> Chunk | None:
         """Handle lifecycle events."""
         lifecycle_events = {
             "response.created": ("created", {"stage": "created"}),
@@ -117,6 +228,9 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
 
         if event_type in lifecycle_events:
             content, metadata = lifecycle_events[event_type]
+            if event_type == "response.created":
+                response = getattr(event, "response", None)
+                metadata = {**metadata, "response_id": getattr(response, "id", None)}
             chunk_type = (
                 ChunkType.LIFECYCLE
                 if event_type != "response.done"
@@ -128,9 +242,7 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
     def _handle_text_events(self, event_type: str, event: Any) -> Chunk | None:
         """Handle text-related events."""
         if event_type == "response.output_text.delta":
-            return self._create_chunk(
-                ChunkType.TEXT, event.delta, {"delta": event.delta}
-            )
+            return Chunk.fast(ChunkType.TEXT, event.delta, self._TEXT_METADATA)
 
         if event_type == "response.output_text.annotation.added":
             return self._create_chunk(
@@ -346,13 +458,18 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
 
         return None
 
-    def _handle_completion_events(self, event_type: str, event: Any) -> Chunk | None:  # noqa: ARG002
+    def _handle_completion_events(self, event_type: str, event: Any) -> Chunk | None:
         """Handle completion-related events."""
         if event_type == "response.completed":
+            metadata = {"status": "response_complete"}
+            response = getattr(event, "response", None)
+            usage = prompt_cache_stats.record_usage(getattr(response, "usage", None))
+            if usage:
+                metadata["input_tokens"], metadata["cached_tokens"] = usage
             return self._create_chunk(
                 ChunkType.COMPLETION,
                 "Response generation completed",
-                {"status": "response_complete"},
+                metadata,
             )
         return None
 
@@ -374,39 +491,102 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
         extra_metadata: dict[str, str] | None = None,
     ) -> Chunk:
         """Create a Chunk with actual content from the event"""
-        metadata = {
-            "processor": "openai_responses_simplified",
-        }
+        metadata = {"processor": self._PROCESSOR_NAME}
 
         if extra_metadata:
             # Ensure all metadata values are strings
-            for key, value in extra_metadata.items():
-                if value is not None:
-                    metadata[key] = str(value)
-
-        return Chunk(
-            type=chunk_type,
-            text=content,
-            chunk_metadata=metadata,
+            metadata.update(
+                {
+                    key: value if isinstance(value, str) else str(value)
+                    for key, value in extra_metadata.items()
+                    if value is not None
+                }
+            )
+
+        return Chunk.fast(
+            chunk_type,
+            content if isinstance(content, str) else str(content),
+            metadata,
+        )
+
+    async def _create_request_with_fallback(
+        self,
+        messages: list[Message],
+        model: AIModel,
+        tools: list[dict[str, Any]],
+        prompt: AssembledPrompt,
+        payload: dict[str, Any] | None,
+        response_chain: ResponseChain | None,
+        tool_lists: list[dict[str, Any]],
+        servers_by_label: dict[str, MCPServer],
+    ) -> Any:
+        """Create the request, without the cached state if the server rejects it.
+
+        A rejected response chain is replaced by the full history. A rejected
+        tool list is dropped from the cache, so the API lists the tools of its
+        server again.
+        """
+        try:
+            return await self._create_responses_request(
+                messages, model, tools, prompt, payload, response_chain, tool_lists
+            )
+        except openai.APIStatusError as e:
+            if response_chain and _rejects_chain(e):
+                logger.warning(
+                    "Previous response %s rejected (%s), replaying full history",
+                    response_chain.response_id,
+                    e.status_code,
+                )
+            elif tool_list := _rejected_tool_list(e, tool_lists):
+                label = tool_list["server_label"]
+                logger.warning(
+                    "Cached tool list of MCP server %s rejected (%s), listing "
+                    "tools again",
+                    label,
+                    e.status_code,
+                )
+                tool_manifest_cache().invalidate(servers_by_label[label].id)
+            else:
+                raise
+
+        return await self._create_responses_request(
+            messages, model, tools, prompt, payload
         )
 
     async def _create_responses_request(
         self,
         messages: list[Message],
         model: AIModel,
-        mcp_servers: list[MCPServer] | None = None,
+        tools: list[dict[str, Any]],
+        prompt: AssembledPrompt,
         payload: dict[str, Any] | None = None,
+        response_chain: ResponseChain | None = None,
+        tool_lists: list[dict[str, Any]] | None = None,
     ) -> Any:
         """Create a simplified responses API request."""
-        # Configure MCP tools if provided
-        tools, mcp_prompt = (
-            self._configure_mcp_tools(mcp_servers) if mcp_servers else ([], "")
-        )
+        extra_params: dict[str, Any] = {}
+        if response_chain:
+            # The server already holds the system prompt and earlier turns
+            input_messages = self._convert_messages_to_responses_format(
+                messages[response_chain.message_count :]
+            )
+            extra_params["previous_response_id"] = response_chain.response_id
+        else:
+            # Drop old turns exceeding the context window, keeping room for
+            # the system prompt
+            messages = fit_messages(
+                messages, model, reserved_tokens=count_text_tokens(prompt.text)
+            )
+            input_messages = self._convert_messages_to_responses_format(
+                messages, system_text=prompt.text
+            )
+            # Cached tool lists follow the system message
+            input_messages[1:1] = tool_lists or []
 
-        # Convert messages to responses format with system message
-        input_messages = self._convert_messages_to_responses_format(
-            messages, mcp_prompt=mcp_prompt
-        )
+        if model.chain_responses:
+            extra_params["store"] = True
+        if not self.is_azure:
+            extra_params["prompt_cache_key"] = prompt.cache_key
 
         params = {
             "model": model.model,
@@ -415,6 +595,7 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
             "temperature": model.temperature,
             "tools": tools,
             "reasoning": {"effort": "medium"},
+            **extra_params,
             **(payload or {}),
         }
 
@@ -422,54 +603,72 @@ class OpenAIResponsesProcessor(BaseOpenAIProcessor):
         return await self.client.responses.create(**params)
 
     def _configure_mcp_tools(
-        self, mcp_servers: list[MCPServer] | None
-    ) -> tuple[list[dict[str, Any]], str]:
+        self,
+        mcp_servers: list[MCPServer] | None,
+        manifests: dict[str, ToolManifest] | None = None,
+    ) -> tuple[list[dict[str, Any]], list[str]]:
         """Configure MCP servers as tools for the responses API.
 
+        Servers with a cached tool list are restricted to the cached tools.
+
         Returns:
-            tuple: (tools list, concatenated prompts string)
+            tuple: (tools list, prompts of the servers)
         """
         if not mcp_servers:
-            return [], ""
+            return [], []
 
         tools = []
         prompts = []
         for server in mcp_servers:
-            tool_config = {
-                "type": "mcp",
-                "server_label": server.name,
-                "server_url": server.url,
-                "require_approval": "never",
-            }
+            tool_config = mcp_server_cache().tool_config(server)
 
-            if server.headers and server.headers != "{}":
-                tool_config["headers"] = json.loads(server.headers)
+            manifest = (manifests or {}).get(server.name)
+            if manifest:
+                tool_config["allowed_tools"] = manifest.tool_names
 
             tools.append(tool_config)
 
             if server.prompt:
-                prompts.append(f"- {server.prompt}")
+                prompts.append(server.prompt)
 
-        prompt_string = "\n".join(prompts) if prompts else ""
-        return tools, prompt_string
+        return tools, prompts
+
+    def _cache_tool_list(
+        self, event: Any, servers_by_label: dict[str, MCPServer]
+    ) -> None:
+        """Cache the tool list of an MCP server listed by the API."""
+        if getattr(event, "type", None) != "response.output_item.done":
+            return
+        item = getattr(event, "item", None)
+        if getattr(item, "type", None) != "mcp_list_tools" or getattr(
+            item, "error", None
+        ):
+            return
+
+        server = servers_by_label.get(item.server_label)
+        if server is not None:
+            tool_manifest_cache().put(
+                server,
+                item.model_dump(include=TOOL_LIST_ITEM_FIELDS, exclude_none=True),
+            )
 
     def _convert_messages_to_responses_format(
-        self, messages: list[Message], mcp_prompt: str = ""
+        self, messages: list[Message], system_text: str | None = None
     ) -> list[dict[str, Any]]:
         """Convert messages to the responses API input format.
 
-        The system message is always prepended as the first message with role="system".
+        The system message is prepended as the first message with role="system",
+        unless it is omitted for a chained request.
         """
         input_messages = []
 
-        # Always add system message as first message
-        system_text = SYSTEM_PROMPT.format(mcp_prompts=mcp_prompt)
-        input_messages.append(
-            {
-                "role": "system",
-                "content": [{"type": "input_text", "text": system_text}],
-            }
-        )
+        if system_text is not None:
+            input_messages.append(
+                {
+                    "role": "system",
+                    "content": [{"type": "input_text", "text": system_text}],
+                }
+            )
 
         # Add conversation messages
         for msg in messages:
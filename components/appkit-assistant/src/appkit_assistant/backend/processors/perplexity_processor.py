@@ -33,6 +33,7 @@ SONAR = PerplexityAIModel(
     icon="perplexity",
     model="sonar",
     stream=True,
+    context_window=128_000,
 )
 
 SONAR_PRO = PerplexityAIModel(
@@ -41,6 +42,7 @@ SONAR_PRO = PerplexityAIModel(
     icon="perplexity",
     model="sonar-pro",
     stream=True,
+    context_window=200_000,
 )
 
 SONAR_DEEP_RESEARCH = PerplexityAIModel(
@@ -50,6 +52,7 @@ SONAR_DEEP_RESEARCH = PerplexityAIModel(
     model="sonar-deep-research",
     search_context_size=ContextSize.HIGH,
     stream=True,
+    context_window=128_000,
 )
 
 SONAR_REASONING = PerplexityAIModel(
@@ -59,6 +62,7 @@ SONAR_REASONING = PerplexityAIModel(
     model="sonar-reasoning",
     search_context_size=ContextSize.HIGH,
     stream=True,
+    context_window=128_000,
 )
 
 ALL_MODELS = {
@@ -87,6 +91,7 @@ class PerplexityProcessor(OpenAIChatCompletionsProcessor):
         files: list[str] | None = None,
         mcp_servers: list[MCPServer] | None = None,  # noqa: ARG002
         payload: dict[str, Any] | None = None,
+        thread_id: str | None = None,
     ) -> AsyncGenerator[Chunk, None]:
         if model_id not in self.models:
             logger.error("Model %s not supported by Perplexity processor", model_id)
@@ -114,5 +119,6 @@ class PerplexityProcessor(OpenAIChatCompletionsProcessor):
             files=files,
             mcp_servers=None,
             payload=perplexity_payload,
+            thread_id=thread_id,
         ):
             yield response
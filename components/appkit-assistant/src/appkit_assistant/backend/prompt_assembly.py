@@ -0,0 +1,145 @@
+"""
+Prompt assembly with a cache friendly layout.
+
+Providers cache prompts by their longest byte-identical prefix. The system
+prompt is therefore assembled as a static part, shared by all requests, followed
+by the request specific MCP tool guidelines. Assembled prompts are memoized per
+prompt version and set of MCP prompts, and the prompt cache statistics reported
+in the response usage are collected process-wide.
+
+The prompt cache key routes requests to a cache shard of the provider. A
+single key overflows its shard at a few requests per minute, so threads are
+spread over PROMPT_CACHE_BUCKETS keys, each thread always using the same one.
+"""
+
+import hashlib
+import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any
+
+from appkit_assistant.backend.system_prompt import (
+    MCP_PROMPT_SECTION,
+    PROMPT_VERSION,
+    SYSTEM_PROMPT,
+)
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CACHE_KEY_PREFIX = "appkit"
+PROMPT_CACHE_BUCKETS = 16
+
+
+@dataclass(frozen=True)
+class AssembledPrompt:
+    """A formatted system prompt and the keys identifying it."""
+
+    text: str
+    prompt_hash: str  # identifies the full text
+    cache_key: str  # prompt_cache_key sent to the provider
+
+    def for_thread(self, thread_id: str | None) -> "AssembledPrompt":
+        """The prompt with the cache key of the bucket of a thread."""
+        if not thread_id:
+            return self
+        digest = hashlib.blake2b(thread_id.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest) % PROMPT_CACHE_BUCKETS
+        return replace(self, cache_key=f"{self.cache_key}-{bucket}")
+
+
+@lru_cache(maxsize=256)
+def _assemble(version: str, mcp_prompts: tuple[str, ...]) -> AssembledPrompt:
+    text = SYSTEM_PROMPT
+    if mcp_prompts:
+        text += MCP_PROMPT_SECTION.format(
+            mcp_prompts="\n".join(f"- {prompt}" for prompt in mcp_prompts)
+        )
+    prompt_hash = hashlib.sha256(text.encode()).hexdigest()
+    # Requests sharing the static prefix should be routed to the same cache
+    # shards, so the key only depends on the prompt version (and the bucket of
+    # the thread, see AssembledPrompt.for_thread)
+    return AssembledPrompt(
+        text=text,
+        prompt_hash=prompt_hash,
+        cache_key=f"{PROMPT_CACHE_KEY_PREFIX}-system-v{version}",
+    )
+
+
+def assemble_system_prompt(mcp_prompts: Iterable[str] = ()) -> AssembledPrompt:
+    """Return the memoized system prompt for a set of MCP server prompts.
+
+    The prompts are deduplicated and sorted, so the result does not depend on
+    the order in which MCP servers were selected.
+    """
+    key = tuple(sorted({prompt for prompt in mcp_prompts if prompt}))
+    return _assemble(PROMPT_VERSION, key)
+
+
+class PromptCacheStats:
+    """Process-wide counters for provider-side prompt cache hits."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests_total = 0
+        self.cache_hits_total = 0  # requests with at least one cached token
+        self.input_tokens_total = 0
+        self.cached_tokens_total = 0
+
+    def record(self, input_tokens: int, cached_tokens: int) -> None:
+        """Record the prompt token usage of a single request."""
+        with self._lock:
+            self.requests_total += 1
+            self.input_tokens_total += input_tokens
+            self.cached_tokens_total += cached_tokens
+            if cached_tokens:
+                self.cache_hits_total += 1
+
+    def record_usage(self, usage: Any) -> tuple[int, int] | None:
+        """Record a Responses or Chat Completions API usage object.
+
+        Returns:
+            (input tokens, cached tokens), or None if there was no usage
+        """
+        if usage is None:
+            return None
+
+        input_tokens = getattr(usage, "input_tokens", None)
+        details = getattr(usage, "input_tokens_details", None)
+        if input_tokens is None:  # Chat Completions API
+            input_tokens = getattr(usage, "prompt_tokens", None)
+            details = getattr(usage, "prompt_tokens_details", None)
+        if input_tokens is None:
+            return None
+
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        self.record(input_tokens, cached_tokens)
+        logger.debug("Prompt tokens: %d, cached: %d", input_tokens, cached_tokens)
+        return input_tokens, cached_tokens
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the current counters as a dictionary."""
+        with self._lock:
+            return {
+                "requests_total": self.requests_total,
+                "cache_hits_total": self.cache_hits_total,
+                "input_tokens_total": self.input_tokens_total,
+                "cached_tokens_total": self.cached_tokens_total,
+                "cached_token_ratio": (
+                    self.cached_tokens_total / self.input_tokens_total
+                    if self.input_tokens_total
+                    else 0.0
+                ),
+            }
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self.requests_total = 0
+            self.cache_hits_total = 0
+            self.input_tokens_total = 0
+            self.cached_tokens_total = 0
+
+
+prompt_cache_stats = PromptCacheStats()
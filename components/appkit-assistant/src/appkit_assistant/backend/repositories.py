@@ -1,27 +1,170 @@
-"""Repository for MCP server data access operations."""
+"""Repositories for MCP server and chat thread data access operations."""
 
 import logging
+import re
+from datetime import UTC, datetime
+from typing import Any
 
 import reflex as rx
+from sqlalchemy import delete, literal_column
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from appkit_assistant.backend.models import MCPServer
+from appkit_assistant.backend.mcp_server_cache import mcp_server_cache
+from appkit_assistant.backend.mcp_tool_cache import tool_manifest_cache
+from appkit_assistant.backend.models import (
+    AssistantMessage,
+    AssistantThread,
+    MCPServer,
+    MCPServerSummary,
+    Message,
+    MessageType,
+    ResponseChain,
+    SnippetPart,
+    ThreadModel,
+    ThreadSearchResult,
+    ThreadStatus,
+    ThreadSummary,
+)
 
 logger = logging.getLogger(__name__)
 
+# Text search configuration of the assistant_message.search_vector column
+SEARCH_CONFIG = literal_column("'german'::regconfig")
+SEARCH_VECTOR = literal_column("assistant_message.search_vector")
+# Private use characters enclosing the matches in headlines, split off into
+# SnippetParts so the snippet is never rendered as markup
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=30, "
+    'MinWords=10, MaxFragments=2, FragmentDelimiter=" … "'
+)
+SEARCHED_MESSAGE_TYPES = (MessageType.HUMAN, MessageType.ASSISTANT)
+SNIPPET_CHARS = 80
+
+
+def _headline_parts(headline: str) -> list[SnippetPart]:
+    """Split a ts_headline result at its highlight markers."""
+    segments = re.split(f"[{HIGHLIGHT_START}{HIGHLIGHT_STOP}]", headline)
+    return [
+        SnippetPart(text=segment, highlight=i % 2 == 1)
+        for i, segment in enumerate(segments)
+        if segment
+    ]
+
+
+def _match_parts(text: str, pattern: re.Pattern[str]) -> list[SnippetPart]:
+    """Split a text into the matches of `pattern` and the text between them."""
+    parts = []
+    end = 0
+    for match in pattern.finditer(text):
+        if match.start() > end:
+            parts.append(SnippetPart(text=text[end : match.start()]))
+        parts.append(SnippetPart(text=match.group(0), highlight=True))
+        end = match.end()
+    if end < len(text):
+        parts.append(SnippetPart(text=text[end:]))
+    return parts
+
 
 class MCPServerRepository:
-    """Repository class for MCP server database operations."""
+    """Repository class for MCP server database operations.
+
+    Reads are served from the in-process mcp_server_cache, which every write
+    invalidates.
+    """
 
     @staticmethod
     async def get_all() -> list[MCPServer]:
         """Retrieve all MCP servers ordered by name."""
+        cache = mcp_server_cache()
+        servers = cache.servers()
+        if servers is not None:
+            return servers
+
+        generation = cache.generation
         async with rx.asession() as session:
             result = await session.exec(MCPServer.select().order_by(MCPServer.name))
-            return result.all()
+            servers = list(result.all())
+        cache.store(servers, generation)
+        return servers
+
+    @staticmethod
+    async def get_by_ids(server_ids: list[int]) -> list[MCPServer]:
+        """Retrieve the MCP servers with the given IDs ordered by name."""
+        if not server_ids:
+            return []
+
+        cache = mcp_server_cache()
+        cached = [cache.get(server_id) for server_id in set(server_ids)]
+        if all(cached):
+            return sorted(cached, key=lambda server: server.name)
+
+        async with rx.asession() as session:
+            result = await session.exec(
+                MCPServer.select()
+                .where(col(MCPServer.id).in_(server_ids))
+                .order_by(MCPServer.name)
+            )
+            return list(result.all())
+
+    @staticmethod
+    async def get_summaries(
+        offset: int = 0, limit: int | None = None
+    ) -> list[MCPServerSummary]:
+        """List MCP servers ordered by name, without loading their headers."""
+        servers = mcp_server_cache().servers()
+        if servers is not None:
+            end = offset + limit if limit is not None else None
+            return [
+                MCPServerRepository._to_summary(server)
+                for server in servers[offset:end]
+            ]
+
+        async with rx.asession() as session:
+            result = await session.exec(
+                select(
+                    MCPServer.id,
+                    MCPServer.name,
+                    MCPServer.description,
+                    MCPServer.url,
+                    MCPServer.prompt,
+                )
+                .order_by(MCPServer.name)
+                .offset(offset)
+                .limit(limit)
+            )
+            return [MCPServerRepository._to_summary(row) for row in result.all()]
+
+    @staticmethod
+    async def count() -> int:
+        """Number of MCP servers."""
+        servers = mcp_server_cache().servers()
+        if servers is not None:
+            return len(servers)
+
+        async with rx.asession() as session:
+            result = await session.exec(select(func.count()).select_from(MCPServer))
+            return result.one()
+
+    @staticmethod
+    def _to_summary(server: Any) -> MCPServerSummary:
+        """Summary of an MCPServer or a row with its listed columns."""
+        return MCPServerSummary(
+            id=server.id,
+            name=server.name,
+            description=server.description or "",
+            url=server.url,
+            prompt=server.prompt or "",
+        )
 
     @staticmethod
     async def get_by_id(server_id: int) -> MCPServer | None:
         """Retrieve an MCP server by ID."""
+        if server := mcp_server_cache().get(server_id):
+            return server
+
         async with rx.asession() as session:
             result = await session.exec(
                 MCPServer.select().where(MCPServer.id == server_id)
@@ -48,6 +191,7 @@ class MCPServerRepository:
             session.add(server)
             await session.commit()
             await session.refresh(server)
+            MCPServerRepository._invalidate(server.id)
             logger.debug("Created MCP server: %s", name)
             return server
 
@@ -74,6 +218,7 @@ class MCPServerRepository:
                 server.prompt = prompt
                 await session.commit()
                 await session.refresh(server)
+                MCPServerRepository._invalidate(server_id)
                 logger.debug("Updated MCP server: %s", name)
                 return server
             logger.warning("MCP server with ID %s not found for update", server_id)
@@ -90,7 +235,331 @@ class MCPServerRepository:
             if server:
                 await session.delete(server)
                 await session.commit()
+                MCPServerRepository._invalidate(server_id)
                 logger.debug("Deleted MCP server: %s", server.name)
                 return True
             logger.warning("MCP server with ID %s not found for deletion", server_id)
             return False
+
+    @staticmethod
+    def _invalidate(server_id: int | None) -> None:
+        """Drop cached data of a changed server."""
+        mcp_server_cache().invalidate()
+        tool_manifest_cache().invalidate(server_id)
+
+
+class ThreadRepository:
+    """Repository class for chat thread and message database operations.
+
+    All operations are scoped to the owning user.
+    """
+
+    @staticmethod
+    def _to_thread_model(thread: AssistantThread) -> ThreadModel:
+        """Convert a thread entity to a ThreadModel without messages."""
+        return ThreadModel(
+            thread_id=thread.thread_id,
+            title=thread.title,
+            state=ThreadStatus(thread.state),
+            ai_model=thread.ai_model,
+            response_chain=(
+                ResponseChain(**thread.response_chain)
+                if thread.response_chain
+                else None
+            ),
+        )
+
+    @staticmethod
+    async def get_threads(
+        user_id: str, offset: int = 0, limit: int = 50
+    ) -> list[ThreadSummary]:
+        """Retrieve a page of thread summaries, most recently updated first."""
+        async with rx.asession() as session:
+            result = await session.exec(
+                select(
+                    AssistantThread.thread_id,
+                    AssistantThread.title,
+                    AssistantThread.ai_model,
+                    AssistantThread.updated,
+                )
+                .where(AssistantThread.user_id == user_id)
+                .order_by(col(AssistantThread.updated).desc())
+                .offset(offset)
+                .limit(limit)
+            )
+            return [
+                ThreadSummary(
+                    thread_id=thread_id, title=title, ai_model=ai_model, updated=updated
+                )
+                for thread_id, title, ai_model, updated in result.all()
+            ]
+
+    @staticmethod
+    async def get_thread(user_id: str, thread_id: str) -> ThreadModel | None:
+        """Retrieve a thread without its messages, see `get_messages`."""
+        async with rx.asession() as session:
+            result = await session.exec(
+                select(AssistantThread).where(
+                    AssistantThread.thread_id == thread_id,
+                    AssistantThread.user_id == user_id,
+                )
+            )
+            thread = result.first()
+            return ThreadRepository._to_thread_model(thread) if thread else None
+
+    @staticmethod
+    async def count_threads(user_id: str) -> int:
+        """Count the threads of a user."""
+        async with rx.asession() as session:
+            result = await session.exec(
+                select(func.count())
+                .select_from(AssistantThread)
+                .where(AssistantThread.user_id == user_id)
+            )
+            return result.one()
+
+    @staticmethod
+    async def get_messages(
+        user_id: str,
+        thread_id: str,
+        before: int | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[Message], int]:
+        """Retrieve the latest messages of a thread in order.
+
+        Args:
+            user_id: Owner of the thread.
+            thread_id: The thread.
+            before: Only messages before this position, None for all.
+            limit: Max. number of messages, None for no limit.
+
+        Returns:
+            The messages and the position of the first returned message.
+        """
+        query = (
+            select(AssistantMessage)
+            .join(AssistantThread)
+            .where(
+                AssistantThread.thread_id == thread_id,
+                AssistantThread.user_id == user_id,
+            )
+            .order_by(col(AssistantMessage.position).desc())
+        )
+        if before is not None:
+            query = query.where(AssistantMessage.position < before)
+        if limit is not None:
+            query = query.limit(limit)
+
+        async with rx.asession() as session:
+            result = await session.exec(query)
+            rows = list(reversed(result.all()))
+
+        messages = [
+            Message(
+                text=row.text,
+                type=MessageType(row.type),
+                editable=row.editable,
+                done=row.done,
+            )
+            for row in rows
+        ]
+        first_position = rows[0].position if rows else (before or 0)
+        return messages, first_position
+
+    @staticmethod
+    async def save(
+        user_id: str,
+        thread: ThreadModel,
+        messages: list[Message] | None = None,
+        position: int = 0,
+    ) -> bool:
+        """Create or update a thread and write messages from `position` on.
+
+        Stored messages at or after `position` are replaced by `messages`;
+        messages before `position` are left unchanged. Without `messages`,
+        only the thread itself is written.
+
+        Returns:
+            False if the thread belongs to another user, True otherwise.
+        """
+        async with rx.asession() as session:
+            result = await session.exec(
+                select(AssistantThread).where(
+                    AssistantThread.thread_id == thread.thread_id
+                )
+            )
+            entity = result.first()
+            if entity is None:
+                entity = AssistantThread(thread_id=thread.thread_id, user_id=user_id)
+                session.add(entity)
+            elif entity.user_id != user_id:
+                logger.warning(
+                    "Thread %s belongs to another user, not saved", thread.thread_id
+                )
+                return False
+
+            entity.title = thread.title
+            entity.state = thread.state
+            entity.ai_model = thread.ai_model
+            entity.response_chain = (
+                thread.response_chain.model_dump() if thread.response_chain else None
+            )
+            entity.updated = datetime.now(UTC)
+            await session.flush()
+
+            if messages is not None:
+                await session.execute(
+                    delete(AssistantMessage).where(
+                        AssistantMessage.thread_id == entity.id,
+                        AssistantMessage.position >= position,
+                    )
+                )
+                session.add_all(
+                    AssistantMessage(
+                        thread_id=entity.id,
+                        position=index,
+                        type=message.type,
+                        text=message.text,
+                        editable=message.editable,
+                        done=message.done,
+                    )
+                    for index, message in enumerate(messages, start=position)
+                )
+            await session.commit()
+            logger.debug(
+                "Saved thread %s (%d messages written)",
+                thread.thread_id,
+                len(messages or []),
+            )
+            return True
+
+    @staticmethod
+    async def search(
+        user_id: str, query: str, offset: int = 0, limit: int = 20
+    ) -> list[ThreadSearchResult]:
+        """Search the messages of a user's threads, best matches first.
+
+        Uses the full-text index on PostgreSQL (web search syntax, e.g.
+        quoted phrases and -exclusions) and a plain substring match otherwise.
+        """
+        async with rx.asession() as session:
+            if session.bind.dialect.name == "postgresql":
+                return await ThreadRepository._search_fulltext(
+                    session, user_id, query, offset, limit
+                )
+            return await ThreadRepository._search_substring(
+                session, user_id, query, offset, limit
+            )
+
+    @staticmethod
+    async def _search_fulltext(
+        session: AsyncSession, user_id: str, query: str, offset: int, limit: int
+    ) -> list[ThreadSearchResult]:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery).label("rank")
+        # Rank and page first, so headlines are only built for the page
+        hits = (
+            select(AssistantMessage.id, rank)
+            .join(AssistantThread)
+            .where(
+                AssistantThread.user_id == user_id,
+                col(AssistantMessage.type).in_(SEARCHED_MESSAGE_TYPES),
+                SEARCH_VECTOR.op("@@")(tsquery),
+            )
+            .order_by(rank.desc(), col(AssistantMessage.id).desc())
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
+        result = await session.exec(
+            select(
+                AssistantThread.thread_id,
+                AssistantThread.title,
+                AssistantMessage.position,
+                AssistantMessage.type,
+                func.ts_headline(
+                    SEARCH_CONFIG, AssistantMessage.text, tsquery, HEADLINE_OPTIONS
+                ),
+                hits.c.rank,
+            )
+            .select_from(AssistantMessage)
+            .join(hits, hits.c.id == AssistantMessage.id)
+            .join(AssistantThread)
+            .order_by(hits.c.rank.desc(), hits.c.id.desc())
+        )
+        return [
+            ThreadSearchResult(
+                thread_id=thread_id,
+                title=title,
+                position=position,
+                type=MessageType(message_type),
+                snippet=_headline_parts(headline),
+                rank=rank,
+            )
+            for thread_id, title, position, message_type, headline, rank in result
+        ]
+
+    @staticmethod
+    async def _search_substring(
+        session: AsyncSession, user_id: str, query: str, offset: int, limit: int
+    ) -> list[ThreadSearchResult]:
+        result = await session.exec(
+            select(
+                AssistantThread.thread_id,
+                AssistantThread.title,
+                AssistantMessage.position,
+                AssistantMessage.type,
+                AssistantMessage.text,
+            )
+            .select_from(AssistantMessage)
+            .join(AssistantThread)
+            .where(
+                AssistantThread.user_id == user_id,
+                col(AssistantMessage.type).in_(SEARCHED_MESSAGE_TYPES),
+                col(AssistantMessage.text).icontains(query, autoescape=True),
+            )
+            .order_by(col(AssistantThread.updated).desc(), AssistantMessage.position)
+            .offset(offset)
+            .limit(limit)
+        )
+        pattern = re.compile(re.escape(query), re.IGNORECASE)
+        results = []
+        for thread_id, title, position, message_type, text in result:
+            match = pattern.search(text)
+            start = max(match.start() - SNIPPET_CHARS, 0) if match else 0
+            excerpt = text[start : start + 2 * SNIPPET_CHARS + len(query)]
+            results.append(
+                ThreadSearchResult(
+                    thread_id=thread_id,
+                    title=title,
+                    position=position,
+                    type=MessageType(message_type),
+                    snippet=_match_parts(excerpt, pattern),
+                )
+            )
+        return results
+
+    @staticmethod
+    async def delete(user_id: str, thread_id: str) -> bool:
+        """Delete a thread and its messages."""
+        async with rx.asession() as session:
+            result = await session.exec(
+                select(AssistantThread).where(
+                    AssistantThread.thread_id == thread_id,
+                    AssistantThread.user_id == user_id,
+                )
+            )
+            thread = result.first()
+            if thread:
+                await session.execute(
+                    delete(AssistantMessage).where(
+                        AssistantMessage.thread_id == thread.id
+                    )
+                )
+                await session.delete(thread)
+                await session.commit()
+                logger.debug("Deleted thread: %s", thread_id)
+                return True
+            # Threads are only stored once they have been saved
+            logger.debug("Thread with ID %s not stored, nothing to delete", thread_id)
+            return False
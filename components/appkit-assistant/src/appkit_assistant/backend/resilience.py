@@ -0,0 +1,330 @@
+"""
+Resilient processing: retries, failover and circuit breaking.
+
+Transient upstream failures (rate limits, 5xx responses, timeouts) are retried
+with exponential backoff and full jitter, honoring Retry-After headers. As long
+as no content has been streamed to the user, a request can fail over to the
+fallback model configured on the AIModel. A circuit breaker per model stops
+sending traffic to an upstream that keeps failing.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import openai
+
+from appkit_assistant.backend.models import (
+    AIModel,
+    Chunk,
+    ChunkType,
+    MCPServer,
+    Message,
+    ResponseChain,
+)
+from appkit_assistant.backend.processor import Processor
+
+if TYPE_CHECKING:
+    from appkit_assistant.backend.model_manager import ModelManager
+
+logger = logging.getLogger(__name__)
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is rejected by an open circuit breaker."""
+
+
+class _ModelFailedError(Exception):
+    """A model exhausted its retries or is blocked; try the next fallback."""
+
+    def __init__(self, error: BaseException | None) -> None:
+        super().__init__(str(error))
+        self.error = error
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5  # seconds
+    max_delay: float = 20.0  # seconds
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Delay before retry number `attempt` (starting at 1)."""
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, backoff)  # noqa: S311
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check if an error is a transient upstream failure."""
+    if isinstance(error, openai.APIStatusError):
+        return (
+            error.status_code == HTTP_TOO_MANY_REQUESTS
+            or error.status_code >= HTTP_SERVER_ERROR
+        )
+    return isinstance(
+        error,
+        openai.APIConnectionError  # includes APITimeoutError
+        | httpx.TimeoutException
+        | httpx.NetworkError
+        | TimeoutError,
+    )
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Extract the Retry-After delay in seconds from an API error."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    if value := headers.get("retry-after-ms"):
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker tracking consecutive failures of one upstream."""
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_pending = False
+
+    def allow(self) -> tuple[bool, bool]:
+        """Check if a request may be sent upstream.
+
+        Returns:
+            (allowed, trial), where trial marks the single trial request of a
+            half open circuit. Only the trial may be ended with release().
+        """
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False, False
+            # Let a single trial request through
+            self.state = CircuitState.HALF_OPEN
+            self._trial_pending = True
+            return True, True
+        return self.state == CircuitState.CLOSED, False
+
+    def record_success(self) -> None:
+        if self.state != CircuitState.CLOSED:
+            logger.info("Circuit %s closed", self.name)
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trial_pending = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_pending = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                logger.warning(
+                    "Circuit %s opened after %d failures", self.name, self.failures
+                )
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End the trial request without an upstream outcome.
+
+        A trial request ending this way (cancelled by the user, or failed with
+        an error that says nothing about the upstream) re-opens the circuit
+        for an immediate new trial instead of leaving it half open.
+        """
+        if self._trial_pending:
+            self._trial_pending = False
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic() - self.reset_timeout
+
+
+class ResilientProcessor(Processor):
+    """Processor retrying and failing over between the models of a ModelManager."""
+
+    def __init__(
+        self,
+        model_manager: "ModelManager",
+        user_id: str = "",
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self.model_manager = model_manager
+        self.user_id = user_id
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def _candidate_models(self, model_id: str) -> list[str]:
+        """The requested model followed by its chain of fallback models."""
+        candidates = [model_id]
+        model = self.model_manager.get_model(model_id)
+        while model and model.fallback_model and model.fallback_model not in candidates:
+            candidates.append(model.fallback_model)
+            model = self.model_manager.get_model(model.fallback_model)
+        return candidates
+
+    async def process(
+        self,
+        messages: list[Message],
+        model_id: str,
+        files: list[str] | None = None,
+        mcp_servers: list[MCPServer] | None = None,
+        response_chain: ResponseChain | None = None,
+        thread_id: str | None = None,
+    ) -> AsyncGenerator[Chunk, None]:
+        candidates = self._candidate_models(model_id)
+        last_error: BaseException | None = None
+
+        for candidate in candidates:
+            processor = self.model_manager.get_processor_for_model(
+                candidate, user_id=self.user_id
+            )
+            breaker = self.model_manager.get_circuit_breaker(candidate)
+            if processor is None or breaker is None:
+                continue
+
+            # Server-side state only exists for the originally requested model
+            extra = (
+                {"response_chain": response_chain}
+                if response_chain and candidate == model_id
+                else {}
+            )
+
+            if candidate != model_id:
+                logger.warning("Failing over from %s to %s", model_id, candidate)
+                yield Chunk(
+                    type=ChunkType.LIFECYCLE,
+                    text=f"failover to {candidate}",
+                    chunk_metadata={"stage": "failover", "model": candidate},
+                )
+
+            try:
+                async for chunk in self._process_with_retries(
+                    processor,
+                    breaker,
+                    messages,
+                    candidate,
+                    files=files,
+                    mcp_servers=mcp_servers,
+                    thread_id=thread_id,
+                    **extra,
+                ):
+                    yield chunk
+            except _ModelFailedError as e:
+                last_error = e.error
+            else:
+                return
+
+        if last_error is not None:
+            raise last_error
+        raise ValueError(f"Keinen Adapter für das Modell gefunden: {model_id}")
+
+    async def _process_with_retries(
+        self,
+        processor: Processor,
+        breaker: CircuitBreaker,
+        messages: list[Message],
+        model_id: str,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Chunk, None]:
+        """Stream the response of one model, retrying transient failures.
+
+        Raises:
+            _ModelFailedError: if the retries are exhausted or the circuit is
+                open, so the caller can fail over to the next model
+        """
+        last_error: BaseException | None = None
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            allowed, trial = breaker.allow()
+            if not allowed:
+                raise _ModelFailedError(
+                    CircuitOpenError(
+                        f"Der Dienst für das Modell {model_id} ist "
+                        "vorübergehend nicht verfügbar."
+                    )
+                )
+
+            emitted = False
+            try:
+                async for chunk in processor.process(messages, model_id, **kwargs):
+                    if chunk.type != ChunkType.LIFECYCLE:
+                        emitted = True
+                    yield chunk
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                breaker.record_failure()
+                # Content already reached the user, a retry would duplicate it
+                if emitted:
+                    raise
+                last_error = e
+                if attempt == self.retry_policy.max_attempts:
+                    break
+
+                delay = self.retry_policy.delay(attempt, retry_after(e))
+                logger.warning(
+                    "Request to %s failed (%s), retry %d in %.2fs",
+                    model_id,
+                    e,
+                    attempt,
+                    delay,
+                )
+                yield Chunk(
+                    type=ChunkType.LIFECYCLE,
+                    text=f"retry {attempt}",
+                    chunk_metadata={"stage": "retrying", "attempt": str(attempt)},
+                )
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return
+            finally:
+                # Cancellation and non-retryable errors leave no outcome
+                if trial:
+                    breaker.release()
+
+        raise _ModelFailedError(last_error)
+
+    def get_supported_models(self) -> dict[str, AIModel]:
+        return {model.id: model for model in self.model_manager.get_all_models()}
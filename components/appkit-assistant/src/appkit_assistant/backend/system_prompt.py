@@ -1,5 +1,11 @@
 from typing import Final
 
+# Bump whenever SYSTEM_PROMPT or MCP_PROMPT_SECTION changes; part of the
+# prompt cache key
+PROMPT_VERSION: Final[str] = "3"
+
+# Static prefix, identical for every request. Everything request specific is
+# appended after it so that provider-side prompt caching covers the prefix.
 SYSTEM_PROMPT: Final[str] = """
 # System Prompt: Kontextbewusster, Tool-orientierter Chat-Client
 
@@ -22,9 +28,8 @@ Interpretiere Benutzereingaben semantisch, berücksichtige Kontext (Verlauf, Met
 - Nutze Capability-Deskriptoren, führe Tool(s) deterministisch aus, zeige Output unmittelbar.
 - Exploratives Vorgehen ist erlaubt, sofern Ziel und Kontext klar sind.
 - Falls kein Tool passt: direkt antworten (strukturierte Begründung implizit, nicht ausgeben).
-
-### Tool-Auswahlrichtlinien (Einbettung externer Beschreibungen)
-{mcp_prompts}
+- Tool-spezifische Richtlinien stehen, sofern vorhanden, am Ende unter
+  „Tool-Auswahlrichtlinien“.
 
 ## 5) Kontext
 - Berücksichtige durchgehend Gesprächsverlauf, Nutzerrolle, Organisation und laufende Projekte.
@@ -50,3 +55,8 @@ graph TD;
 A-->B; A-->C; B-->D; C-->D;
 ```
 """
+
+MCP_PROMPT_SECTION: Final[str] = """
+### Tool-Auswahlrichtlinien (Einbettung externer Beschreibungen)
+{mcp_prompts}
+"""
@@ -0,0 +1,164 @@
+"""
+Token accounting and context-window aware history trimming.
+
+Token counts use tiktoken. If its encoding cannot be loaded (it is downloaded
+on first use), a conservative character based estimate is used instead. Counts
+are cached by a digest of the message text, so a thread history is only
+tokenized once without keeping the texts themselves in memory.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import tiktoken
+
+from appkit_assistant.backend.models import AIModel, Message, MessageType
+
+logger = logging.getLogger(__name__)
+
+# German text and code need more tokens per character than English prose, so
+# the fallback estimate errs on the high side
+CHARS_PER_TOKEN = 3
+TOKENS_PER_MESSAGE = 4  # role and separator overhead per message
+DEFAULT_ENCODING = "o200k_base"
+# Share of the context window kept free for the output of models that do not
+# declare max_output_tokens
+OUTPUT_RESERVE_RATIO = 0.15
+MAX_CACHED_COUNTS = 8192
+
+_count_cache: OrderedDict[bytes, int] = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(name: str) -> tiktoken.Encoding | None:
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(
+            "Failed to load tiktoken encoding %s, using estimated token counts: %s",
+            name,
+            e,
+        )
+        return None
+
+
+def count_text_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Count the tokens of a text."""
+    if not text:
+        return 0
+
+    key = hashlib.blake2b(
+        text.encode(), digest_size=16, person=encoding.encode()[:16]
+    ).digest()
+    with _count_cache_lock:
+        if (count := _count_cache.get(key)) is not None:
+            _count_cache.move_to_end(key)
+            return count
+
+    tokenizer = _get_encoding(encoding)
+    if tokenizer is None:
+        count = len(text) // CHARS_PER_TOKEN + 1
+    else:
+        count = len(tokenizer.encode(text, disallowed_special=()))
+
+    with _count_cache_lock:
+        _count_cache[key] = count
+        while len(_count_cache) > MAX_CACHED_COUNTS:
+            _count_cache.popitem(last=False)
+    return count
+
+
+def count_message_tokens(message: Message) -> int:
+    """Count the tokens of a message including the per-message overhead."""
+    return count_text_tokens(message.text) + TOKENS_PER_MESSAGE
+
+
+def input_token_budget(model: AIModel) -> int | None:
+    """Max. number of input tokens for a model, None if unlimited.
+
+    Without an explicit max_input_tokens, the output tokens (max_output_tokens
+    or OUTPUT_RESERVE_RATIO of the window) are kept free in the context window.
+    """
+    if model.max_input_tokens:
+        return model.max_input_tokens
+    if not model.context_window:
+        return None
+    reserved = model.max_output_tokens or int(
+        model.context_window * OUTPUT_RESERVE_RATIO
+    )
+    return model.context_window - reserved
+
+
+def fit_messages(
+    messages: list[Message], model: AIModel, reserved_tokens: int = 0
+) -> list[Message]:
+    """Trim a thread history to the input token budget of a model.
+
+    System messages and the latest human message (with everything after it)
+    are always kept. The remaining budget is filled with the most recent
+    earlier messages; older turns in the middle of the thread are dropped.
+
+    Args:
+        messages: The thread history.
+        model: The model the history is sent to.
+        reserved_tokens: Tokens needed outside the messages, e.g. for a system
+            prompt added by the processor.
+
+    Returns:
+        The messages to send, in their original order.
+    """
+    budget = input_token_budget(model)
+    if budget is None or not messages:
+        return messages
+
+    # Index of the latest human message; it and all following are kept
+    tail_start = len(messages) - 1
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].type == MessageType.HUMAN:
+            tail_start = i
+            break
+
+    keep = [
+        i >= tail_start or message.type == MessageType.SYSTEM
+        for i, message in enumerate(messages)
+    ]
+    used = reserved_tokens + sum(
+        count_message_tokens(message)
+        for message, kept in zip(messages, keep, strict=True)
+        if kept
+    )
+
+    if used > budget:
+        logger.warning(
+            "Latest turn needs %d tokens, exceeding the budget of %d for %s",
+            used,
+            budget,
+            model.id,
+        )
+        return [message for message, kept in zip(messages, keep, strict=True) if kept]
+
+    dropped = 0
+    for i in range(tail_start - 1, -1, -1):
+        if keep[i]:
+            continue
+        tokens = count_message_tokens(messages[i])
+        if dropped == 0 and used + tokens <= budget:
+            keep[i] = True
+            used += tokens
+        else:
+            # Keep turns contiguous: once a message is dropped, drop all older ones
+            dropped += 1
+
+    if dropped:
+        logger.debug(
+            "Dropped %d of %d messages to fit %d tokens for %s",
+            dropped,
+            len(messages),
+            budget,
+            model.id,
+        )
+    return [message for message, kept in zip(messages, keep, strict=True) if kept]
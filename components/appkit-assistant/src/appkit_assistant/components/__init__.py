@@ -7,10 +7,14 @@ from appkit_assistant.backend.models import (
     Chunk,
     ChunkType,
     MCPServer,
+    MCPServerSummary,
     Message,
     MessageType,
+    SnippetPart,
     ThreadModel,
+    ThreadSearchResult,
     ThreadStatus,
+    ThreadSummary,
 )
 from appkit_assistant.state.thread_state import (
     ThreadState,
@@ -24,15 +28,19 @@ __all__ = [
     "Chunk",
     "ChunkType",
     "MCPServer",
+    "MCPServerSummary",
     "Message",
     "MessageComponent",
     "MessageType",
+    "SnippetPart",
     "Suggestion",
     "ThreadList",
     "ThreadListState",
     "ThreadModel",
+    "ThreadSearchResult",
     "ThreadState",
     "ThreadStatus",
+    "ThreadSummary",
     "composer",
     "mcp_servers_table",
 ]
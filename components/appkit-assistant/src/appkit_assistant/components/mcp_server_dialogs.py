@@ -8,7 +8,7 @@ from reflex.vars import var_operation, var_operation_return
 from reflex.vars.base import RETURN, CustomVarOperationReturn
 
 import appkit_mantine as mn
-from appkit_assistant.backend.models import MCPServer
+from appkit_assistant.backend.models import MCPServerSummary
 from appkit_assistant.state.mcp_server_state import MCPServerState
 from appkit_ui.components.dialogs import (
     delete_dialog,
@@ -32,7 +32,7 @@ class ValidationState(rx.State):
     prompt_error: str = ""
 
     @rx.event
-    def initialize(self, server: MCPServer | None = None) -> None:
+    def initialize(self, server: MCPServerSummary | None = None) -> None:
         """Reset validation state."""
         logger.debug("Initializing ValidationState")
         if server is None:
@@ -138,7 +138,27 @@ def json(obj: rx.Var, indent: int = 4) -> CustomVarOperationReturn[RETURN]:
     )
 
 
-def mcp_server_form_fields(server: MCPServer | None = None) -> rx.Component:
+def mcp_server_headers_field(default_value: rx.Var | str = "{}") -> rx.Component:
+    return mn.form.json(
+        name="headers_json",
+        label="HTTP Headers",
+        description=(
+            "Geben Sie die HTTP-Header im JSON-Format ein. "
+            'Beispiel: {"Content-Type": "application/json", '
+            '"Authorization": "Bearer token"}'
+        ),
+        placeholder="{}",
+        validation_error="Ungültiges JSON",
+        default_value=default_value,
+        format_on_blur=True,
+        autosize=True,
+        min_rows=4,
+        max_rows=6,
+        width="100%",
+    )
+
+
+def mcp_server_form_fields(server: MCPServerSummary | None = None) -> rx.Component:
     """Reusable form fields for MCP server add/update dialogs."""
     is_edit_mode = server is not None
 
@@ -228,23 +248,14 @@ def mcp_server_form_fields(server: MCPServer | None = None) -> rx.Component:
             spacing="0",
             width="100%",
         ),
-        mn.form.json(
-            name="headers_json",
-            label="HTTP Headers",
-            description=(
-                "Geben Sie die HTTP-Header im JSON-Format ein. "
-                'Beispiel: {"Content-Type": "application/json", '
-                '"Authorization": "Bearer token"}'
-            ),
-            placeholder="{}",
-            validation_error="Ungültiges JSON",
-            default_value=json(server.headers) if is_edit_mode else "{}",
-            format_on_blur=True,
-            autosize=True,
-            min_rows=4,
-            max_rows=6,
-            width="100%",
-        ),
+        # Listings do not load the headers, they are loaded with the server
+        rx.cond(
+            MCPServerState.current_server_id == server.id,
+            mcp_server_headers_field(json(MCPServerState.current_server_headers)),
+            rx.center(rx.spinner(), width="100%", padding="1em"),
+        )
+        if is_edit_mode
+        else mcp_server_headers_field(),
     ]
 
     return rx.flex(
@@ -292,7 +303,7 @@ def add_mcp_server_button() -> rx.Component:
     )
 
 
-def delete_mcp_server_dialog(server: MCPServer) -> rx.Component:
+def delete_mcp_server_dialog(server: MCPServerSummary) -> rx.Component:
     """Use the generic delete dialog component for MCP servers."""
     return delete_dialog(
         title="MCP Server löschen",
@@ -305,7 +316,7 @@ def delete_mcp_server_dialog(server: MCPServer) -> rx.Component:
     )
 
 
-def update_mcp_server_dialog(server: MCPServer) -> rx.Component:
+def update_mcp_server_dialog(server: MCPServerSummary) -> rx.Component:
     """Dialog for updating an existing MCP server."""
     return rx.dialog.root(
         rx.dialog.trigger(
@@ -3,7 +3,7 @@
 import reflex as rx
 from reflex.components.radix.themes.components.table import TableRow
 
-from appkit_assistant.backend.models import MCPServer
+from appkit_assistant.backend.models import MCPServerSummary
 from appkit_assistant.components.mcp_server_dialogs import (
     add_mcp_server_button,
     delete_mcp_server_dialog,
@@ -12,7 +12,7 @@ from appkit_assistant.components.mcp_server_dialogs import (
 from appkit_assistant.state.mcp_server_state import MCPServerState
 
 
-def mcp_server_table_row(server: MCPServer) -> TableRow:
+def mcp_server_table_row(server: MCPServerSummary) -> TableRow:
     """Show an MCP server in a table row."""
     return rx.table.row(
         rx.table.cell(
@@ -38,6 +38,15 @@ def mcp_server_table_row(server: MCPServer) -> TableRow:
         ),
         rx.table.cell(
             rx.hstack(
+                rx.tooltip(
+                    rx.icon_button(
+                        rx.icon("refresh-cw", size=18),
+                        size="2",
+                        variant="ghost",
+                        on_click=MCPServerState.invalidate_tool_cache(server.id),
+                    ),
+                    content="Werkzeugliste neu laden",
+                ),
                 update_mcp_server_dialog(server),
                 delete_mcp_server_dialog(server),
                 spacing="2",
@@ -73,4 +82,18 @@ def mcp_servers_table() -> rx.Fragment:
             table_layout="fixed",
             on_mount=MCPServerState.load_servers_with_toast,
         ),
+        rx.cond(
+            MCPServerState.has_more_servers,
+            rx.flex(
+                rx.button(
+                    "Weitere MCP Server laden",
+                    variant="ghost",
+                    size="2",
+                    color_scheme="gray",
+                    on_click=MCPServerState.load_more_servers,
+                ),
+                justify="center",
+                margin_top="1em",
+            ),
+        ),
     )
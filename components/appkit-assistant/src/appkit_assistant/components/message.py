@@ -57,6 +57,14 @@ class MessageComponent:
             message.text == ThreadState.last_assistant_message_text
         ) & ThreadState.has_thinking_content
 
+        # The message being streamed stays empty until completion, its text
+        # is held in ThreadState.streaming_text in the meantime
+        text = rx.cond(
+            message.done | (message.text != ""),
+            message.text,
+            ThreadState.streaming_text,
+        )
+
         # Main content area with all components
         content_area = rx.vstack(
             # Always rendered with conditional styling for smooth animations
@@ -84,7 +92,7 @@ class MessageComponent:
             ),
             # Main message content
             rx.cond(
-                message.text == "",
+                text == "",
                 rx.hstack(
                     rx.text(
                         rx.cond(
@@ -112,7 +120,7 @@ class MessageComponent:
                 ),
                 # Actual message content
                 mn.markdown_preview(
-                    source=message.text,
+                    source=text,
                     enable_mermaid=message.done,
                     enable_katex=message.done,
                     security_level="standard",
@@ -99,6 +99,7 @@ class Assistant:
                 bottom_button_text="↓",
                 offset_scrollbars=False,
                 scrollbars="y",
+                on_top_reached=ThreadState.load_older_messages,
                 scrollbar_size="6px",
                 height="100%",
                 min_height="0",
@@ -226,9 +227,10 @@ class Assistant:
             rx.flex(
                 ThreadList.header(
                     title="Neuer Chat",
-                    margin_bottom="1.5em",
+                    margin_bottom="1em",
                     flex_shrink=0,
                 ),
+                ThreadList.search(margin_bottom="1em", flex_shrink=0),
                 ThreadList.list(
                     flex_grow=1,
                     min_height="60px",
@@ -1,6 +1,11 @@
 import reflex as rx
 
-from appkit_assistant.state.thread_state import ThreadListState, ThreadModel
+from appkit_assistant.backend.models import SnippetPart
+from appkit_assistant.state.thread_state import (
+    ThreadListState,
+    ThreadSearchResult,
+    ThreadSummary,
+)
 
 
 class ThreadList:
@@ -33,7 +38,7 @@ class ThreadList:
         )
 
     @staticmethod
-    def thread_list_item(thread: ThreadModel) -> rx.Component:
+    def thread_list_item(thread: ThreadSummary) -> rx.Component:
         return rx.flex(
             rx.text(
                 thread.title,
@@ -103,32 +108,152 @@ class ThreadList:
             },
         )
 
+    @staticmethod
+    def search(**props) -> rx.Component:
+        """Search field for the messages of all threads."""
+        return rx.debounce_input(
+            rx.input(
+                rx.input.slot(rx.icon("search", size=14)),
+                rx.cond(
+                    ThreadListState.is_searching,
+                    rx.input.slot(
+                        rx.icon_button(
+                            rx.icon("x", size=12),
+                            variant="ghost",
+                            size="1",
+                            color_scheme="gray",
+                            on_click=ThreadListState.clear_search(),
+                        ),
+                    ),
+                ),
+                placeholder="Chats durchsuchen...",
+                size="2",
+                value=ThreadListState.search_query,
+                on_change=ThreadListState.search,
+                margin_right="10px",
+                **props,
+            ),
+            debounce_timeout=300,
+        )
+
+    @staticmethod
+    def snippet_part(part: SnippetPart) -> rx.Component:
+        return rx.cond(
+            part.highlight,
+            rx.text.strong(part.text),
+            rx.text.span(part.text),
+        )
+
+    @staticmethod
+    def search_result_item(result: ThreadSearchResult) -> rx.Component:
+        return rx.box(
+            rx.text(
+                result.title,
+                size="2",
+                weight="medium",
+                white_space="nowrap",
+                overflow="hidden",
+                text_overflow="ellipsis",
+            ),
+            rx.text(
+                rx.foreach(result.snippet, ThreadList.snippet_part),
+                font_size="12px",
+                color=rx.color("gray", 11),
+                max_height="4.5em",
+                overflow="hidden",
+            ),
+            on_click=ThreadListState.open_search_result(result.thread_id),
+            margin_right="10px",
+            margin_bottom="8px",
+            padding="6px",
+            border_radius="8px",
+            background_color=rx.color("gray", 3),
+            style={
+                "_hover": {
+                    "cursor": "pointer",
+                    "background_color": rx.color("gray", 6),
+                },
+            },
+        )
+
+    @staticmethod
+    def search_results() -> rx.Component:
+        """Ranked search results with highlighted matches."""
+        return rx.cond(
+            ThreadListState.search_results,
+            rx.fragment(
+                rx.foreach(
+                    ThreadListState.search_results,
+                    ThreadList.search_result_item,
+                ),
+                rx.cond(
+                    ThreadListState.has_more_results,
+                    rx.button(
+                        "Weitere Treffer laden",
+                        variant="ghost",
+                        size="1",
+                        color_scheme="gray",
+                        margin_bottom="8px",
+                        on_click=ThreadListState.load_more_results(),
+                    ),
+                ),
+            ),
+            rx.text(
+                "Keine Treffer.",
+                size="2",
+                margin_right="10px",
+                padding="6px",
+            ),
+        )
+
     @staticmethod
     def list(**props) -> rx.Component:
         """List component for displaying threads."""
         return rx.scroll_area(
             rx.cond(
-                ThreadListState.has_threads,
+                ThreadListState.is_searching,
+                ThreadList.search_results(),
+                ThreadList.threads(),
+            ),
+            scrollbars="vertical",
+            padding_right="3px",
+            type="auto",
+            **props,
+        )
+
+    @staticmethod
+    def threads() -> rx.Component:
+        """Threads of the list, or a hint if there are none."""
+        return rx.cond(
+            ThreadListState.has_threads,
+            rx.fragment(
                 rx.foreach(
                     ThreadListState.threads,
                     ThreadList.thread_list_item,
                 ),
-                rx.text(
-                    "Keine Chats vorhanden.",
-                    size="2",
-                    white_space="nowrap",
-                    overflow="hidden",
-                    text_overflow="ellipsis",
-                    flex_grow="1",
-                    min_width="0",
-                    margin_right="10px",
-                    margin_bottom="8px",
-                    padding="6px",
-                    align="center",
+                rx.cond(
+                    ThreadListState.has_more_threads,
+                    rx.button(
+                        "Weitere Chats laden",
+                        variant="ghost",
+                        size="1",
+                        color_scheme="gray",
+                        margin_bottom="8px",
+                        on_click=ThreadListState.load_more_threads(),
+                    ),
                 ),
             ),
-            scrollbars="vertical",
-            padding_right="3px",
-            type="auto",
-            **props,
+            rx.text(
+                "Keine Chats vorhanden.",
+                size="2",
+                white_space="nowrap",
+                overflow="hidden",
+                text_overflow="ellipsis",
+                flex_grow="1",
+                min_width="0",
+                margin_right="10px",
+                margin_bottom="8px",
+                padding="6px",
+                align="center",
+            ),
         )
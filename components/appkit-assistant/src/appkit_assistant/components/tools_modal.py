@@ -2,11 +2,11 @@
 
 import reflex as rx
 
-from appkit_assistant.backend.models import MCPServer
+from appkit_assistant.backend.models import MCPServerSummary
 from appkit_assistant.state.thread_state import ThreadState
 
 
-def render_mcp_server_item(server: MCPServer) -> rx.Component:
+def render_mcp_server_item(server: MCPServerSummary) -> rx.Component:
     """Render a single MCP server item in the modal."""
     return rx.hstack(
         rx.switch(
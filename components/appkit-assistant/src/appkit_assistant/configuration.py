@@ -8,3 +8,11 @@ class AssistantConfig(BaseConfig):
     openai_base_url: str | None = None
     openai_api_key: SecretStr | None = None
     google_api_key: SecretStr | None = None
+    stream_flush_interval: float = 0.05
+    """max. seconds streamed text is buffered before it is pushed to the UI"""
+    stream_flush_chars: int = 256
+    """max. number of buffered characters before they are pushed to the UI"""
+    autosave_delay: float = 2.0
+    """seconds changes of a thread are collected before they are saved"""
+    mcp_tools_ttl: float = 900.0
+    """seconds the tool list of an MCP server is cached"""
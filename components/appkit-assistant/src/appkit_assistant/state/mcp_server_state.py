@@ -7,29 +7,37 @@ from typing import Any
 
 import reflex as rx
 
-from appkit_assistant.backend.models import MCPServer
+from appkit_assistant.backend.mcp_tool_cache import tool_manifest_cache
+from appkit_assistant.backend.models import MCPServer, MCPServerSummary
 from appkit_assistant.backend.repositories import (
     MCPServerRepository,
 )
 
 logger = logging.getLogger(__name__)
 
+SERVER_PAGE_SIZE = 50
+
 
 class MCPServerState(rx.State):
     """State class for managing MCP servers."""
 
-    servers: list[MCPServer] = []
+    servers: list[MCPServerSummary] = []
     current_server: MCPServer | None = None
     loading: bool = False
+    has_more_servers: bool = False
 
     async def load_servers(self) -> None:
-        """Load all MCP servers from the database.
+        """Load the first page of MCP servers from the database.
 
         Raises exceptions to let callers decide how to handle errors.
         """
         self.loading = True
         try:
-            self.servers = await MCPServerRepository.get_all()
+            servers = await MCPServerRepository.get_summaries(
+                limit=SERVER_PAGE_SIZE + 1
+            )
+            self.has_more_servers = len(servers) > SERVER_PAGE_SIZE
+            self.servers = servers[:SERVER_PAGE_SIZE]
             logger.debug("Loaded %d MCP servers", len(self.servers))
         except Exception as e:
             logger.error("Failed to load MCP servers: %s", e)
@@ -37,6 +45,23 @@ class MCPServerState(rx.State):
         finally:
             self.loading = False
 
+    async def load_more_servers(self) -> AsyncGenerator[Any, Any]:
+        """Append the next page of MCP servers."""
+        try:
+            servers = await MCPServerRepository.get_summaries(
+                offset=len(self.servers), limit=SERVER_PAGE_SIZE + 1
+            )
+        except Exception as e:
+            logger.error("Failed to load MCP servers: %s", e)
+            yield rx.toast.error(
+                "Fehler beim Laden der MCP Server.",
+                position="top-right",
+            )
+            return
+
+        self.has_more_servers = len(servers) > SERVER_PAGE_SIZE
+        self.servers.extend(servers[:SERVER_PAGE_SIZE])
+
     async def load_servers_with_toast(self) -> AsyncGenerator[Any, Any]:
         """Load servers and show an error toast on failure."""
         try:
@@ -177,6 +202,20 @@ class MCPServerState(rx.State):
                 position="top-right",
             )
 
+    async def invalidate_tool_cache(self, server_id: int) -> AsyncGenerator[Any, Any]:
+        """Drop the cached tool list of an MCP server.
+
+        The tools are listed again with the next request using the server.
+        """
+        server = next((s for s in self.servers if s.id == server_id), None)
+        tool_manifest_cache().invalidate(server_id)
+        yield rx.toast.info(
+            "Werkzeugliste von {} wird neu geladen.".format(
+                server.name if server else "MCP Server"
+            ),
+            position="top-right",
+        )
+
     def _parse_headers_from_form(self, form_data: dict[str, Any]) -> dict[str, str]:
         """Parse headers from form data."""
         headers_json = form_data.get("headers_json", "").strip()
@@ -211,6 +250,16 @@ class MCPServerState(rx.State):
             # Re-raise ValueError exceptions (invalid dictionary or key-value pairs)
             raise
 
+    @rx.var
+    def current_server_id(self) -> int:
+        """ID of the server loaded for editing, 0 if none."""
+        return self.current_server.id if self.current_server else 0
+
+    @rx.var
+    def current_server_headers(self) -> str:
+        """Headers JSON of the server loaded for editing."""
+        return self.current_server.headers if self.current_server else "{}"
+
     @rx.var
     def server_count(self) -> int:
         """Get the number of servers."""
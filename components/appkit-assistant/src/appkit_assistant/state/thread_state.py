@@ -1,29 +1,52 @@
+import hashlib
 import json
 import logging
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import UTC, datetime
 from enum import StrEnum
-from typing import Any
+from typing import Any, ClassVar
 
 import reflex as rx
 from pydantic import BaseModel
 
+from appkit_assistant.backend.autosave import PendingSave, autosave_scheduler
+from appkit_assistant.backend.chunk_buffer import ChunkBuffer
 from appkit_assistant.backend.model_manager import ModelManager
 from appkit_assistant.backend.models import (
     AIModel,
     Chunk,
     ChunkType,
-    MCPServer,
+    MCPServerSummary,
     Message,
     MessageType,
+    ResponseChain,
     Suggestion,
     ThreadModel,
+    ThreadSearchResult,
     ThreadStatus,
+    ThreadSummary,
 )
-from appkit_assistant.backend.repositories import MCPServerRepository
+from appkit_assistant.backend.repositories import (
+    MCPServerRepository,
+    ThreadRepository,
+)
+from appkit_assistant.backend.resilience import ResilientProcessor
+from appkit_assistant.configuration import AssistantConfig
+from appkit_commons.registry import service_registry
 
 logger = logging.getLogger(__name__)
 
+THREAD_PAGE_SIZE = 50
+MESSAGE_PAGE_SIZE = 50
+SEARCH_PAGE_SIZE = 20
+
+
+def _message_fingerprint(message: Message) -> str:
+    """Short digest of the stored fields of a message."""
+    fields = (message.type, str(message.editable), str(message.done), message.text)
+    return hashlib.blake2b("\x1f".join(fields).encode(), digest_size=8).hexdigest()
+
 
 class ThinkingType(StrEnum):
     REASONING = "reasoning"
@@ -53,12 +76,18 @@ class ThreadState(rx.State):
     selected_model: str = ""
     processing: bool = False
     messages: list[Message] = []
+    # Text of the assistant message currently being streamed. Kept apart from
+    # `messages` so each delta only sends this var instead of the whole list.
+    streaming_text: str = ""
     prompt: str = ""
     suggestions: list[Suggestion] = [Suggestion(prompt="Wie kann ich dir helfen?")]
 
     # Chunk processing state
-    current_chunks: list[Chunk] = []
     thinking_items: list[Thinking] = []  # Consolidated reasoning and tool calls
+    _thinking_index: dict[str, int] = {}  # "<type>:<id>" -> position in list
+    _tool_call_count: int = 0
+    # Stored response announced by the processor during the current request
+    _pending_chain: dict[str, str] = {}
     image_chunks: list[Chunk] = []
     show_thinking: bool = False
     thinking_expanded: bool = False
@@ -66,14 +95,18 @@ class ThreadState(rx.State):
     current_reasoning_session: str = ""  # Track current reasoning session
 
     # MCP Server tool support state
-    selected_mcp_servers: list[MCPServer] = []
+    selected_mcp_servers: list[MCPServerSummary] = []
     show_tools_modal: bool = False
-    available_mcp_servers: list[MCPServer] = []
+    available_mcp_servers: list[MCPServerSummary] = []
     temp_selected_mcp_servers: list[int] = []
     server_selection_state: dict[int, bool] = {}
 
     # Thread list integration
     with_thread_list: bool = False
+    # Only the latest page of a stored thread is loaded into `messages`
+    has_older_messages: bool = False
+    _message_offset: int = 0  # stored position of messages[0]
+    _stored_fingerprints: list[str] = []  # of the stored loaded messages
 
     def initialize(self) -> None:
         """Initialize the state."""
@@ -91,15 +124,47 @@ class ThreadState(rx.State):
             active=True,
         )
         self.messages = []
+        self._set_loaded_messages([], 0)
         logger.debug("Initialized thread state: %s", self._thread)
 
-    def set_thread(self, thread: ThreadModel) -> None:
-        """Set the current thread model."""
+    def set_thread(self, thread: ThreadModel, message_offset: int = 0) -> None:
+        """Set the current thread model.
+
+        Args:
+            thread: The thread with its loaded (latest) messages.
+            message_offset: Stored position of the first loaded message.
+        """
         self._thread = thread
         self.messages = thread.messages
         self.selected_model = thread.ai_model
+        self._set_loaded_messages(thread.messages, message_offset)
         logger.debug("Set current thread: %s", thread.thread_id)
 
+    def _set_loaded_messages(self, messages: list[Message], offset: int) -> None:
+        """Remember which stored messages are loaded."""
+        self._message_offset = offset
+        self._stored_fingerprints = [_message_fingerprint(m) for m in messages]
+        self.has_older_messages = offset > 0
+
+    @rx.event
+    async def load_older_messages(self) -> None:
+        """Prepend the previous page of stored messages."""
+        if not self.has_older_messages or not self.with_thread_list:
+            return
+
+        threadlist_state: ThreadListState = await self.get_state(ThreadListState)
+        older, offset = await threadlist_state.load_messages(
+            self._thread.thread_id, before=self._message_offset, limit=MESSAGE_PAGE_SIZE
+        )
+        self.messages = [*older, *self.messages]
+        self._thread.messages = self.messages
+        self._message_offset = offset
+        self._stored_fingerprints = [
+            *(_message_fingerprint(message) for message in older),
+            *self._stored_fingerprints,
+        ]
+        self.has_older_messages = offset > 0
+
     def set_prompt(self, prompt: str) -> None:
         """Set the current prompt."""
         self.prompt = prompt
@@ -197,11 +262,15 @@ class ThreadState(rx.State):
         self._thread.ai_model = ModelManager().get_default_model()
         self._thread.active = True
         self._thread.prompt = ""
+        self._thread.response_chain = None
         self.prompt = ""
         self.messages = []
+        # Older stored messages are removed with the next save as well
+        self._message_offset = 0
+        self.has_older_messages = False
+        self.streaming_text = ""
         self.selected_mcp_servers = []
-        self.current_chunks = []
-        self.thinking_items = []  # Clear thinking items only on explicit clear
+        self._reset_thinking_items()  # Clear thinking items only on explicit clear
         self.image_chunks = []
         self.show_thinking = False
 
@@ -210,39 +279,14 @@ class ThreadState(rx.State):
         logger.debug("Sending message: %s", self.prompt)
 
         async with self:
-            # Check if already processing
-            if self.processing:
-                return
-
-            self.processing = True
-            self._clear_chunks()
-            # Clear thinking items for new user question
-            self.thinking_items = []
-
-            current_prompt = self.prompt.strip()
-            if not current_prompt:
-                self.processing = False
-                return
-
-            self.prompt = ""
-
-            # Add user message and empty assistant message
-            self.messages.extend(
-                [
-                    Message(text=current_prompt, type=MessageType.HUMAN),
-                    Message(text="", type=MessageType.ASSISTANT),
-                ]
-            )
-
-            # Validate model and get processor
-            if not self.get_ai_model:
-                self._add_error_message("Kein Chat-Modell ausgewählt")
-                self.processing = False
+            if not self._begin_turn():
                 return
+            user_id = await self._admission_user_id()
+            history_user_id = await self._history_user_id()
 
         # Get processor outside context to avoid blocking
-        processor = ModelManager().get_processor_for_model(self.get_ai_model)
-        if not processor:
+        model_manager = ModelManager()
+        if not model_manager.get_processor_for_model(self.get_ai_model):
             async with self:
                 self._add_error_message(
                     f"Keinen Adapter für das Modell gefunden: {self.get_ai_model}"
@@ -250,17 +294,33 @@ class ThreadState(rx.State):
                 self.processing = False
             return
 
+        # Retries transient failures and fails over to fallback models
+        processor = ResilientProcessor(model_manager, user_id=user_id)
+        older_messages, response_chain = await self._request_history(
+            model_manager, history_user_id
+        )
+
+        chunk_buffer = self._create_chunk_buffer()
         try:
-            # Process chunks
-            async for chunk in processor.process(
-                self.messages,
-                self.get_ai_model,
-                mcp_servers=self.selected_mcp_servers,
+            mcp_servers = await MCPServerRepository.get_by_ids(
+                [server.id for server in self.selected_mcp_servers]
+            )
+            # Process chunks, committing them to the state in batches
+            async for batch in chunk_buffer.batches(
+                processor.process(
+                    [*older_messages, *self.messages],
+                    self.get_ai_model,
+                    mcp_servers=mcp_servers,
+                    response_chain=response_chain,
+                    thread_id=self._thread.thread_id,
+                )
             ):
                 async with self:
-                    self._handle_chunk(chunk)
+                    self._apply_chunks(batch)
 
             async with self:
+                self._commit_streaming_text()
+                self._store_response_chain()
                 self.show_thinking = False
 
                 # Update thread if using thread list
@@ -269,13 +329,87 @@ class ThreadState(rx.State):
 
         except Exception as ex:
             async with self:
+                self.streaming_text = ""
+                self._thread.response_chain = None
                 self.messages.pop()  # Remove empty assistant message
                 self.messages.append(Message(text=str(ex), type=MessageType.ERROR))
         finally:
             async with self:
                 self.messages[-1].done = True
+                self.current_activity = ""
                 self.processing = False
 
+    def _begin_turn(self) -> bool:
+        """Add the prompt and an empty assistant message to the messages.
+
+        Returns:
+            False if a message is already processed or there is nothing to send
+        """
+        # Check if already processing
+        if self.processing:
+            return False
+
+        self.processing = True
+        self._pending_chain = {}
+        self._clear_chunks()
+        # Clear thinking items for new user question
+        self._reset_thinking_items()
+
+        current_prompt = self.prompt.strip()
+        if not current_prompt:
+            self.processing = False
+            return False
+
+        self.prompt = ""
+        # Add user message and empty assistant message
+        self.messages.extend(
+            [
+                Message(text=current_prompt, type=MessageType.HUMAN),
+                Message(text="", type=MessageType.ASSISTANT),
+            ]
+        )
+
+        # Validate model and get processor
+        if not self.get_ai_model:
+            self._add_error_message("Kein Chat-Modell ausgewählt")
+            self.processing = False
+            return False
+        return True
+
+    async def _history_user_id(self) -> str | None:
+        """Owner of the older stored messages, None if none are to be loaded."""
+        if not (self._message_offset and self.with_thread_list):
+            return None
+        threadlist_state: ThreadListState = await self.get_state(ThreadListState)
+        return await threadlist_state.get_user_id()
+
+    async def _request_history(
+        self, model_manager: ModelManager, history_user_id: str | None
+    ) -> tuple[list[Message], ResponseChain | None]:
+        """The older stored messages to send and the response chain to continue.
+
+        Called without holding the state lock. The model needs the whole
+        history, not only the loaded page, unless a response chain covers the
+        older messages: then only the messages after the chain are sent (and
+        should the provider have dropped the chained response, the replay is
+        limited to the loaded page).
+        """
+        model = model_manager.get_model(self.get_ai_model)
+        response_chain = self._thread.response_chain
+        if not (model and model.chain_responses):
+            response_chain = None
+
+        offset = self._message_offset
+        if response_chain and (rebased := response_chain.rebase(offset)):
+            return [], rebased
+        if history_user_id is None:
+            return [], response_chain
+
+        older_messages, _ = await ThreadListState.fetch_messages(
+            history_user_id, self._thread.thread_id, before=offset
+        )
+        return older_messages, response_chain
+
     @rx.event
     async def persist_current_thread(self, prompt: str = "") -> None:
         """Persist the current temporary thread to the thread list.
@@ -305,14 +439,24 @@ class ThreadState(rx.State):
 
         # Add current thread to thread list
         self._thread.active = True
-        threadlist_state.threads.insert(0, self._thread)
+        for thread in threadlist_state.threads:
+            thread.active = False
+        threadlist_state.threads.insert(
+            0,
+            ThreadSummary(
+                thread_id=self._thread.thread_id,
+                title=self._thread.title,
+                ai_model=self._thread.ai_model,
+                active=True,
+            ),
+        )
 
         # Set as active thread in list
         threadlist_state.active_thread_id = self._thread.thread_id
 
-        # Save to local storage if autosave is enabled
+        # Save to the database if autosave is enabled
         if threadlist_state.autosave:
-            await threadlist_state.save_threads()
+            await self._save_thread(threadlist_state)
 
         logger.debug("Persisted thread: %s", self._thread.thread_id)
 
@@ -333,20 +477,40 @@ class ThreadState(rx.State):
             }
         """)
 
+    async def _admission_user_id(self) -> str:
+        """Key for fair queueing: the logged-in user, else the browser tab."""
+        user_id = await ThreadOwner.resolve(self)
+        if user_id:
+            return f"user:{user_id}"
+        return f"session:{self.router.session.client_token}"
+
     def _clear_chunks(self) -> None:
         """Clear all chunk categorization lists except thinking_items for display."""
-        self.current_chunks = []
         # Don't clear thinking_items to preserve thinking display for previous messages
         # self.thinking_items = []
         self.image_chunks = []
         self.current_reasoning_session = ""  # Reset reasoning session for new message
+        self.streaming_text = ""
+
+    def _create_chunk_buffer(self) -> ChunkBuffer:
+        """Create a chunk buffer using the configured flush budget."""
+        if service_registry().has(AssistantConfig):
+            config = service_registry().get(AssistantConfig)
+            return ChunkBuffer(
+                flush_interval=config.stream_flush_interval,
+                flush_chars=config.stream_flush_chars,
+            )
+        return ChunkBuffer()
+
+    def _apply_chunks(self, chunks: list[Chunk]) -> None:
+        """Apply a batch of buffered chunks to the state."""
+        for chunk in chunks:
+            self._handle_chunk(chunk)
 
     def _handle_chunk(self, chunk: Chunk) -> None:
         """Handle incoming chunk based on its type."""
-        self.current_chunks.append(chunk)
-
         if chunk.type == ChunkType.TEXT:
-            self.messages[-1].text += chunk.text
+            self.streaming_text += chunk.text
         elif chunk.type in (ChunkType.THINKING, ChunkType.THINKING_RESULT):
             self._handle_reasoning_chunk(chunk)
         elif chunk.type in (
@@ -357,15 +521,74 @@ class ThreadState(rx.State):
             self._handle_tool_chunk(chunk)
         elif chunk.type in (ChunkType.IMAGE, ChunkType.IMAGE_PARTIAL):
             self.image_chunks.append(chunk)
+        elif chunk.type == ChunkType.LIFECYCLE:
+            self._handle_lifecycle_chunk(chunk)
         elif chunk.type == ChunkType.COMPLETION:
+            self._commit_streaming_text()
             self.show_thinking = False
             logger.debug("Response generation completed")
         elif chunk.type == ChunkType.ERROR:
+            self._commit_streaming_text()
             self.messages.append(Message(text=chunk.text, type=MessageType.ERROR))
             logger.error("Chunk error: %s", chunk.text)
         else:
             logger.warning("Unhandled chunk type: %s - %s", chunk.type, chunk.text)
 
+    def _handle_lifecycle_chunk(self, chunk: Chunk) -> None:
+        """Show queueing, retries and failover as the current activity."""
+        if chunk.chunk_metadata.get("response_id"):
+            self._pending_chain = dict(chunk.chunk_metadata)
+
+        stage = chunk.chunk_metadata.get("stage")
+        if stage == "queued":
+            position = chunk.chunk_metadata.get("queue_position", "?")
+            self.current_activity = (
+                f"Warte auf freie Kapazität ({position}. in der Reihe)"
+            )
+        elif stage == "retrying":
+            attempt = chunk.chunk_metadata.get("attempt", "?")
+            self.current_activity = f"Erneuter Versuch ({attempt})"
+        elif stage == "failover":
+            model = chunk.chunk_metadata.get("model", "")
+            self.current_activity = f"Wechsle zu Modell {model}"
+        elif self.current_activity:
+            self.current_activity = ""
+
+    def _store_response_chain(self) -> None:
+        """Remember the stored response the next turn can continue from."""
+        pending = self._pending_chain
+        model = ModelManager().get_model(pending.get("model_id", ""))
+        if (
+            not pending.get("response_id")
+            or not model
+            or not model.chain_responses
+            or not self.messages
+            or self.messages[-1].type != MessageType.ASSISTANT
+        ):
+            self._thread.response_chain = None
+            return
+
+        self._thread.response_chain = ResponseChain(
+            response_id=pending["response_id"],
+            model_id=pending["model_id"],
+            prompt_hash=pending.get("prompt_hash", ""),
+            # Counted from the first stored message, loaded or not
+            message_count=self._message_offset + len(self.messages),
+            history_hash=ResponseChain.hash_history(self.messages, len(self.messages)),
+        )
+
+    def _commit_streaming_text(self) -> None:
+        """Merge the streamed text into the last assistant message."""
+        if not self.streaming_text:
+            return
+
+        for i in range(len(self.messages) - 1, -1, -1):
+            if self.messages[i].type == MessageType.ASSISTANT:
+                self.messages[i].text += self.streaming_text
+                self.messages[i].done = True
+                break
+        self.streaming_text = ""
+
     def _handle_reasoning_chunk(self, chunk: Chunk) -> None:
         """Handle reasoning chunks by consolidating them into thinking items."""
         if chunk.type == ChunkType.THINKING:
@@ -405,12 +628,31 @@ class ThreadState(rx.State):
 
         return self.current_reasoning_session
 
+    def _reset_thinking_items(self) -> None:
+        """Clear all thinking items together with their index."""
+        self.thinking_items = []
+        self._thinking_index = {}
+        self._tool_call_count = 0
+
+    def _find_thinking_item(
+        self, thinking_type: ThinkingType, item_id: str
+    ) -> Thinking | None:
+        """Look up a thinking item by type and ID using the index."""
+        position = self._thinking_index.get(f"{thinking_type}:{item_id}")
+        if position is None:
+            return None
+        return self.thinking_items[position]
+
+    def _add_thinking_item(self, item: Thinking) -> None:
+        """Append a thinking item and register it in the index."""
+        self._thinking_index[f"{item.type}:{item.id}"] = len(self.thinking_items)
+        if item.type == ThinkingType.TOOL_CALL:
+            self._tool_call_count += 1
+        self.thinking_items.append(item)
+
     def _find_existing_reasoning_item(self, reasoning_session: str) -> Thinking | None:
         """Find existing reasoning item by session ID."""
-        for item in self.thinking_items:
-            if item.type == ThinkingType.REASONING and item.id == reasoning_session:
-                return item
-        return None
+        return self._find_thinking_item(ThinkingType.REASONING, reasoning_session)
 
     def _update_existing_reasoning_item(
         self, existing_item: Thinking, chunk: Chunk
@@ -425,8 +667,6 @@ class ThreadState(rx.State):
             existing_item.status = ThinkingStatus.COMPLETED
             if chunk.text:
                 existing_item.text += f" {chunk.text}"
-        # Trigger Reflex reactivity by reassigning the list
-        self.thinking_items = self.thinking_items.copy()
 
     def _create_new_reasoning_item(self, reasoning_session: str, chunk: Chunk) -> None:
         """Create new reasoning item."""
@@ -441,17 +681,14 @@ class ThreadState(rx.State):
             text=chunk.text,
             status=status,
         )
-        self.thinking_items = [*self.thinking_items, new_item]
+        self._add_thinking_item(new_item)
 
     def _handle_tool_chunk(self, chunk: Chunk) -> None:
         """Handle tool chunks by consolidating them into thinking items."""
         tool_id = chunk.chunk_metadata.get("tool_id")
         if not tool_id:
             # Generate a tool ID if not provided
-            tool_count = len(
-                [i for i in self.thinking_items if i.type == ThinkingType.TOOL_CALL]
-            )
-            tool_id = f"tool_{tool_count}"
+            tool_id = f"tool_{self._tool_call_count}"
 
         # Find existing tool item or create new one
         existing_item = self._find_existing_tool_item(tool_id)
@@ -465,10 +702,7 @@ class ThreadState(rx.State):
 
     def _find_existing_tool_item(self, tool_id: str) -> Thinking | None:
         """Find existing tool item by ID."""
-        for item in self.thinking_items:
-            if item.type == ThinkingType.TOOL_CALL and item.id == tool_id:
-                return item
-        return None
+        return self._find_thinking_item(ThinkingType.TOOL_CALL, tool_id)
 
     def _update_existing_tool_item(self, existing_item: Thinking, chunk: Chunk) -> None:
         """Update existing tool item with new chunk data."""
@@ -488,8 +722,6 @@ class ThreadState(rx.State):
             self._handle_tool_result(existing_item, chunk)
         elif chunk.type == ChunkType.ACTION:
             existing_item.text += f"\n---\nAktion: {chunk.text}"
-        # Trigger Reflex reactivity by reassigning the list
-        self.thinking_items = self.thinking_items.copy()
 
     def _handle_tool_result(self, existing_item: Thinking, chunk: Chunk) -> None:
         """Handle tool result chunk."""
@@ -536,7 +768,7 @@ class ThreadState(rx.State):
             result=result,
             error=chunk.text if status == ThinkingStatus.ERROR else None,
         )
-        self.thinking_items = [*self.thinking_items, new_item]
+        self._add_thinking_item(new_item)
 
     def _add_error_message(self, error_msg: str) -> None:
         """Add an error message to the conversation."""
@@ -553,7 +785,26 @@ class ThreadState(rx.State):
 
         self._thread.messages = self.messages
         self._thread.ai_model = self.selected_model
-        await threadlist_state.update_thread(self._thread)
+        threadlist_state.update_thread(self._thread)
+        if threadlist_state.autosave:
+            await self._save_thread(threadlist_state)
+
+    async def _save_thread(self, threadlist_state: "ThreadListState") -> None:
+        """Store the thread, writing only messages changed since the last save."""
+        fingerprints = [_message_fingerprint(message) for message in self.messages]
+        stored = self._stored_fingerprints
+        start = next(
+            (
+                i
+                for i, (old, new) in enumerate(zip(stored, fingerprints, strict=False))
+                if old != new
+            ),
+            min(len(stored), len(fingerprints)),
+        )
+        await threadlist_state.save_thread(
+            self._thread, self.messages[start:], self._message_offset + start
+        )
+        self._stored_fingerprints = fingerprints
 
     def toggle_thinking_expanded(self) -> None:
         """Toggle the expanded state of the thinking section."""
@@ -563,18 +814,17 @@ class ThreadState(rx.State):
     @rx.event
     async def load_available_mcp_servers(self) -> None:
         """Load available MCP servers from the database."""
-        self.available_mcp_servers = await MCPServerRepository.get_all()
+        self.available_mcp_servers = await MCPServerRepository.get_summaries()
 
     @rx.event
     def open_tools_modal(self) -> None:
         """Open the tools modal."""
         self.temp_selected_mcp_servers = [
-            server.id for server in self.selected_mcp_servers if server.id
+            server.id for server in self.selected_mcp_servers
         ]
         self.server_selection_state = {
             server.id: server.id in self.temp_selected_mcp_servers
             for server in self.available_mcp_servers
-            if server.id
         }
         self.show_tools_modal = True
 
@@ -612,26 +862,68 @@ class ThreadState(rx.State):
         self._thread.ai_model = model_id
 
 
+UserIdResolver = Callable[[rx.State], Awaitable[str | None]]
+
+
+class ThreadOwner:
+    """Determines the owner of the thread list.
+
+    Apps with authentication register a resolver returning the ID of the
+    logged-in user. Without a resolver, or while nobody is logged in, threads
+    belong to an anonymous ID kept in the browser's local storage.
+    """
+
+    _resolver: ClassVar[UserIdResolver | None] = None
+
+    @classmethod
+    def register_resolver(cls, resolver: UserIdResolver | None) -> None:
+        cls._resolver = resolver
+
+    @classmethod
+    async def resolve(cls, state: rx.State) -> str | None:
+        if cls._resolver is None:
+            return None
+        return await cls._resolver(state)
+
+
 class ThreadListState(rx.State):
-    """State for the thread list component."""
+    """State for the thread list component.
 
+    Threads are stored in the database per user. The list holds lightweight
+    summaries and is loaded in pages; the messages of a thread are loaded into
+    the ThreadState when it is selected.
+    """
+
+    # Threads of earlier versions kept in the browser, imported once
     thread_store: str = rx.LocalStorage("{}", name="asui-threads", sync=True)
-    threads: list[ThreadModel] = []
-    active_thread_id: str = ""
+    # Owner of the threads while no user is logged in
+    owner_token: str = rx.LocalStorage("", name="asui-owner")
+    threads: list[ThreadSummary] = []
+    # Kept in the browser, so a reload reopens the thread
+    active_thread_id: str = rx.LocalStorage("", name="asui-active-thread")
     autosave: bool = False
+    has_more_threads: bool = False
+    search_query: str = ""
+    search_results: list[ThreadSearchResult] = []
+    has_more_results: bool = False
 
     @rx.var
     def has_threads(self) -> bool:
         """Check if there are any threads."""
         return len(self.threads) > 0
 
+    @rx.var
+    def is_searching(self) -> bool:
+        """Whether search results are shown instead of the thread list."""
+        return bool(self.search_query.strip())
+
     async def initialize(
         self, autosave: bool = False, auto_create_default: bool = False
     ) -> None:
         """Initialize the thread list state.
 
         Args:
-            autosave: Enable auto-saving threads to local storage.
+            autosave: Enable auto-saving threads to the database.
             auto_create_default: If True, create and select a default thread
                 when no threads exist (e.g., on first load or after clearing).
         """
@@ -644,45 +936,191 @@ class ThreadListState(rx.State):
 
         logger.debug("Initialized thread list state")
 
+    async def get_user_id(self) -> str:
+        """ID of the user owning the thread list."""
+        user_id = await ThreadOwner.resolve(self)
+        if user_id:
+            return f"user:{user_id}"
+
+        if not self.owner_token:
+            self.owner_token = str(uuid.uuid4())
+        return f"anonymous:{self.owner_token}"
+
     async def load_threads(self) -> None:
-        """Load threads from browser local storage."""
+        """Load the first page of threads, most recently updated first.
+
+        The previously active thread is selected again if it is on the first
+        page, otherwise the most recent thread.
+        """
+        previous_thread_id = self.active_thread_id
+        self.active_thread_id = ""
         try:
-            thread_data = json.loads(self.thread_store)
-            if thread_data and "threads" in thread_data:
-                self.threads = [
-                    ThreadModel(**thread) for thread in thread_data["threads"]
-                ]
-                self.active_thread_id = thread_data.get("active_thread_id", "")
-                if self.active_thread_id:
-                    await self.select_thread(self.active_thread_id)
+            user_id = await self.get_user_id()
+            await self._import_local_threads(user_id)
+            threads = await ThreadRepository.get_threads(
+                user_id, limit=THREAD_PAGE_SIZE + 1
+            )
         except Exception as e:
-            logger.error("Error loading threads from local storage: %s", e)
-            self.threads = []
-            self.active_thread_id = ""
+            logger.error("Error loading threads: %s", e)
+            threads = []
+
+        self.has_more_threads = len(threads) > THREAD_PAGE_SIZE
+        self.threads = threads[:THREAD_PAGE_SIZE]
+        if self.threads:
+            if previous_thread_id not in {t.thread_id for t in self.threads}:
+                previous_thread_id = self.threads[0].thread_id
+            await self.select_thread(previous_thread_id)
 
-    async def save_threads(self) -> None:
-        """Save threads to browser local storage."""
+    @rx.event
+    async def load_more_threads(self) -> None:
+        """Append the next page of threads to the list."""
         try:
-            thread_list = []
-            for thread in self.threads:
-                thread_dict = thread.dict()
-                if thread.messages:
-                    thread_dict["messages"] = [msg.dict() for msg in thread.messages]
-                thread_list.append(thread_dict)
-
-            thread_data = {
-                "threads": thread_list,
-                "active_thread_id": self.active_thread_id,
-            }
-            self.thread_store = json.dumps(thread_data)
-            logger.debug("Saved threads to local storage")
+            threads = await ThreadRepository.get_threads(
+                await self.get_user_id(),
+                offset=len(self.threads),
+                limit=THREAD_PAGE_SIZE + 1,
+            )
         except Exception as e:
-            logger.error("Error saving threads to local storage: %s", e)
+            logger.error("Error loading threads: %s", e)
+            return
+
+        self.has_more_threads = len(threads) > THREAD_PAGE_SIZE
+        # Threads updated in the meantime may show up again
+        known = {thread.thread_id for thread in self.threads}
+        self.threads.extend(
+            thread
+            for thread in threads[:THREAD_PAGE_SIZE]
+            if thread.thread_id not in known
+        )
+
+    @rx.event
+    async def search(self, query: str) -> None:
+        """Search the messages of all threads and show the first page of hits."""
+        self.search_query = query
+        self.search_results = []
+        self.has_more_results = False
+        if self.is_searching:
+            await self._load_search_results()
+
+    @rx.event
+    async def load_more_results(self) -> None:
+        """Append the next page of search results."""
+        await self._load_search_results()
+
+    @rx.event
+    def clear_search(self) -> None:
+        self.search_query = ""
+        self.search_results = []
+        self.has_more_results = False
+
+    async def _load_search_results(self) -> None:
+        try:
+            results = await ThreadRepository.search(
+                await self.get_user_id(),
+                self.search_query.strip(),
+                offset=len(self.search_results),
+                limit=SEARCH_PAGE_SIZE + 1,
+            )
+        except Exception as e:
+            logger.error("Error searching threads: %s", e)
+            return
+
+        self.has_more_results = len(results) > SEARCH_PAGE_SIZE
+        self.search_results.extend(results[:SEARCH_PAGE_SIZE])
+
+    @rx.event
+    async def open_search_result(self, thread_id: str) -> None:
+        """Select the thread of a search result.
+
+        The thread may not be in the loaded pages of the list yet.
+        """
+        if not await self.get_thread(thread_id):
+            try:
+                thread = await ThreadRepository.get_thread(
+                    await self.get_user_id(), thread_id
+                )
+            except Exception as e:
+                logger.error("Error loading thread %s: %s", thread_id, e)
+                return
+            if thread is None:
+                return
+            self.threads.insert(
+                0,
+                ThreadSummary(
+                    thread_id=thread.thread_id,
+                    title=thread.title,
+                    ai_model=thread.ai_model,
+                ),
+            )
+        await self.select_thread(thread_id)
+
+    async def _import_local_threads(self, user_id: str) -> None:
+        """Move threads stored in the browser by earlier versions to the database."""
+        try:
+            thread_data = json.loads(self.thread_store or "{}")
+        except ValueError:
+            thread_data = {}
+
+        threads = thread_data.get("threads") if isinstance(thread_data, dict) else None
+        if threads:
+            # Oldest first, so the most recent thread ends up on top
+            for thread_dict in reversed(threads):
+                thread = ThreadModel(**thread_dict)
+                await ThreadRepository.save(user_id, thread, thread.messages)
+            logger.info("Imported %d threads from local storage", len(threads))
+
+        if self.thread_store != "{}":
+            await self.reset_thread_store()
+
+    async def load_messages(
+        self, thread_id: str, before: int | None = None, limit: int | None = None
+    ) -> tuple[list[Message], int]:
+        """Load stored messages of a thread, see ThreadRepository.get_messages."""
+        return await self.fetch_messages(
+            await self.get_user_id(), thread_id, before=before, limit=limit
+        )
+
+    @staticmethod
+    async def fetch_messages(
+        user_id: str,
+        thread_id: str,
+        before: int | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[Message], int]:
+        """Load stored messages of a thread of a user, without touching the state.
+
+        Background events can call it without holding the state lock.
+        """
+        try:
+            await autosave_scheduler().flush(thread_id)
+            return await ThreadRepository.get_messages(
+                user_id, thread_id, before=before, limit=limit
+            )
+        except Exception as e:
+            logger.error("Error loading messages of %s: %s", thread_id, e)
+            return [], before or 0
+
+    async def save_thread(
+        self, thread: ThreadModel, messages: list[Message], position: int
+    ) -> None:
+        """Schedule saving a thread, replacing its messages from `position` on.
+
+        Saves of a thread within the autosave window are combined into one.
+        """
+        autosave_scheduler().schedule(
+            PendingSave(
+                user_id=await self.get_user_id(),
+                thread=thread.model_copy(update={"messages": []}),
+                # Detached from the state, which keeps changing until saved
+                messages=[Message.model_validate(m.model_dump()) for m in messages],
+                position=position,
+            )
+        )
 
     async def reset_thread_store(self) -> None:
         self.thread_store = "{}"
 
-    async def get_thread(self, thread_id: str) -> ThreadModel | None:
+    async def get_thread(self, thread_id: str) -> ThreadSummary | None:
         """Get a thread by its ID."""
         for thread in self.threads:
             if thread.thread_id == thread_id:
@@ -691,32 +1129,25 @@ class ThreadListState(rx.State):
 
     async def create_thread(self) -> None:
         """Create a new thread."""
-        new_thread = ThreadModel(
+        new_thread = ThreadSummary(
             thread_id=str(uuid.uuid4()),
             title="Neuer Chat",
-            prompt="",
-            messages=[],
-            state=ThreadStatus.NEW,
             ai_model=ModelManager().get_default_model(),
-            active=True,
         )
         self.threads.insert(0, new_thread)
         await self.select_thread(new_thread.thread_id)
 
         logger.debug("Created new thread: %s", new_thread)
 
-    async def update_thread(self, thread: ThreadModel) -> None:
-        """Update a thread."""
-        existing_thread = await self.get_thread(thread.thread_id)
+    def update_thread(self, thread: ThreadModel) -> None:
+        """Update the list entry of a thread."""
+        existing_thread = next(
+            (t for t in self.threads if t.thread_id == thread.thread_id), None
+        )
         if existing_thread:
             existing_thread.title = thread.title
-            existing_thread.messages = thread.messages
-            existing_thread.state = thread.state
-            existing_thread.active = thread.active
             existing_thread.ai_model = thread.ai_model
-
-        if self.autosave:
-            await self.save_threads()
+            existing_thread.updated = datetime.now(UTC)
         logger.debug("Updated thread: %s", thread.thread_id)
 
     async def delete_thread(self, thread_id: str) -> AsyncGenerator[Any, Any]:
@@ -731,7 +1162,11 @@ class ThreadListState(rx.State):
 
         was_active = thread_id == self.active_thread_id
         self.threads.remove(thread)
-        await self.save_threads()
+        await autosave_scheduler().discard(thread_id)
+        try:
+            await ThreadRepository.delete(await self.get_user_id(), thread_id)
+        except Exception as e:
+            logger.error("Error deleting thread %s: %s", thread_id, e)
         yield rx.toast.info(
             f"Chat '{thread.title}' erfolgreich gelöscht.",
             position="top-right",
@@ -748,15 +1183,37 @@ class ThreadListState(rx.State):
         # User can select from existing threads or create new one
 
     async def select_thread(self, thread_id: str) -> None:
-        """Select a thread."""
+        """Select a thread and load its latest messages."""
         for thread in self.threads:
             thread.active = thread.thread_id == thread_id
         self.active_thread_id = thread_id
-        active_thread = await self.get_thread(thread_id)
+        summary = await self.get_thread(thread_id)
+        if not summary:
+            return
 
-        if active_thread:
-            thread_state: ThreadState = await self.get_state(ThreadState)
-            thread_state.set_thread(active_thread)
-            thread_state.messages = active_thread.messages
-            thread_state.selected_model = active_thread.ai_model
-            thread_state.with_thread_list = True
+        try:
+            await autosave_scheduler().flush(thread_id)
+            thread = await ThreadRepository.get_thread(
+                await self.get_user_id(), thread_id
+            )
+        except Exception as e:
+            logger.error("Error loading thread %s: %s", thread_id, e)
+            thread = None
+
+        offset = 0
+        if thread is None:  # not stored yet
+            thread = ThreadModel(
+                thread_id=thread_id,
+                title=summary.title,
+                ai_model=summary.ai_model,
+                state=ThreadStatus.NEW,
+            )
+        else:
+            thread.messages, offset = await self.load_messages(
+                thread_id, limit=MESSAGE_PAGE_SIZE
+            )
+        thread.active = True
+
+        thread_state: ThreadState = await self.get_state(ThreadState)
+        thread_state.set_thread(thread, message_offset=offset)
+        thread_state.with_thread_list = True
@@ -19,6 +19,7 @@ __all__ = [
     "BaseConfig",
     "Configuration",
     "DatabaseConfig",
+    "HttpConfig",
     "Protocol",
     "SecretNotFoundError",
     "SecretProvider",
@@ -37,6 +38,7 @@ _lazy_map: dict[str, str] = {
     "Configuration": "appkit_commons.configuration.configuration",
     "ApplicationConfig": "appkit_commons.configuration.configuration",
     "DatabaseConfig": "appkit_commons.configuration.configuration",
+    "HttpConfig": "appkit_commons.configuration.configuration",
     "ServerConfig": "appkit_commons.configuration.configuration",
     "WorkerConfig": "appkit_commons.configuration.configuration",
     "Protocol": "appkit_commons.configuration.configuration",
@@ -52,12 +52,19 @@ class ReflexConfig(BaseConfig):
     single_port: bool = False
 
 
+class HttpConfig(BaseConfig):
+    # In-flight requests per upstream origin in the shared HTTP client pool,
+    # None for no limit
+    max_concurrency_per_host: int | None = 64
+
+
 class ApplicationConfig(BaseConfig):
     version: str
     name: str
     logging: str
     environment: Environment | None = Environment.local
     database: DatabaseConfig | None = Field(..., alias="database")
+    http: HttpConfig | None = None
 
 
 T = TypeVar("T", bound=ApplicationConfig)
@@ -0,0 +1,68 @@
+"""
+Process-wide cipher for encrypted database columns.
+
+Building a Fernet instance derives the signing and encryption keys from the
+configured key, so the cipher is created once per process and shared by all
+EncryptedString columns.
+
+The current key encrypts, all configured keys decrypt (MultiFernet). To rotate
+keys, move the current key to previous_encryption_keys, configure the new key
+as encryption_key and re-encrypt the stored values, see key_rotation.
+"""
+
+import logging
+from functools import lru_cache
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+
+from appkit_commons.database.configuration import DatabaseConfig
+from appkit_commons.registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+
+class CipherProvider:
+    """Encrypts with the current key and decrypts with any configured key."""
+
+    def __init__(self, key: str, previous_keys: list[str] | None = None) -> None:
+        if not key:
+            raise ValueError("No database encryption key configured")
+        self._primary = Fernet(key)
+        self._cipher = MultiFernet(
+            [self._primary, *(Fernet(k) for k in previous_keys or [])]
+        )
+        self.key_count = 1 + len(previous_keys or [])
+
+    def encrypt(self, value: str) -> str:
+        return self._cipher.encrypt(value.encode()).decode()
+
+    def decrypt(self, token: str) -> str:
+        return self._cipher.decrypt(token.encode()).decode()
+
+    def is_current(self, token: str) -> bool:
+        """Whether the token was encrypted with the current key."""
+        try:
+            self._primary.decrypt(token.encode())
+        except InvalidToken:
+            return False
+        return True
+
+    def rotate(self, token: str) -> str:
+        """Re-encrypt a token with the current key."""
+        return self._cipher.rotate(token.encode()).decode()
+
+
+def _split_keys(keys: str) -> list[str]:
+    return [key.strip() for key in keys.split(",") if key.strip()]
+
+
+@lru_cache(maxsize=1)
+def cipher_provider() -> CipherProvider:
+    """The cipher of the configured keys, created on first use.
+
+    Call cipher_provider.cache_clear() after changing the keys at runtime.
+    """
+    db_config = service_registry().get(DatabaseConfig)
+    previous_keys = _split_keys(db_config.previous_encryption_keys.get_secret_value())
+    logger.debug("Creating database cipher with %d keys", 1 + len(previous_keys))
+    return CipherProvider(db_config.encryption_key.get_secret_value(), previous_keys)
@@ -16,6 +16,9 @@ class DatabaseConfig(BaseConfig):
     port: int = 5432
     name: str = "postgres"
     encryption_key: SecretStr = SecretStr("")
+    # Comma separated keys used before encryption_key, still accepted for
+    # decryption until all rows have been re-encrypted
+    previous_encryption_keys: SecretStr = SecretStr("")
     pool_size: int = 10
     max_overflow: int = 30
     echo: bool = False
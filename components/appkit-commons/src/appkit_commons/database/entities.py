@@ -1,6 +1,5 @@
 import datetime
 
-from cryptography.fernet import Fernet
 from sqlalchemy import (
     DateTime,
     Dialect,
@@ -14,32 +13,27 @@ from sqlalchemy.orm import (
 )
 from sqlalchemy.sql import func
 
-from appkit_commons.database.configuration import DatabaseConfig
-from appkit_commons.registry import service_registry
-
-
-def get_cipher_key() -> str:
-    """Get cipher key from database config, with lazy initialization."""
-    return service_registry().get(DatabaseConfig).encryption_key.get_secret_value()
+from appkit_commons.database.cipher import CipherProvider, cipher_provider
 
 
 class EncryptedString(TypeDecorator):
+    """String encrypted with the process-wide cipher, see cipher_provider."""
+
     impl = String
     cache_ok = True  # Added to allow caching of the custom type
 
-    def __init__(self, *args: any, **kwargs: any):
-        super().__init__(*args, **kwargs)
-        self.cipher_key = get_cipher_key()
-        self.cipher = Fernet(self.cipher_key)
+    @property
+    def cipher(self) -> CipherProvider:
+        return cipher_provider()
 
     def process_bind_param(self, value: any, dialect: Dialect) -> str | None:  # noqa: ARG002
         if value is not None:
-            return self.cipher.encrypt(value.encode()).decode()
+            return self.cipher.encrypt(value)
         return value
 
     def process_result_value(self, value: any, dialect: Dialect) -> str | None:  # noqa: ARG002
         if value is not None:
-            return self.cipher.decrypt(value.encode()).decode()
+            return self.cipher.decrypt(value)
         return value
 
 
@@ -0,0 +1,173 @@
+"""
+Process-wide pool of long-lived httpx.AsyncClient instances.
+
+Creating a new client per request (or per SDK client) repeats DNS lookups and
+TLS handshakes and throws away keep-alive connections. The HttpClientPool hands
+out one shared client per upstream origin (scheme, host and port) instead.
+
+Each pooled client also caps the number of in-flight requests to its origin.
+The httpx connection limit does not do this over HTTP/2, where any number of
+requests share one connection. The cap is set by `app.http` in the
+configuration.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from collections.abc import AsyncIterator, Callable
+from functools import lru_cache
+
+import httpx
+
+from appkit_commons.configuration.configuration import HttpConfig
+from appkit_commons.registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+# The OpenAI SDK uses the timeout of a custom http_client instead of its own
+# default (600s read), so long reasoning calls need the same read timeout here
+DEFAULT_TIMEOUT: httpx.Timeout = httpx.Timeout(600.0, connect=10.0)
+DEFAULT_LIMITS: httpx.Limits = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+DEFAULT_MAX_CONCURRENCY_PER_HOST: int | None = HttpConfig.model_fields[
+    "max_concurrency_per_host"
+].default
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support in httpx requires the optional `h2` package."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that runs a callback once the body has been closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class _ConcurrencyLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport limiting the number of in-flight requests to one origin.
+
+    A request holds its slot until the response body has been read or closed,
+    so streamed responses count for as long as they are being consumed.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrency: int):
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        response.stream = _ReleasingStream(response.stream, self._semaphore.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClientPool:
+    """Hands out shared httpx.AsyncClient instances per upstream origin."""
+
+    def __init__(
+        self,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        http2: bool = True,
+        max_concurrency_per_host: int | None = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+    ) -> None:
+        self.limits = limits
+        self.timeout = timeout
+        self.http2 = http2 and _http2_available()
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+        if http2 and not self.http2:
+            logger.warning("Package 'h2' not installed, falling back to HTTP/1.1")
+
+    @staticmethod
+    def origin(url: str | httpx.URL) -> str:
+        """Return the pool key (scheme://host:port) for a URL."""
+        parsed = httpx.URL(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return f"{parsed.scheme}://{parsed.host}:{port}"
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Return the shared client for the origin of `url`.
+
+        The returned client is owned by the pool and must not be closed by the
+        caller (e.g. do not use it as an async context manager).
+        """
+        origin = self.origin(url)
+        client = self._clients.get(origin)
+        if client is not None and not client.is_closed:
+            return client
+
+        with self._lock:
+            client = self._clients.get(origin)
+            if client is None or client.is_closed:
+                client = self._create_client()
+                self._clients[origin] = client
+                logger.debug("Created pooled HTTP client for %s", origin)
+        return client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+            limits=self.limits, http2=self.http2
+        )
+        if self.max_concurrency_per_host:
+            transport = _ConcurrencyLimitedTransport(
+                transport, self.max_concurrency_per_host
+            )
+
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            follow_redirects=True,
+        )
+
+    async def aclose(self) -> None:
+        """Close all pooled clients."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            await client.aclose()
+        logger.debug("Closed %d pooled HTTP clients", len(clients))
+
+
+@lru_cache(maxsize=1)
+def http_client_pool() -> HttpClientPool:
+    max_concurrency = DEFAULT_MAX_CONCURRENCY_PER_HOST
+    if service_registry().has(HttpConfig):
+        max_concurrency = service_registry().get(HttpConfig).max_concurrency_per_host
+    logger.debug(
+        "Creating the HTTP client pool instance, %s in-flight requests per host",
+        max_concurrency or "unlimited",
+    )
+    return HttpClientPool(max_concurrency_per_host=max_concurrency)
@@ -0,0 +1,82 @@
+"""
+Password hashing off the event loop.
+
+scrypt and pbkdf2 take tens of milliseconds of CPU per call. Run inline in an
+async handler they block the event loop, and with it every other user. The
+PasswordService runs them in a small thread pool instead; hashlib releases the
+GIL while deriving keys, so threads run in parallel with the event loop.
+
+The number of concurrent derivations is capped by the pool size. Callers
+beyond the cap wait on a semaphore, where they can still be cancelled, rather
+than in the executor queue.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import TypeVar
+
+from appkit_commons.security import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class PasswordService:
+    """Runs password hashing and verification in a bounded thread pool."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password"
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+    async def generate_password_hash(
+        self, password: str, method: str = "scrypt", salt_length: int = 16
+    ) -> str:
+        """Async variant of appkit_commons.security.generate_password_hash."""
+        return await self._run(
+            partial(generate_password_hash, password, method, salt_length)
+        )
+
+    async def check_password_hash(self, pwhash: str | None, password: str) -> bool:
+        """Async variant of appkit_commons.security.check_password_hash."""
+        if not pwhash:
+            return False
+        return await self._run(partial(check_password_hash, pwhash, password))
+
+    async def _run(self, func: Callable[[], T]) -> T:
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func
+            )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def password_service() -> PasswordService:
+    logger.debug("Creating password service with %d workers", DEFAULT_MAX_WORKERS)
+    return PasswordService()
+
+
+async def generate_password_hash_async(
+    password: str, method: str = "scrypt", salt_length: int = 16
+) -> str:
+    """Hash a password in the shared password service."""
+    return await password_service().generate_password_hash(
+        password, method, salt_length
+    )
+
+
+async def check_password_hash_async(pwhash: str | None, password: str) -> bool:
+    """Check a password against a stored hash in the shared password service."""
+    return await password_service().check_password_hash(pwhash, password)
@@ -3,6 +3,7 @@ import logging
 
 import httpx
 
+from appkit_commons.http_pool import http_client_pool
 from appkit_imagecreator.backend.models import (
     GenerationInput,
     ImageGenerator,
@@ -55,36 +56,36 @@ class BlackForestLabsImageGenerator(ImageGenerator):
         image_url = None
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status()  # Raise an exception for bad status codes
-                request_data = response.json()
+            # Pooled clients are shared and must not be closed here
+            client = http_client_pool().get_client(api_url)
+            response = await client.post(api_url, headers=headers, json=payload)
+            response.raise_for_status()  # Raise an exception for bad status codes
+            request_data = response.json()
 
-                polling_url = request_data.get("polling_url")
-                polling_headers = {
-                    "accept": "application/json",
-                    "x-key": self.api_key,
-                }
+            polling_url = request_data.get("polling_url")
+            polling_client = http_client_pool().get_client(polling_url)
+            polling_headers = {
+                "accept": "application/json",
+                "x-key": self.api_key,
+            }
 
-                while True:
-                    await asyncio.sleep(1.5)  # Use asyncio.sleep for async context
-                    poll_response = await client.get(
-                        polling_url, headers=polling_headers
-                    )
-                    poll_response.raise_for_status()
-                    result = poll_response.json()
-                    status = result.get("status")
+            while True:
+                await asyncio.sleep(1.5)  # Use asyncio.sleep for async context
+                poll_response = await polling_client.get(
+                    polling_url, headers=polling_headers
+                )
+                poll_response.raise_for_status()
+                result = poll_response.json()
+                status = result.get("status")
 
-                    if status == "Ready":
-                        image_url = result.get("result", {}).get("sample")
-                        if not image_url:
-                            error_msg = (
-                                "Bild-URL wurde im 'Ready'-Status nicht gefunden."
-                            )
-                        break
-                    if status not in ["Pending", "Processing", "Queued"]:
-                        error_msg = f"Ein Fehler oder ein unerwarteter Status ist aufgetreten: {result}"  # noqa: E501
-                        break
+                if status == "Ready":
+                    image_url = result.get("result", {}).get("sample")
+                    if not image_url:
+                        error_msg = "Bild-URL wurde im 'Ready'-Status nicht gefunden."
+                    break
+                if status not in ["Pending", "Processing", "Queued"]:
+                    error_msg = f"Ein Fehler oder ein unerwarteter Status ist aufgetreten: {result}"  # noqa: E501
+                    break
         except httpx.HTTPStatusError as e:
             error_msg = (
                 f"HTTP-Fehler aufgetreten: {e.response.status_code} - {e.response.text}"
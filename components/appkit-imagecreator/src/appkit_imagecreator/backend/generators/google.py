@@ -3,6 +3,7 @@ from typing import Final
 
 from google import genai
 
+from appkit_commons.http_pool import http_client_pool
 from appkit_imagecreator.backend.models import (
     GenerationInput,
     ImageGenerator,
@@ -33,10 +34,18 @@ class GoogleImageGenerator(ImageGenerator):
             api_key=api_key,
             backend_server=backend_server,
         )
-        self.client = genai.Client(api_key=self.api_key)
+        # The genai SDK manages its own httpx client, which lives as long as this
+        # generator. Configure it with the same pooling limits as the shared pool.
+        pool = http_client_pool()
+        self.client = genai.Client(
+            api_key=self.api_key,
+            http_options=genai.types.HttpOptions(
+                async_client_args={"limits": pool.limits, "http2": pool.http2}
+            ),
+        )
 
-    def _enhance_prompt(self, prompt: str) -> str:
-        response = self.client.models.generate_content(
+    async def _enhance_prompt(self, prompt: str) -> str:
+        response = await self.client.aio.models.generate_content(
             model="gemini-2.0-flash-001",
             contents=(
                 "You are an image generation assistant specialized in "
@@ -58,9 +67,9 @@ class GoogleImageGenerator(ImageGenerator):
         prompt = self._format_prompt(input_data.prompt, input_data.negative_prompt)
 
         if input_data.enhance_prompt:
-            prompt = self._enhance_prompt(prompt)
+            prompt = await self._enhance_prompt(prompt)
 
-        response = self.client.models.generate_images(
+        response = await self.client.aio.models.generate_images(
             model=self.model,
             prompt=prompt,
             config=genai.types.GenerateImagesConfig(
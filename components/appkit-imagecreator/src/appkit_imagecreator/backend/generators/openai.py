@@ -4,6 +4,7 @@ from typing import Final
 
 from openai import AsyncAzureOpenAI
 
+from appkit_commons.http_pool import http_client_pool
 from appkit_imagecreator.backend.models import (
     GenerationInput,
     ImageGenerator,
@@ -41,6 +42,7 @@ class OpenAIImageGenerator(ImageGenerator):
             api_version="2025-04-01-preview",
             azure_endpoint=base_url,
             api_key=api_key,
+            http_client=http_client_pool().get_client(base_url) if base_url else None,
         )
 
     async def _enhance_prompt(self, prompt: str) -> str:
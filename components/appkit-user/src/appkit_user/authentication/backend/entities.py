@@ -6,6 +6,7 @@ from sqlalchemy import (
     ARRAY,  # Added import
     Boolean,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -24,8 +25,13 @@ from sqlalchemy_utils.types.encrypted.encrypted_type import FernetEngine
 
 from appkit_commons.database.configuration import DatabaseConfig
 from appkit_commons.database.entities import Base, Entity
+from appkit_commons.password_service import (
+    check_password_hash_async,
+    generate_password_hash_async,
+)
 from appkit_commons.registry import service_registry
 from appkit_commons.security import check_password_hash, generate_password_hash
+from appkit_user.authentication.backend.password_policy import password_policy
 
 logger = logging.getLogger(__name__)
 db_config: DatabaseConfig = service_registry().get(DatabaseConfig)
@@ -78,11 +84,28 @@ class UserEntity(Entity, Base):
 
     @password.setter
     def password(self, password: str) -> None:
-        self._password = generate_password_hash(password)
+        self._password = generate_password_hash(password, password_policy().method)
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self._password, password)
 
+    async def set_password_async(self, password: str) -> None:
+        """Hash and set the password without blocking the event loop."""
+        self._password = await generate_password_hash_async(
+            password, password_policy().method
+        )
+
+    async def check_password_async(self, password: str) -> bool:
+        """Check the password without blocking the event loop."""
+        return await check_password_hash_async(self._password, password)
+
+    async def rehash_password_async(self, password: str) -> bool:
+        """Rehash a verified password whose hash does not follow the policy."""
+        if not password_policy().needs_rehash(self._password):
+            return False
+        await self.set_password_async(password)
+        return True
+
     def to_dict(self) -> dict:
         """Convert user to dictionary."""
         return {
@@ -99,6 +122,20 @@ class UserEntity(Entity, Base):
         }
 
 
+class LoginThrottleEntity(Base):
+    """Login attempt bucket of an email address or client IP."""
+
+    __tablename__ = "auth_login_throttle"
+
+    key: Mapped[str] = mapped_column(String(320), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    refilled_at: Mapped[float] = mapped_column(Float, nullable=False)  # epoch
+    failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    locked_until: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (Index("ix_auth_login_throttle_refilled_at", "refilled_at"),)
+
+
 class UserSessionEntity(Entity, Base):
     """User session model for tracking user sessions."""
 
@@ -0,0 +1,321 @@
+"""
+Throttling of password logins.
+
+Every password check costs a full scrypt computation, so bursts of failed
+logins can saturate the workers. Before the password is checked, a login
+attempt has to take a token from the bucket of the email address and from the
+bucket of the client IP (if enabled). Repeated failures for an email address
+additionally lock it out for an exponentially growing time. Rejected attempts
+never reach the password check.
+
+The bucket states are kept in memory (single process) or in the database table
+auth_login_throttle, which all workers share.
+
+Behind a reverse proxy every connection comes from the proxy, so the client IP
+is taken from X-Forwarded-For as set by the trusted proxies. The IP bucket is
+disabled unless the number of those proxies is configured.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from appkit_commons.database.session import get_asyncdb_session
+from appkit_commons.registry import service_registry
+from appkit_user.authentication.backend.entities import LoginThrottleEntity
+from appkit_user.configuration import AuthenticationConfiguration
+
+logger = logging.getLogger(__name__)
+
+MAX_MEMORY_ENTRIES = 100_000
+PRUNE_EVERY = 1000  # login attempts
+# INSERT ... ON CONFLICT DO NOTHING of the supported database dialects
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+@dataclass
+class BucketState:
+    """Token bucket and failure count of one email address or client IP."""
+
+    tokens: float
+    refilled_at: float  # epoch seconds
+    failures: int = 0
+    locked_until: float = 0.0  # epoch seconds
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Bucket holding `capacity` attempts, refilled over `window` seconds."""
+
+    capacity: int
+    window: float
+
+    def refill(self, state: BucketState | None, now: float) -> BucketState:
+        if state is None:
+            return BucketState(tokens=float(self.capacity), refilled_at=now)
+        elapsed = max(now - state.refilled_at, 0.0)
+        state.tokens = min(
+            float(self.capacity), state.tokens + elapsed * self.capacity / self.window
+        )
+        state.refilled_at = now
+        return state
+
+    def seconds_until_token(self, state: BucketState) -> float:
+        return (1.0 - state.tokens) * self.window / self.capacity
+
+
+Update = Callable[[BucketState | None], BucketState]
+
+
+class MemoryThrottleStore:
+    """Bucket states of this process, least recently used evicted first."""
+
+    def __init__(self, max_entries: int = MAX_MEMORY_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._states: OrderedDict[str, BucketState] = OrderedDict()
+
+    async def update(self, key: str, update: Update) -> BucketState:
+        # Runs without awaiting, so it is atomic within the event loop
+        state = update(self._states.get(key))
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_entries:
+            self._states.popitem(last=False)
+        return state
+
+    async def prune(self, before: float) -> None:
+        """Drop states refilled before `before` that are not locked."""
+        for key in [
+            key
+            for key, state in self._states.items()
+            if state.refilled_at < before and state.locked_until < before
+        ]:
+            del self._states[key]
+
+
+class DatabaseThrottleStore:
+    """Bucket states in the database, shared by all workers.
+
+    Each update locks the row of the key (SELECT ... FOR UPDATE), so
+    concurrent attempts on different workers are counted correctly. SQLite
+    ignores the row lock, but serializes all writes anyway.
+    """
+
+    async def update(self, key: str, update: Update) -> BucketState:
+        async with get_asyncdb_session() as session:
+            dialect = session.bind.dialect.name
+            insert = UPSERT_INSERTS.get(dialect)
+            if insert is None:
+                raise ValueError(
+                    f"Database throttle store not supported on {dialect}, "
+                    "use login_throttle_store 'memory'"
+                )
+            await session.execute(
+                insert(LoginThrottleEntity)
+                .values(key=key, tokens=-1.0, refilled_at=0.0)
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+            entity = (
+                await session.execute(
+                    select(LoginThrottleEntity)
+                    .where(LoginThrottleEntity.key == key)
+                    .with_for_update()
+                )
+            ).scalar_one()
+
+            # A negative token count marks a row inserted just now
+            state = update(
+                None
+                if entity.tokens < 0
+                else BucketState(
+                    tokens=entity.tokens,
+                    refilled_at=entity.refilled_at,
+                    failures=entity.failures,
+                    locked_until=entity.locked_until,
+                )
+            )
+            entity.tokens = state.tokens
+            entity.refilled_at = state.refilled_at
+            entity.failures = state.failures
+            entity.locked_until = state.locked_until
+            await session.commit()
+            return state
+
+    async def prune(self, before: float) -> None:
+        """Delete states refilled before `before` that are not locked."""
+        async with get_asyncdb_session() as session:
+            await session.execute(
+                delete(LoginThrottleEntity).where(
+                    LoginThrottleEntity.refilled_at < before,
+                    LoginThrottleEntity.locked_until < before,
+                )
+            )
+
+
+class LoginThrottle:
+    """Token buckets per email and client IP with exponential lockout."""
+
+    def __init__(
+        self,
+        store: MemoryThrottleStore | DatabaseThrottleStore,
+        email_policy: BucketPolicy,
+        ip_policy: BucketPolicy,
+        lockout_threshold: int = 5,
+        lockout_seconds: float = 30.0,
+        max_lockout_seconds: float = 3600.0,
+        proxy_hops: int | None = None,
+    ) -> None:
+        self.store = store
+        self.email_policy = email_policy
+        self.ip_policy = ip_policy
+        self.lockout_threshold = lockout_threshold
+        self.lockout_seconds = lockout_seconds
+        self.max_lockout_seconds = max_lockout_seconds
+        self.proxy_hops = proxy_hops
+        self._attempts = 0
+
+    def client_ip(
+        self, connection_ip: str | None, forwarded_for: str | None
+    ) -> str | None:
+        """The client IP for the IP bucket, None if it is disabled or unknown.
+
+        Args:
+            connection_ip: peer address of the connection (ASGI scope client),
+                used without proxies (`proxy_hops` 0)
+            forwarded_for: the X-Forwarded-For header. Every proxy appends the
+                address it got the request from, so behind `proxy_hops`
+                trusted proxies the client IP is the `proxy_hops`-th entry from
+                the right. The entries left of it are sent by the client and
+                cannot be trusted.
+        """
+        if self.proxy_hops is None:
+            return None
+        if self.proxy_hops == 0:
+            return connection_ip
+        addresses = [
+            address.strip()
+            for address in (forwarded_for or "").split(",")
+            if address.strip()
+        ]
+        if len(addresses) < self.proxy_hops:
+            return None
+        return addresses[-self.proxy_hops]
+
+    async def check(self, email: str, client_ip: str | None) -> float:
+        """Take a login attempt from the buckets of the email and client IP.
+
+        Returns:
+            0 if the attempt may proceed, otherwise the seconds to wait
+        """
+        now = time.time()
+        self._attempts += 1
+        if self._attempts % PRUNE_EVERY == 0:
+            # Idle buckets are full again and can be recreated when needed
+            window = max(self.email_policy.window, self.ip_policy.window)
+            await self.store.prune(now - window)
+
+        retry_after = await self._take(self._email_key(email), self.email_policy, now)
+        if client_ip:
+            retry_after = max(
+                retry_after,
+                await self._take(self._ip_key(client_ip), self.ip_policy, now),
+            )
+        if retry_after:
+            logger.info(
+                "Login attempt for %s from %s throttled for %.0fs",
+                email,
+                client_ip,
+                retry_after,
+            )
+        return retry_after
+
+    async def record_failure(self, email: str) -> None:
+        """Count a failed login, locking the email out after repeated failures."""
+        now = time.time()
+
+        def fail(state: BucketState | None) -> BucketState:
+            state = self.email_policy.refill(state, now)
+            state.failures += 1
+            excess = state.failures - self.lockout_threshold
+            if excess >= 0:
+                state.locked_until = now + min(
+                    self.lockout_seconds * 2**excess, self.max_lockout_seconds
+                )
+            return state
+
+        await self.store.update(self._email_key(email), fail)
+
+    async def record_success(self, email: str) -> None:
+        """Reset the failures of the email after a successful login."""
+        now = time.time()
+
+        def succeed(state: BucketState | None) -> BucketState:
+            state = self.email_policy.refill(state, now)
+            state.failures = 0
+            state.locked_until = 0.0
+            return state
+
+        await self.store.update(self._email_key(email), succeed)
+
+    async def _take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        retry_after = 0.0
+
+        def take(state: BucketState | None) -> BucketState:
+            nonlocal retry_after
+            state = policy.refill(state, now)
+            if state.locked_until > now:
+                retry_after = state.locked_until - now
+            elif state.tokens >= 1.0:
+                state.tokens -= 1.0
+            else:
+                retry_after = policy.seconds_until_token(state)
+            return state
+
+        await self.store.update(key, take)
+        return retry_after
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"email:{email.strip().lower()}"
+
+    @staticmethod
+    def _ip_key(client_ip: str) -> str:
+        return f"ip:{client_ip}"
+
+
+@lru_cache(maxsize=1)
+def login_throttle() -> LoginThrottle:
+    config = service_registry().get(AuthenticationConfiguration)
+    store = (
+        DatabaseThrottleStore()
+        if config.login_throttle_store == "database"
+        else MemoryThrottleStore()
+    )
+    return LoginThrottle(
+        store,
+        email_policy=BucketPolicy(
+            config.login_attempts_per_email, config.login_attempts_window
+        ),
+        ip_policy=BucketPolicy(
+            config.login_attempts_per_ip, config.login_attempts_window
+        ),
+        lockout_threshold=config.login_lockout_threshold,
+        lockout_seconds=config.login_lockout_seconds,
+        max_lockout_seconds=config.login_max_lockout_seconds,
+        proxy_hops=config.login_ip_proxy_hops,
+    )
+
+
+def throttle_message(retry_after: float) -> str:
+    """Error message for a throttled login attempt."""
+    return (
+        "Zu viele Anmeldeversuche. Bitte versuchen Sie es in "
+        f"{math.ceil(retry_after)} Sekunden erneut."
+    )
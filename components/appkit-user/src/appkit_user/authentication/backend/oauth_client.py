@@ -0,0 +1,119 @@
+"""
+Async OAuth2 client for the authorization code flow (with PKCE).
+
+Token exchange and user info requests run on the pooled httpx clients of
+appkit_commons.http_pool, so they neither block the event loop nor repeat the
+TLS handshake with the provider on every login. The token requests match those
+of the OAuth2Session of requests_oauthlib: the client credentials are sent as
+HTTP basic auth, or the client_id in the body for public clients.
+"""
+
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from appkit_commons.http_pool import http_client_pool
+
+logger = logging.getLogger(__name__)
+
+OAUTH_TIMEOUT: httpx.Timeout = httpx.Timeout(15.0, connect=5.0)
+JSON_HEADERS = {"Accept": "application/json"}
+
+
+class OAuthError(Exception):
+    """The provider rejected a token request."""
+
+
+def authorization_url(
+    auth_url: str,
+    client_id: str,
+    redirect_uri: str | None,
+    scopes: list[str],
+    state: str,
+    **params: str,
+) -> str:
+    """URL of the provider's login page for the authorization code flow."""
+    query = {
+        "response_type": "code",
+        "client_id": client_id,
+        "scope": " ".join(scopes),
+        "state": state,
+        **params,
+    }
+    if redirect_uri:
+        query["redirect_uri"] = redirect_uri
+    return str(httpx.URL(auth_url).copy_merge_params(query))
+
+
+class AsyncOAuthClient:
+    """Token exchange and resource requests of one OAuth client."""
+
+    def __init__(self, client_id: str, timeout: httpx.Timeout = OAUTH_TIMEOUT) -> None:
+        self.client_id = client_id
+        self.timeout = timeout
+
+    async def fetch_token(
+        self,
+        token_url: str,
+        code: str,
+        redirect_uri: str | None,
+        client_secret: str | None = None,
+        code_verifier: str | None = None,
+    ) -> dict[str, Any]:
+        """Exchange an authorization code for a token.
+
+        With a client_secret the client authenticates with HTTP basic auth,
+        otherwise (public client) the client_id is sent in the body.
+        """
+        data = {"grant_type": "authorization_code", "code": code}
+        if redirect_uri:
+            data["redirect_uri"] = redirect_uri
+        if code_verifier:
+            data["code_verifier"] = code_verifier
+
+        auth: httpx.BasicAuth | None = None
+        if client_secret is None:
+            data["client_id"] = self.client_id
+        else:
+            auth = httpx.BasicAuth(self.client_id, client_secret)
+
+        client = http_client_pool().get_client(token_url)
+        response = await client.post(
+            token_url,
+            data=data,
+            auth=auth,
+            headers=JSON_HEADERS,
+            timeout=self.timeout,
+        )
+        try:
+            token = response.json()
+        except ValueError:
+            token = {}
+        # GitHub reports errors with status 200
+        if response.is_error or "error" in token or "access_token" not in token:
+            error = token.get("error_description") or token.get("error")
+            raise OAuthError(
+                f"Token request failed ({response.status_code}): "
+                f"{error or response.reason_phrase}"
+            )
+
+        if token.get("expires_in") is not None:
+            token["expires_in"] = int(token["expires_in"])
+            token["expires_at"] = time.time() + token["expires_in"]
+        return token
+
+    async def get_json(self, url: str, token: dict[str, Any]) -> Any:
+        """GET a protected resource with the access token of `token`."""
+        client = http_client_pool().get_client(url)
+        response = await client.get(
+            url,
+            headers={
+                **JSON_HEADERS,
+                "Authorization": f"Bearer {token['access_token']}",
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
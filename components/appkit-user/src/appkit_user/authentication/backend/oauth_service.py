@@ -1,5 +1,6 @@
 """Simplified OAuth2 configuration and utilities."""
 
+import asyncio
 import base64
 import hashlib
 import logging
@@ -7,9 +8,12 @@ import os
 import secrets
 from typing import Any
 
-from requests_oauthlib import OAuth2Session
-
 from appkit_commons.registry import service_registry
+from appkit_user.authentication.backend.oauth_client import (
+    AsyncOAuthClient,
+    authorization_url,
+)
+from appkit_user.authentication.backend.oidc import oidc_metadata_cache
 from appkit_user.configuration import (
     AuthenticationConfiguration,
     AzureOAuthConfig,
@@ -110,6 +114,9 @@ class OAuthService:
         self.azure_config.token_url = self.azure_config.token_url.format(
             tenant=self.azure_config.tenant_id
         )
+        self.azure_config.discovery_url = self.azure_config.discovery_url.format(
+            tenant=self.azure_config.tenant_id
+        )
 
     def _as_provider(self, provider: OAuthProvider | str) -> OAuthProvider:
         return (
@@ -184,24 +191,28 @@ class OAuthService:
 
         # Generate state for CSRF protection
         state = secrets.token_urlsafe(32)
-        oauth = OAuth2Session(
-            client_id=config.client_id,
-            scope=config.scopes,
-            redirect_uri=config.redirect_url,
-            state=state,
-        )
 
         code_verifier: str | None = None
+        params: dict[str, str] = {}
         # For Azure, enforce PKCE (S256)
         if prov == OAuthProvider.AZURE:
             code_verifier, code_challenge = generate_pkce_pair()
-            auth_url, _ = oauth.authorization_url(
-                config.auth_url,
-                code_challenge=code_challenge,
-                code_challenge_method="S256",
-            )
-        else:
-            auth_url, _ = oauth.authorization_url(config.auth_url)
+            params = {
+                "code_challenge": code_challenge,
+                "code_challenge_method": "S256",
+            }
+            # Have the signing keys ready when the user returns to the callback
+            if self.azure_config.use_id_token:
+                oidc_metadata_cache().prefetch(self.azure_config.discovery_url)
+
+        auth_url = authorization_url(
+            config.auth_url,
+            config.client_id,
+            config.redirect_url,
+            config.scopes,
+            state,
+            **params,
+        )
 
         return auth_url, state, code_verifier
 
@@ -216,76 +227,59 @@ class OAuthService:
             or f"{self.server_url}:{self.server_port}/oauth/{provider_value}/callback"
         )
 
-    def exchange_code_for_token(
+    async def exchange_code_for_token(
         self,
         provider: OAuthProvider | str,
         code: str,
-        state: str,
+        state: str,  # noqa: ARG002 - verified by the caller
         code_verifier: str | None = None,
     ) -> dict[str, Any]:
         """Exchange authorization code for access token."""
         prov = self._as_provider(provider)
         config: OAuthConfig = self._get_provider_config(prov)
 
-        oauth = OAuth2Session(
-            client_id=config.client_id,
-            redirect_uri=config.redirect_url,
-            state=state,
-        )
-
-        token_kwargs: dict[str, Any] = {"code": code}
-        include_client_id: bool = False
-
+        client_secret: str | None = config.client_secret
         # Include PKCE code_verifier for Azure
         if prov == OAuthProvider.AZURE:
             if not code_verifier:
                 raise ValueError(
                     "code_verifier required for Azure OAuth token exchange"
                 )
-            token_kwargs["code_verifier"] = code_verifier
-            # For public clients, do not send client_secret
-            az_cfg: AzureOAuthConfig = self.azure_config
-            # Azure public clients: client_id should be included by fetch_token
-            # (via include_client_id), redirect_uri is already bound to session.
-            include_client_id = True
-
-            if not az_cfg.is_public_client:
-                token_kwargs["client_secret"] = config.client_secret
-                include_client_id = False
-        else:
-            # Non-Azure providers keep sending client_secret (GitHub)
-            token_kwargs["client_secret"] = config.client_secret
+            # For public clients, send the client_id instead of client_secret
+            if self.azure_config.is_public_client:
+                client_secret = None
 
-        return oauth.fetch_token(
+        return await AsyncOAuthClient(config.client_id).fetch_token(
             config.token_url,
-            include_client_id=include_client_id,
-            **token_kwargs,
+            code,
+            config.redirect_url,
+            client_secret=client_secret,
+            code_verifier=code_verifier,
         )
 
-    def get_user_info(
+    async def get_user_info(
         self, provider: OAuthProvider | str, token: dict[str, Any]
     ) -> dict[str, Any]:
         """Get user information from OAuth provider."""
         prov = self._as_provider(provider)
         config: OAuthConfig = self._get_provider_config(prov)
 
-        oauth = OAuth2Session(config.client_id, token=token)
-        response = oauth.get(config.user_url)
-        response.raise_for_status()
-        user_data = response.json()
-
-        if user_data.get("email") is None and prov == OAuthProvider.GITHUB:
-            email_response = oauth.get(self.github_config.user_email_url)
-            email_response.raise_for_status()
-            emails = email_response.json()
-            user_data["email"] = next(
-                (email["email"] for email in emails if email["primary"]), ""
+        oauth = AsyncOAuthClient(config.client_id)
+        if prov == OAuthProvider.GITHUB:
+            user_data = await self._get_github_user(oauth, token)
+        elif (
+            prov == OAuthProvider.AZURE
+            and self.azure_config.use_id_token
+            and token.get("id_token")
+        ):
+            user_data = await oidc_metadata_cache().validate_id_token(
+                token["id_token"], self.azure_config.discovery_url, config.client_id
             )
+        else:
+            user_data = await oauth.get_json(config.user_url, token)
 
         if user_data.get("email") is None and prov == OAuthProvider.AZURE:
-            email_response = oauth.get(self.azure_config.user_url)
-            email_response.raise_for_status()
-            profile_data = email_response.json()
+            profile_data = await oauth.get_json(self.azure_config.user_url, token)
 
             # Try multiple email fields in order of preference
             user_data["email"] = (
@@ -297,6 +291,29 @@ class OAuthService:
 
         return self._normalize_user_data(prov, user_data)
 
+    async def _get_github_user(
+        self, oauth: AsyncOAuthClient, token: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Fetch the profile and, in parallel, the emails of a GitHub user.
+
+        The emails are only used if the profile has no public email.
+        """
+        user_data, emails = await asyncio.gather(
+            oauth.get_json(self.github_config.user_url, token),
+            oauth.get_json(self.github_config.user_email_url, token),
+            return_exceptions=True,
+        )
+        if isinstance(user_data, BaseException):
+            raise user_data
+
+        if user_data.get("email") is None:
+            if isinstance(emails, BaseException):
+                raise emails
+            user_data["email"] = next(
+                (email["email"] for email in emails if email["primary"]), ""
+            )
+        return user_data
+
     def provider_supported(self, provider: OAuthProvider | str) -> bool:
         prov = self._as_provider(provider)
         return prov in self.providers
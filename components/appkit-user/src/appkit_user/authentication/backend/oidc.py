@@ -0,0 +1,227 @@
+"""
+OpenID Connect provider metadata, signing keys and ID token validation.
+
+The discovery document and the JWKS of a provider are cached for a time to
+live. Entries that have used up most of their time to live are refreshed in
+the background while the cached value is still served, so logins only wait
+for the provider on a cold cache. An ID token signed with an unknown key id
+triggers one early JWKS refresh, which picks up rotated keys.
+
+ID tokens from the token endpoint are validated locally (RS256 signature,
+issuer, audience and lifetime), so the profile claims can be used without
+another request to the provider.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import (
+    RSAPublicKey,
+    RSAPublicNumbers,
+)
+
+from appkit_commons.http_pool import http_client_pool
+from appkit_commons.registry import service_registry
+from appkit_user.authentication.backend.oauth_client import OAUTH_TIMEOUT
+from appkit_user.configuration import AuthenticationConfiguration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL: float = 3600.0  # seconds
+REFRESH_AHEAD = 0.75  # fraction of the TTL after which entries are refreshed
+MIN_REFRESH_INTERVAL: float = 60.0  # seconds between forced JWKS refreshes
+CLOCK_SKEW: float = 300.0  # seconds
+
+
+class IdTokenError(ValueError):
+    """The ID token is malformed or failed validation."""
+
+
+@dataclass(frozen=True)
+class ProviderMetadata:
+    """The parts of an OpenID Connect discovery document in use."""
+
+    issuer: str
+    jwks_uri: str
+    authorization_endpoint: str
+    token_endpoint: str
+    userinfo_endpoint: str | None = None
+
+    @classmethod
+    def from_document(cls, document: dict[str, Any]) -> "ProviderMetadata":
+        return cls(
+            issuer=document["issuer"],
+            jwks_uri=document["jwks_uri"],
+            authorization_endpoint=document["authorization_endpoint"],
+            token_endpoint=document["token_endpoint"],
+            userinfo_endpoint=document.get("userinfo_endpoint"),
+        )
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def parse_jwks(document: dict[str, Any]) -> dict[str, RSAPublicKey]:
+    """The RSA signing keys of a JWKS document by key id."""
+    keys: dict[str, RSAPublicKey] = {}
+    for jwk in document.get("keys", []):
+        if jwk.get("kty") != "RSA" or jwk.get("use", "sig") != "sig":
+            continue
+        keys[jwk.get("kid", "")] = RSAPublicNumbers(
+            e=int.from_bytes(_b64decode(jwk["e"]), "big"),
+            n=int.from_bytes(_b64decode(jwk["n"]), "big"),
+        ).public_key()
+    return keys
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class OIDCMetadataCache:
+    """TTL cache of discovery documents and JWKS with background refresh."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+        self._entries: dict[str, _Entry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def metadata(self, discovery_url: str) -> ProviderMetadata:
+        return await self._get(discovery_url, ProviderMetadata.from_document)
+
+    async def signing_key(self, jwks_uri: str, kid: str | None) -> RSAPublicKey:
+        """The key with the given id, refreshing the JWKS once if unknown."""
+        keys = await self._get(jwks_uri, parse_jwks)
+        if kid not in keys:
+            logger.info("Unknown signing key %s, refreshing %s", kid, jwks_uri)
+            keys = await self._fetch(jwks_uri, parse_jwks, MIN_REFRESH_INTERVAL)
+        if kid not in keys:
+            raise IdTokenError(f"Unknown signing key: {kid}")
+        return keys[kid]
+
+    def prefetch(self, discovery_url: str) -> None:
+        """Warm the metadata and keys of a provider in the background.
+
+        Does nothing outside of a running event loop.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._spawn(self._prefetch(discovery_url))
+
+    async def validate_id_token(
+        self, id_token: str, discovery_url: str, client_id: str
+    ) -> dict[str, Any]:
+        """Validate an RS256 signed ID token and return its claims.
+
+        Raises:
+            IdTokenError: if the token is malformed, not signed by the
+                provider, issued for another client or expired
+        """
+        try:
+            header_b64, payload_b64, signature_b64 = id_token.split(".")
+            header = json.loads(_b64decode(header_b64))
+            claims = json.loads(_b64decode(payload_b64))
+            signature = _b64decode(signature_b64)
+        except ValueError as e:
+            raise IdTokenError("Malformed ID token") from e
+
+        if header.get("alg") != "RS256":
+            raise IdTokenError(f"Unsupported ID token algorithm: {header.get('alg')}")
+
+        metadata = await self.metadata(discovery_url)
+        key = await self.signing_key(metadata.jwks_uri, header.get("kid"))
+        try:
+            key.verify(
+                signature,
+                f"{header_b64}.{payload_b64}".encode("ascii"),
+                padding.PKCS1v15(),
+                hashes.SHA256(),
+            )
+        except InvalidSignature as e:
+            raise IdTokenError("Invalid ID token signature") from e
+
+        _check_claims(claims, metadata.issuer, client_id)
+        return claims
+
+    async def _get(self, url: str, parse: Callable[[Any], Any]) -> Any:
+        entry = self._entries.get(url)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                if age > self.ttl * REFRESH_AHEAD:
+                    self._spawn(self._fetch(url, parse, self.ttl * REFRESH_AHEAD))
+                return entry.value
+        return await self._fetch(url, parse, self.ttl * REFRESH_AHEAD)
+
+    async def _fetch(
+        self, url: str, parse: Callable[[Any], Any], max_age: float
+    ) -> Any:
+        """Fetch `url` unless it was fetched within `max_age` seconds."""
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            # Concurrent callers wait for the first fetch and share its result
+            entry = self._entries.get(url)
+            if entry is not None and time.monotonic() - entry.fetched_at < max_age:
+                return entry.value
+
+            client = http_client_pool().get_client(url)
+            response = await client.get(url, timeout=OAUTH_TIMEOUT)
+            response.raise_for_status()
+            value = parse(response.json())
+            self._entries[url] = _Entry(value=value, fetched_at=time.monotonic())
+            logger.debug("Fetched %s", url)
+            return value
+
+    async def _prefetch(self, discovery_url: str) -> None:
+        metadata = await self.metadata(discovery_url)
+        await self._get(metadata.jwks_uri, parse_jwks)
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed: %s", task.exception())
+
+
+def _check_claims(claims: dict[str, Any], issuer: str, client_id: str) -> None:
+    # Multi-tenant endpoints ("common") publish the issuer with a placeholder
+    expected_issuer = issuer.replace("{tenantid}", str(claims.get("tid", "")))
+    if claims.get("iss") != expected_issuer:
+        raise IdTokenError(f"Unexpected ID token issuer: {claims.get('iss')}")
+
+    audience = claims.get("aud")
+    audiences = audience if isinstance(audience, list) else [audience]
+    if client_id not in audiences:
+        raise IdTokenError("ID token was issued for another client")
+
+    now = time.time()
+    if float(claims.get("exp", 0)) < now - CLOCK_SKEW:
+        raise IdTokenError("ID token expired")
+    if float(claims.get("nbf", 0)) > now + CLOCK_SKEW:
+        raise IdTokenError("ID token not yet valid")
+
+
+@lru_cache(maxsize=1)
+def oidc_metadata_cache() -> OIDCMetadataCache:
+    config = service_registry().get(AuthenticationConfiguration)
+    return OIDCMetadataCache(ttl=config.oidc_metadata_ttl)
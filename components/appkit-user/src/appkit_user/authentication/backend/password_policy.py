@@ -0,0 +1,124 @@
+"""
+Password hash policy.
+
+The policy names the hash method and cost parameters new password hashes are
+created with, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:1000000". Stored hashes
+with other parameters are still accepted, and are replaced by a hash following
+the policy on the next successful login.
+
+The cost parameters are chosen with the calibration functions, which measure
+the time of a verification on the deployment hardware (see
+scripts/password_hash_policy.py).
+"""
+
+import logging
+import statistics
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from appkit_commons.registry import service_registry
+from appkit_commons.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash
+from appkit_user.configuration import AuthenticationConfiguration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HASH_METHOD = "scrypt:32768:8:1"
+# Lower bounds for calibration, below which the hashes are too cheap to brute
+# force regardless of the latency target
+MIN_SCRYPT_N = 2**15
+MAX_SCRYPT_N = 2**20
+MIN_PBKDF2_ITERATIONS = 600_000
+CALIBRATION_ROUNDS = 5
+
+
+def normalize_method(method: str) -> str:
+    """Spell out the default parameters of a hash method.
+
+    "scrypt" becomes "scrypt:32768:8:1" and "pbkdf2" becomes
+    "pbkdf2:sha256:1000000", as stored in the hashes.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt" and not args:
+        return DEFAULT_HASH_METHOD
+    if name == "pbkdf2" and len(args) < 2:  # noqa: PLR2004
+        hash_name = args[0] if args else "sha256"
+        return f"pbkdf2:{hash_name}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+
+def hash_method(pwhash: str | None) -> str | None:
+    """The method and parameters of a stored hash, e.g. "scrypt:32768:8:1"."""
+    if not pwhash or "$" not in pwhash:
+        return None
+    return normalize_method(pwhash.split("$", 1)[0])
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    """Hash method and parameters for new password hashes."""
+
+    method: str = DEFAULT_HASH_METHOD
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "method", normalize_method(self.method))
+
+    def needs_rehash(self, pwhash: str | None) -> bool:
+        """Whether a stored hash was created with other parameters."""
+        method = hash_method(pwhash)
+        return method is not None and method != self.method
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """A hash method and the measured time of one verification."""
+
+    method: str
+    seconds: float
+    memory_bytes: int = 0
+
+
+def measure(method: str, rounds: int = CALIBRATION_ROUNDS) -> float:
+    """Median seconds to hash (and thereby verify) a password with a method."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        generate_password_hash("calibration", method)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate_scrypt(target: float, r: int = 8, p: int = 1) -> Calibration:
+    """Find the largest scrypt work factor n verifying within `target` seconds.
+
+    n is a power of two and doubles the time and memory of a verification,
+    so the result stays at or below the target (but not below MIN_SCRYPT_N).
+    """
+    n = MIN_SCRYPT_N
+    seconds = measure(f"scrypt:{n}:{r}:{p}")
+    while n < MAX_SCRYPT_N:
+        candidate = measure(f"scrypt:{n * 2}:{r}:{p}")
+        logger.debug("scrypt n=%d: %.1f ms", n * 2, candidate * 1000)
+        if candidate > target:
+            break
+        n, seconds = n * 2, candidate
+    return Calibration(f"scrypt:{n}:{r}:{p}", seconds, memory_bytes=128 * n * r * p)
+
+
+def calibrate_pbkdf2(target: float, hash_name: str = "sha256") -> Calibration:
+    """Find the pbkdf2 iterations verifying within `target` seconds.
+
+    The time grows linearly with the iterations, so it is extrapolated from
+    a measurement at MIN_PBKDF2_ITERATIONS and rounded down to 10,000.
+    """
+    base = measure(f"pbkdf2:{hash_name}:{MIN_PBKDF2_ITERATIONS}")
+    iterations = int(MIN_PBKDF2_ITERATIONS * target / base) // 10_000 * 10_000
+    iterations = max(iterations, MIN_PBKDF2_ITERATIONS)
+    method = f"pbkdf2:{hash_name}:{iterations}"
+    return Calibration(method, measure(method))
+
+
+@lru_cache(maxsize=1)
+def password_policy() -> PasswordPolicy:
+    config = service_registry().get(AuthenticationConfiguration)
+    return PasswordPolicy(config.password_hash_method)
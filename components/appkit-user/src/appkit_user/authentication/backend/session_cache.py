@@ -0,0 +1,105 @@
+"""
+In-process cache of authenticated user sessions.
+
+UserSession.authenticated_user is evaluated on every page view of every tab.
+The cache answers these lookups for a short time to live without touching the
+database, and the sliding session expiration is only written when the stored
+expiration has aged by more than the extension interval.
+
+Entries are keyed by (user_id, session token) and evicted least recently used
+first. Logout and changes of a user invalidate the affected entries; other
+processes pick up such changes once their entries expire.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+from appkit_commons.registry import service_registry
+from appkit_user.authentication.backend.models import User
+from appkit_user.configuration import AuthenticationConfiguration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL: float = 120.0  # seconds
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """An authenticated user and the stored expiration of the session."""
+
+    user: User
+    expires_at: datetime
+    cached_at: float
+
+
+class SessionCache:
+    """TTL and LRU bounded cache of authenticated sessions."""
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, str], CachedSession] = OrderedDict()
+        self.hits_total = 0
+        self.misses_total = 0
+
+    def get(self, user_id: int, token: str) -> CachedSession | None:
+        """Return the cached session, if present and not older than the TTL."""
+        key = (user_id, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry.cached_at > self.ttl:
+                self._entries.pop(key, None)
+                self.misses_total += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits_total += 1
+            return entry
+
+    def put(self, user_id: int, token: str, user: User, expires_at: datetime) -> None:
+        with self._lock:
+            self._entries[(user_id, token)] = CachedSession(
+                user=user, expires_at=expires_at, cached_at=time.monotonic()
+            )
+            self._entries.move_to_end((user_id, token))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, token: str) -> None:
+        """Drop a single session, e.g. on logout."""
+        with self._lock:
+            self._entries.pop((user_id, token), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop all sessions of a user, e.g. after the user was changed."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+        logger.debug("Invalidated cached sessions of user %d", user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the current counters as a dictionary."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits_total": self.hits_total,
+                "misses_total": self.misses_total,
+            }
+
+
+@lru_cache(maxsize=1)
+def session_cache() -> SessionCache:
+    config = service_registry().get(AuthenticationConfiguration)
+    return SessionCache(ttl=config.session_cache_ttl)
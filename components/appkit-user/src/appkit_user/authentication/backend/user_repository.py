@@ -1,3 +1,5 @@
+import logging
+from collections import Counter
 from datetime import UTC, datetime, timedelta
 from enum import StrEnum
 from typing import Any
@@ -11,6 +13,12 @@ from appkit_user.authentication.backend.entities import (
     UserEntity,
 )
 from appkit_user.authentication.backend.models import UserCreate
+from appkit_user.authentication.backend.password_policy import hash_method
+from appkit_user.authentication.backend.session_cache import session_cache
+
+logger = logging.getLogger(__name__)
+
+HASH_REPORT_BATCH_SIZE = 1000
 
 
 # Helper functions for cleaner code
@@ -125,6 +133,7 @@ async def get_or_create_user(
         raise ValueError("Failed to create OAuth account") from e
 
     await db.refresh(target_user)
+    session_cache().invalidate_user(target_user.id)
     return target_user
 
 
@@ -210,7 +219,8 @@ async def get_by_email_and_password(
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if user and user.check_password(password):
+    if user and await user.check_password_async(password):
+        await _rehash_password(user, password)
         return user
     return None
 
@@ -232,8 +242,9 @@ async def get_user_status_by_email_and_password(
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not user.check_password(password):
+    if not user or not await user.check_password_async(password):
         return None, "invalid_credentials"
+    await _rehash_password(user, password)
 
     # User exists and password is correct, now check status
     if not user.is_active:
@@ -245,6 +256,32 @@ async def get_user_status_by_email_and_password(
     return user, "success"
 
 
+async def _rehash_password(user: UserEntity, password: str) -> None:
+    """Upgrade the hash of a verified password to the current policy.
+
+    The new hash is written when the session of the caller commits.
+    """
+    if await user.rehash_password_async(password):
+        logger.info("Upgraded password hash of user %d", user.id)
+
+
+async def hash_method_distribution(db: AsyncSession) -> dict[str | None, int]:
+    """Count the users per password hash method, None for users without one.
+
+    The hashes are streamed and split here, as string splitting in SQL is
+    not portable across the supported databases.
+    """
+    distribution: Counter[str | None] = Counter()
+    hashes = await db.stream_scalars(
+        select(UserEntity._password).execution_options(  # noqa: SLF001
+            yield_per=HASH_REPORT_BATCH_SIZE
+        )
+    )
+    async for pwhash in hashes:
+        distribution[hash_method(pwhash)] += 1
+    return dict(distribution)
+
+
 def validate_user_for_login(user: UserEntity) -> tuple[bool, str]:
     """Validate if a user can login.
 
@@ -289,7 +326,6 @@ async def create_user(db: AsyncSession, user: UserCreate) -> UserEntity:
     new_user = UserEntity(
         email=user.email,
         name=get_name_from_email(user.email, user.name),
-        password=user.password,  # Password will be hashed in UserEntity
         avatar_url=user.avatar_url,
         is_verified=user.is_verified,
         is_admin=user.is_admin,
@@ -298,6 +334,7 @@ async def create_user(db: AsyncSession, user: UserCreate) -> UserEntity:
         roles=user.roles or [DefaultUserRoles.USER],
         last_login=get_current_utc_time(),
     )
+    await new_user.set_password_async(user.password)
 
     db.add(new_user)
     await db.commit()
@@ -322,10 +359,11 @@ async def update_user(db: AsyncSession, user: UserCreate) -> UserEntity | None:
     user_entity.last_login = get_current_utc_time()
 
     if user.password:
-        user_entity.password = user.password  # Password will be hashed in UserEntity
+        await user_entity.set_password_async(user.password)
 
     await db.commit()
     await db.refresh(user_entity)
+    session_cache().invalidate_user(user_entity.id)
     return user_entity
 
 
@@ -337,12 +375,13 @@ async def update_password(
     if not user:
         return None
 
-    if not user.check_password(old_password):
+    if not await user.check_password_async(old_password):
         raise ValueError("Old password is incorrect")
 
-    user.password = new_password  # This will hash the new password
+    await user.set_password_async(new_password)
     await db.commit()
     await db.refresh(user)
+    session_cache().invalidate_user(user_id)
     return user
 
 
@@ -355,6 +394,7 @@ async def delete_user(db: AsyncSession, user_id: int) -> bool:
     try:
         await db.delete(user)
         await db.commit()
+        session_cache().invalidate_user(user_id)
         return True
     except Exception:
         await db.rollback()
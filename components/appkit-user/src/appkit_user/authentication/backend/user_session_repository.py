@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from appkit_user.authentication.backend.entities import (
     UserSessionEntity,
 )
+from appkit_user.authentication.backend.session_cache import session_cache
 
 
 class DefaultUserRoles(StrEnum):
@@ -51,6 +52,7 @@ async def create_or_update_user_session(
 
     await db.commit()
     await db.refresh(session)
+    session_cache().invalidate(user_id, session_id)
     return session
 
 
@@ -66,3 +68,4 @@ async def delete_user_session(db: AsyncSession, user_id: int, session_id: str) -
     if session:
         await db.delete(session)
         await db.commit()
+    session_cache().invalidate(user_id, session_id)
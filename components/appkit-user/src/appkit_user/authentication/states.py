@@ -14,8 +14,13 @@ from appkit_commons.database.session import get_asyncdb_session
 from appkit_commons.registry import service_registry
 from appkit_user.authentication.backend import user_session_repository as session_repo
 from appkit_user.authentication.backend.entities import OAuthStateEntity
+from appkit_user.authentication.backend.login_throttle import (
+    login_throttle,
+    throttle_message,
+)
 from appkit_user.authentication.backend.models import User
 from appkit_user.authentication.backend.oauth_service import OAuthService
+from appkit_user.authentication.backend.session_cache import session_cache
 from appkit_user.configuration import AuthenticationConfiguration
 
 logger = logging.getLogger(__name__)
@@ -26,6 +31,10 @@ config: AuthenticationConfiguration = service_registry().get(
 
 SESSION_TIMEOUT: Final = timedelta(minutes=config.session_timeout)
 AUTH_TOKEN_REFRESH_DELTA: Final = timedelta(minutes=config.auth_token_refresh_delta)
+# The stored session expiration is extended at most once per interval
+SESSION_EXTEND_INTERVAL: Final = min(
+    timedelta(minutes=config.session_extend_interval), SESSION_TIMEOUT
+)
 AUTH_TOKEN_LOCAL_STORAGE_KEY: Final = "_auth_token"  # noqa: S105
 
 TOKEN_LENGTH: Final = 64
@@ -35,6 +44,11 @@ LOGIN_ROUTE: Final = "/login"
 LOGOUT_ROUTE: Final = "/login"
 
 
+def _needs_extension(expires_at: datetime, now: datetime) -> bool:
+    """Whether the stored expiration has aged by the extension interval."""
+    return expires_at - now <= SESSION_TIMEOUT - SESSION_EXTEND_INTERVAL
+
+
 class UserSession(rx.State):
     """Enhanced session state with client-side storage integration."""
 
@@ -53,26 +67,44 @@ class UserSession(rx.State):
         Returns:
             A LocalUser instance with id=-1 if not authenticated, or the LocalUser
             instance corresponding to the currently authenticated user.
+
+        Lookups are answered from the session cache; the database is only read
+        when the entry is missing or the session expiration needs extending.
         """
+        cache = session_cache()
+        now = datetime.now(UTC)
+        cached = cache.get(self.user_id, self.auth_token)
+        if (
+            cached is not None
+            and now < cached.expires_at
+            and not _needs_extension(cached.expires_at, now)
+        ):
+            self.user = cached.user
+            return self.user
+
         async with get_asyncdb_session() as session:
             user_session = await session_repo.get_user_session(
                 session, self.user_id, self.auth_token
             )
 
             if user_session is None or user_session.is_expired():
+                cache.invalidate(self.user_id, self.auth_token)
                 return None
 
-            user_session.expires_at = datetime.now(UTC) + SESSION_TIMEOUT
-            await session.flush()  # Ensure the session is updated in the database
-
-            if user_session and user_session.user:
+            if user_session.user:
                 # Convert UserEntity to User model by extracting attributes
-                user_entity = user_session.user
-                user = User(**user_entity.to_dict())
-                self.user = user
-
-            await session.commit()
-
+                self.user = User(**user_session.user.to_dict())
+
+            expires_at = user_session.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=UTC)
+            if _needs_extension(expires_at, now):
+                expires_at = now + SESSION_TIMEOUT
+                user_session.expires_at = expires_at
+                await session.commit()
+
+        if self.user is not None:
+            cache.put(self.user_id, self.auth_token, self.user, expires_at)
         return self.user
 
     @rx.var(cache=True, interval=AUTH_TOKEN_REFRESH_DELTA)
@@ -124,6 +156,20 @@ class LoginState(UserSession):
         password = form_data["password"]
 
         try:
+            # Rejected before the password check, which is expensive
+            throttle = login_throttle()
+            # router.session.client_ip is the leftmost X-Forwarded-For entry,
+            # which the client controls; Reflex keeps the raw header names
+            headers = self.router.headers.raw_headers
+            client_ip = throttle.client_ip(
+                headers.get("asgi-scope-client"), headers.get("x-forwarded-for")
+            )
+            retry_after = await throttle.check(username, client_ip)
+            if retry_after:
+                self.error_message = throttle_message(retry_after)
+                yield rx.toast.error(self.error_message, position="top-right")
+                return
+
             async with get_asyncdb_session() as db:
                 (
                     user_entity,
@@ -135,6 +181,7 @@ class LoginState(UserSession):
                 if status != "success":
                     error_msg = ""
                     if status == "invalid_credentials":
+                        await throttle.record_failure(username)
                         error_msg = "Ungültiger Benutzername oder Passwort."
                     elif status == "inactive":
                         error_msg = (
@@ -151,6 +198,7 @@ class LoginState(UserSession):
                     yield rx.toast.error(error_msg, position="top-right")
                     return
 
+                await throttle.record_success(username)
                 self.auth_token = self._generate_auth_token()
                 await session_repo.create_or_update_user_session(
                     db,
@@ -257,10 +305,10 @@ class LoginState(UserSession):
                 if not oauth_state:
                     yield rx.toast.error("Invalid or expired state")
 
-                token = self._oauth_service.exchange_code_for_token(
+                token = await self._oauth_service.exchange_code_for_token(
                     provider, code, state, oauth_state.code_verifier
                 )
-                user_info = self._oauth_service.get_user_info(provider, token)
+                user_info = await self._oauth_service.get_user_info(provider, token)
 
                 try:
                     user_entity = await user_repo.get_or_create_user(
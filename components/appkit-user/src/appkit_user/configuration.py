@@ -45,6 +45,9 @@ class AzureOAuthConfig(OAuthConfig):
     tenant_id: str = "common"  # Default to common tenant
     # If True, treat the Azure app as a public client (PKCE only, no client_secret)
     is_public_client: bool = False
+    discovery_url: str = "https://login.microsoftonline.com/{tenant}/v2.0/.well-known/openid-configuration"  # noqa: E501
+    # Read the profile from the validated ID token instead of requesting user_url
+    use_id_token: bool = True
 
 
 AnyOAuthSetting = Annotated[
@@ -57,6 +60,22 @@ class AuthenticationConfiguration(BaseSettings):
 
     session_timeout: int = 25  # minutes
     auth_token_refresh_delta: int = 10  # minutes
+    session_cache_ttl: int = 120  # seconds
+    session_extend_interval: int = 5  # minutes
+    # Password login throttling, "memory" (per process) or "database" (shared)
+    login_throttle_store: Literal["memory", "database"] = "memory"
+    login_attempts_window: int = 300  # seconds to refill a bucket
+    login_attempts_per_email: int = 10
+    login_attempts_per_ip: int = 30
+    # Reverse proxies (e.g. Caddy) whose X-Forwarded-For is trusted for the
+    # client IP; 0 uses the connection address, None disables the IP bucket
+    login_ip_proxy_hops: int | None = None
+    login_lockout_threshold: int = 5  # failures before the email is locked
+    login_lockout_seconds: int = 30  # doubled with every further failure
+    login_max_lockout_seconds: int = 3600
+    # Method and parameters of new password hashes, see password_policy.py
+    password_hash_method: str = "scrypt:32768:8:1"  # noqa: S105
+    oidc_metadata_ttl: int = 3600  # seconds to cache discovery documents and keys
     server_url: str
     server_port: int
 
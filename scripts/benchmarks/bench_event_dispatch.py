@@ -0,0 +1,89 @@
+"""Micro-benchmark for OpenAIResponsesProcessor._handle_event.
+
+Compares the table-driven dispatch against the previous implementation, which
+built a list of handler lambdas per event and tried each one in turn.
+
+Usage:
+    uv run python scripts/benchmarks/bench_event_dispatch.py [runs]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from responses_stream import recorded_stream  # noqa: E402
+
+from appkit_assistant.backend.models import Chunk  # noqa: E402
+from appkit_assistant.backend.processors.openai_responses_processor import (  # noqa: E402
+    OpenAIResponsesProcessor,
+    logger,
+)
+
+
+class LegacyDispatchProcessor(OpenAIResponsesProcessor):
+    """Processor using the previous lambda-list event dispatch."""
+
+    def _handle_event(self, event: Any) -> Chunk | None:
+        if not hasattr(event, "type"):
+            return None
+
+        event_type = event.type
+        logger.debug("Event: %s", event)
+
+        handlers = [
+            lambda et: self._handle_lifecycle_events(et, event),
+            lambda et: self._handle_text_events(et, event),
+            lambda et: self._handle_item_events(et, event),
+            lambda et: self._handle_mcp_events(et, event),
+            lambda et: self._handle_content_events(et, event),
+            lambda et: self._handle_completion_events(et, event),
+            lambda et: self._handle_image_events(et, event),
+        ]
+
+        for handler in handlers:
+            result = handler(event_type)
+            if result:
+                content_preview = result.text[:50] if result.text else ""
+                logger.info(
+                    "Event %s → Chunk: type=%s, content=%s",
+                    event_type,
+                    result.type,
+                    content_preview,
+                )
+                return result
+
+        logger.debug("Unhandled event type: %s", event_type)
+        return None
+
+
+def _measure(processor: OpenAIResponsesProcessor, events: list, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        for event in events:
+            processor._handle_event(event)
+        best = min(best, time.perf_counter() - start)
+    return len(events) / best
+
+
+def main(runs: int = 20) -> None:
+    # Keep INFO enabled like production so the legacy logging cost is included,
+    # but discard the output.
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    events = recorded_stream(total_events=2000)
+
+    before = _measure(LegacyDispatchProcessor(models={}), events, runs)
+    after = _measure(OpenAIResponsesProcessor(models={}), events, runs)
+
+    print(f"events per run: {len(events)}")
+    print(f"before: {before:>12,.0f} events/s")
+    print(f"after:  {after:>12,.0f} events/s")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,146 @@
+"""Load test for the login throttle under a burst of failed logins.
+
+Legitimate users log in at a steady pace while attackers try passwords for
+random addresses from a few IPs. Without throttling every attempt runs scrypt
+and the legitimate logins queue behind the attack; with throttling the attack
+is rejected before the password check and their latency stays flat.
+
+The login is reduced to what costs CPU: the throttle check, the scrypt check
+in the password service and the recording of the result (in-memory store).
+
+Usage:
+    uv run python scripts/benchmarks/bench_login_throttle.py [seconds]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+from app import configuration  # noqa: F401 - initializes the service registry
+from appkit_commons.password_service import PasswordService
+from appkit_commons.security import generate_password_hash
+from appkit_user.authentication.backend.login_throttle import (
+    BucketPolicy,
+    LoginThrottle,
+    MemoryThrottleStore,
+)
+
+logging.disable(logging.CRITICAL)
+
+LEGIT_USERS = 10
+LEGIT_INTERVAL = 0.5  # seconds between the logins of a user
+ATTACK_IPS = 4
+ATTACK_RATE = 400  # attempts per second
+
+
+def _throttle() -> LoginThrottle:
+    return LoginThrottle(
+        MemoryThrottleStore(),
+        email_policy=BucketPolicy(capacity=10, window=300),
+        ip_policy=BucketPolicy(capacity=30, window=300),
+    )
+
+
+async def _login(
+    email: str,
+    ip: str,
+    password: str,
+    pwhash: str,
+    service: PasswordService,
+    throttle: LoginThrottle | None,
+) -> bool:
+    if throttle and await throttle.check(email, ip):
+        return False
+    ok = await service.check_password_hash(pwhash, password)
+    if throttle:
+        if ok:
+            await throttle.record_success(email)
+        else:
+            await throttle.record_failure(email)
+    return ok
+
+
+async def _legit_user(
+    index: int,
+    deadline: float,
+    pwhash: str,
+    service: PasswordService,
+    throttle: LoginThrottle | None,
+    latencies: list[float],
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await _login(
+            f"user{index}@example.com",
+            f"10.0.0.{index}",
+            "secret",
+            pwhash,
+            service,
+            throttle,
+        )
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(LEGIT_INTERVAL)
+
+
+async def _attack(
+    deadline: float,
+    pwhash: str,
+    service: PasswordService,
+    throttle: LoginThrottle | None,
+) -> int:
+    tasks: set[asyncio.Task] = set()
+    attempts = 0
+    while time.perf_counter() < deadline:
+        ip = f"192.0.2.{attempts % ATTACK_IPS}"
+        task = asyncio.create_task(
+            _login(
+                f"victim{attempts}@example.com", ip, "guess", pwhash, service, throttle
+            )
+        )
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        attempts += 1
+        await asyncio.sleep(1 / ATTACK_RATE)
+    for task in list(tasks):
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return attempts
+
+
+async def _run(seconds: float, attack: bool, throttled: bool) -> list[float]:
+    pwhash = generate_password_hash("secret")
+    service = PasswordService()
+    throttle = _throttle() if throttled else None
+    deadline = time.perf_counter() + seconds
+    latencies: list[float] = []
+    jobs = [
+        _legit_user(i, deadline, pwhash, service, throttle, latencies)
+        for i in range(LEGIT_USERS)
+    ]
+    if attack:
+        jobs.append(_attack(deadline, pwhash, service, throttle))
+    await asyncio.gather(*jobs)
+    service.shutdown()
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<24} logins: {len(latencies):>4}  "
+        f"p50: {statistics.median(latencies) * 1000:>8.1f} ms  "
+        f"p95: {p95 * 1000:>8.1f} ms"
+    )
+
+
+def main(seconds: float = 10.0) -> None:
+    _report("no attack", asyncio.run(_run(seconds, attack=False, throttled=True)))
+    _report("attack, unthrottled", asyncio.run(_run(seconds, True, False)))
+    _report("attack, throttled", asyncio.run(_run(seconds, True, True)))
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10.0)
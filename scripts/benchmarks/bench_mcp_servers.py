@@ -0,0 +1,99 @@
+"""Benchmark loading 100 MCP servers and building their tool configurations.
+
+Before: every load decrypts the headers of each row (as EncryptedString does)
+and every request parses the headers JSON again. After: the servers are read
+from the MCPServerCache, which keeps the parsed tool configurations.
+
+Usage:
+    uv run python scripts/benchmarks/bench_mcp_servers.py [runs]
+"""
+
+import json
+import logging
+import sys
+import time
+
+from cryptography.fernet import Fernet
+
+from appkit_assistant.backend.mcp_server_cache import (
+    MCPServerCache,
+    build_tool_config,
+)
+from appkit_assistant.backend.models import MCPServer
+
+logging.disable(logging.CRITICAL)
+
+SERVERS = 100
+REQUESTS = 50  # loads and tool configurations per run
+
+
+def _encrypted_rows(cipher: Fernet) -> list[tuple[int, str, str, str]]:
+    rows = []
+    for i in range(SERVERS):
+        headers = json.dumps(
+            {"Authorization": f"Bearer {'x' * 64}{i}", "X-Tenant": f"tenant-{i}"}
+        )
+        rows.append(
+            (
+                i + 1,
+                f"server-{i:03d}",
+                f"https://mcp{i}.example.com/mcp",
+                cipher.encrypt(headers.encode()).decode(),
+            )
+        )
+    return rows
+
+
+def _load(cipher: Fernet, rows: list[tuple[int, str, str, str]]) -> list[MCPServer]:
+    return [
+        MCPServer(
+            id=server_id,
+            name=name,
+            url=url,
+            headers=cipher.decrypt(headers.encode()).decode(),
+        )
+        for server_id, name, url, headers in rows
+    ]
+
+
+def _before(cipher: Fernet, rows: list[tuple[int, str, str, str]]) -> None:
+    for _ in range(REQUESTS):
+        for server in _load(cipher, rows):
+            build_tool_config(server)
+
+
+def _after(
+    cipher: Fernet, rows: list[tuple[int, str, str, str]], cache: MCPServerCache
+) -> None:
+    for _ in range(REQUESTS):
+        servers = cache.servers()
+        if servers is None:
+            servers = _load(cipher, rows)
+            cache.store(servers, cache.generation)
+        for server in servers:
+            cache.tool_config(server)
+
+
+def _measure(func, *args) -> float:  # noqa: ANN001
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(runs: int = 10) -> None:
+    cipher = Fernet(Fernet.generate_key())
+    rows = _encrypted_rows(cipher)
+
+    before = min(_measure(_before, cipher, rows) for _ in range(runs))
+    after = min(
+        _measure(_after, cipher, rows, MCPServerCache(ttl=3600)) for _ in range(runs)
+    )
+
+    print(f"servers: {SERVERS}, requests per run: {REQUESTS}")
+    print(f"before: {before * 1000 / REQUESTS:>8.3f} ms/request")
+    print(f"after:  {after * 1000 / REQUESTS:>8.3f} ms/request")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,53 @@
+"""Benchmark ThreadState._handle_chunk with a recorded 2,000 event stream.
+
+Usage:
+    uv run python scripts/benchmarks/bench_thinking_items.py [runs]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from responses_stream import recorded_stream  # noqa: E402
+
+from appkit_assistant.backend.models import Message, MessageType  # noqa: E402
+from appkit_assistant.backend.processors.openai_responses_processor import (  # noqa: E402
+    OpenAIResponsesProcessor,
+)
+from appkit_assistant.state.thread_state import ThreadState  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+
+def main(runs: int = 20) -> None:
+    processor = OpenAIResponsesProcessor(models={})
+    chunks = [
+        chunk
+        for event in recorded_stream(total_events=2000, mcp_calls=20, argument_deltas=80)
+        if (chunk := processor._handle_event(event))
+    ]
+
+    timings = []
+    for _ in range(runs):
+        state = ThreadState(_reflex_internal_init=True)
+        state.messages = [
+            Message(text="question", type=MessageType.HUMAN),
+            Message(text="", type=MessageType.ASSISTANT),
+        ]
+        start = time.perf_counter()
+        for chunk in chunks:
+            state._handle_chunk(chunk)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"chunks per run:   {len(chunks)}")
+    print(f"thinking items:   {len(state.thinking_items)}")
+    print(f"best run:         {best * 1000:.2f} ms")
+    print(f"chunks per second: {len(chunks) / best:,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,88 @@
+"""Synthetic recording of an OpenAI Responses API event stream.
+
+The stream mirrors what the Responses API emits for an MCP-heavy answer:
+reasoning, tool listing, several MCP calls with streamed arguments and a long
+streamed text answer. Events are SimpleNamespace objects exposing the same
+attributes the processors read from the SDK event types.
+"""
+
+from types import SimpleNamespace
+
+
+def _event(event_type: str, **kwargs: object) -> SimpleNamespace:
+    return SimpleNamespace(type=event_type, **kwargs)
+
+
+def recorded_stream(
+    total_events: int = 2000, mcp_calls: int = 8, argument_deltas: int = 60
+) -> list[SimpleNamespace]:
+    """Build a deterministic Responses API event stream of `total_events` events."""
+    events = [
+        _event("response.created"),
+        _event("response.in_progress"),
+        _event("response.mcp_list_tools.in_progress", item_id="mcpl_1"),
+        _event("response.mcp_list_tools.completed", item_id="mcpl_1"),
+    ]
+
+    for call in range(mcp_calls):
+        reasoning_id = f"rs_{call}"
+        tool_id = f"mcp_{call}"
+        events.append(
+            _event(
+                "response.output_item.added",
+                item=SimpleNamespace(type="reasoning", id=reasoning_id),
+            )
+        )
+        events.append(
+            _event(
+                "response.output_item.done",
+                item=SimpleNamespace(type="reasoning", id=reasoning_id, summary=[]),
+            )
+        )
+        events.append(
+            _event(
+                "response.output_item.added",
+                item=SimpleNamespace(
+                    type="mcp_call",
+                    id=tool_id,
+                    name="search",
+                    server_label="knowledge",
+                ),
+            )
+        )
+        events.extend(
+            _event(
+                "response.mcp_call_arguments.delta",
+                item_id=tool_id,
+                delta=f'"q{i}": ',
+            )
+            for i in range(argument_deltas)
+        )
+        events.append(
+            _event(
+                "response.mcp_call_arguments.done",
+                item_id=tool_id,
+                arguments='{"query": "benchmark"}',
+            )
+        )
+        events.append(_event("response.mcp_call.in_progress", item_id=tool_id))
+        events.append(
+            _event(
+                "response.output_item.done",
+                item=SimpleNamespace(
+                    type="mcp_call",
+                    id=tool_id,
+                    name="search",
+                    error=None,
+                    output="result " * 20,
+                ),
+            )
+        )
+
+    text_events = max(total_events - len(events) - 1, 0)
+    events.extend(
+        _event("response.output_text.delta", delta=f"token{i} ")
+        for i in range(text_events)
+    )
+    events.append(_event("response.completed"))
+    return events[:total_events]
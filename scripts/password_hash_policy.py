@@ -0,0 +1,86 @@
+"""Calibrate the password hash policy and report the stored hash methods.
+
+Measure on the deployment hardware which parameters verify a password within
+the target time, and set the result as authentication.password_hash_method:
+
+    uv run python scripts/password_hash_policy.py calibrate [--target-ms 250]
+        [--method scrypt|pbkdf2]
+
+Count the users per stored hash method. Hashes differing from the policy are
+upgraded on the next successful login of the user:
+
+    uv run python scripts/password_hash_policy.py report
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app import configuration  # noqa: F401 - initializes the service registry
+from appkit_commons.database.session import get_asyncdb_session
+from appkit_commons.password_service import DEFAULT_MAX_WORKERS
+from appkit_user.authentication.backend import user_repository
+from appkit_user.authentication.backend.password_policy import (
+    calibrate_pbkdf2,
+    calibrate_scrypt,
+    password_policy,
+)
+
+
+def calibrate(target_ms: float, method: str) -> None:
+    target = target_ms / 1000
+    calibration = (
+        calibrate_scrypt(target) if method == "scrypt" else calibrate_pbkdf2(target)
+    )
+    print(f"password_hash_method: {calibration.method}")
+    print(f"verification: {calibration.seconds * 1000:.0f} ms (target {target_ms:.0f})")
+    if calibration.memory_bytes:
+        print(
+            f"memory: {calibration.memory_bytes / 2**20:.0f} MiB per verification, "
+            f"{calibration.memory_bytes * DEFAULT_MAX_WORKERS / 2**20:.0f} MiB "
+            f"for {DEFAULT_MAX_WORKERS} concurrent verifications"
+        )
+    if calibration.seconds > target:
+        print("The minimum parameters already exceed the target time.")
+
+
+async def report() -> None:
+    policy = password_policy()
+    async with get_asyncdb_session() as db:
+        distribution = await user_repository.hash_method_distribution(db)
+
+    print(f"policy: {policy.method}")
+    for method, count in sorted(
+        distribution.items(), key=lambda item: item[1], reverse=True
+    ):
+        if method is None:
+            label = "(no password)"
+        elif method == policy.method:
+            label = method
+        else:
+            label = f"{method} (upgraded on next login)"
+        print(f"{count:>8}  {label}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate_parser = commands.add_parser(
+        "calibrate", help="find the hash parameters for a target verification time"
+    )
+    calibrate_parser.add_argument("--target-ms", type=float, default=250.0)
+    calibrate_parser.add_argument(
+        "--method", choices=["scrypt", "pbkdf2"], default="scrypt"
+    )
+    commands.add_parser("report", help="count the users per stored hash method")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "calibrate":
+        calibrate(args.target_ms, args.method)
+    else:
+        asyncio.run(report())
+
+
+if __name__ == "__main__":
+    main()
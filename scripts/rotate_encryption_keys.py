@@ -0,0 +1,56 @@
+"""Re-encrypt all EncryptedString columns with the current encryption key.
+
+Configure the new key as database.encryption_key and the old ones as
+database.previous_encryption_keys (comma separated), deploy, then run:
+
+    uv run python scripts/rotate_encryption_keys.py [--batch-size N] [--dry-run]
+
+Once all values are re-encrypted, the previous keys can be removed.
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+import appkit_assistant.backend.models  # noqa: F401 - registers the tables
+from app import configuration  # noqa: F401 - initializes the service registry
+from appkit_commons.database.configuration import DatabaseConfig
+from appkit_commons.database.entities import Base
+from appkit_commons.database.key_rotation import (
+    DEFAULT_BATCH_SIZE,
+    encrypted_columns,
+    reencrypt_column,
+)
+from appkit_commons.registry import service_registry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only count the values that need re-encryption",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    engine = create_engine(service_registry().get(DatabaseConfig).url)
+    try:
+        for table, column in encrypted_columns(SQLModel.metadata, Base.metadata):
+            result = reencrypt_column(
+                engine, table, column, batch_size=args.batch_size, dry_run=args.dry_run
+            )
+            print(
+                f"{result.table}.{result.column}: "
+                f"{result.rotated}/{result.scanned} re-encrypted"
+                + (" (dry run)" if args.dry_run else "")
+            )
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()